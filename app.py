@@ -5,16 +5,19 @@ Date                    Author                          Change Details
 
 """
 
+from __future__ import annotations
+
 import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
-from constant.const_config import PARENT_DIR, SCHEMA_FILE
+from constant.const_config import PARENT_DIR, SCHEMA_FILE, GROUNDING_CACHE_FILE, CASSETTE_FILE
 from prompts.prompts_template import get_ai_sys_role_for_use_case_to_intent_mapping, \
     get_ai_sys_role_for_intent_to_pw_step_mapping, get_ai_user_role_artifacts_to_transform_to_desired_schema, \
     get_ai_sys_role_to_transform_artifacts_to_desired_schema
@@ -22,45 +25,105 @@ from prompts.prompts_template import get_ai_sys_role_for_use_case_to_intent_mapp
 ROOT = PARENT_DIR
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
-import dotenv
 
-from dataclass.conceptual_objects import Intents, Step
+from dataclass.conceptual_objects import Intents, Step, artifacts_to_json_str, artifacts_from_jsonl
 from pw_lib_ext.config import AppConfig
-from llm_service.grounder import (
-    extract_intents_dynamic,
-    Grounder,
-    LLMAgent, _read_text_safe, _summarize_dom_for_llm, sanitize_html_for_llm
-)
-from llm_service.azure_client import AzureLLMClient
+from telemetry.spans import span, timings_ms
 from constant.const_config import LOG_FILE, LOG_FOLDER, PARENT_DIR
-from pw_lib_ext.runner import PWStepExecutor
-from pw_lib_ext.step_exporter import steps_to_playwright_jsonl
+
+# Playwright, the OpenAI SDK and BeautifulSoup / lxml are imported inside the functions that use them,
+# so importing this module (the CLI, batch workers) stays cheap
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser
+    from llm_service.abstract_llm_client import AbstractLLMClient
+    from llm_service.grounder import Grounder, LLMAgent
+    from llm_service.ledger import LLMLedger
+    from pw_lib_ext.runner import PWStepExecutor
 
 # region Logging Initiation
 logger = logging.getLogger()
-log_file = LOG_FILE
-os.makedirs(LOG_FOLDER, exist_ok=True)
 
-logger.setLevel(logging.INFO)
-if not logger.handlers:
-    fh = logging.FileHandler(LOG_FILE, mode="w", encoding="utf-8")
 
-    fmt = logging.Formatter(
-        "%(asctime)s %(levelname)s "
-        "[%(name)s %(filename)s:%(lineno)d %(funcName)s] %(message)s"
-    )
+def setup_logging(log_file: str = LOG_FILE) -> None:
+    """File logging for an entry point (main, replay, CLI); importing this module configures nothing."""
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        fh = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+
+        fmt = logging.Formatter(
+            "%(asctime)s %(levelname)s "
+            "[%(name)s %(filename)s:%(lineno)d %(funcName)s] %(message)s"
+        )
 
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
-logger.info("Logging Started For Playwright Execution From LLM English Prompt - ")
+        fh.setFormatter(fmt)
+        logger.addHandler(fh)
+    logger.info("Logging Started For Playwright Execution From LLM English Prompt - ")
 
 
 # endregion
 
 # region wiring
 
-def main():
-    # region Initiate Configuration
+def _load_dom_html(runner: PWStepExecutor, dom_id: int, max_chars: int = 5_000_000) -> str:
+    # in-memory capture buffer, no read-back of the file being written in the background
+    dom_raw = runner.artifacts.get_dom_html_by_id(dom_id) if dom_id else ""
+    if len(dom_raw) > max_chars:
+        half = max_chars // 2
+        dom_raw = dom_raw[:half] + "\n...\n" + dom_raw[-half:]
+    from llm_service.dom_pipeline import preprocess_dom_for_llm
+    # single parse: sanitize + clamp attributes + pretty serialize
+    if not dom_raw:
+        return ""
+    with span("dom.sanitize", chars=len(dom_raw)):
+        return preprocess_dom_for_llm(dom_raw, max_attr_len=1024, max_chars=max_chars)
+
+
+def _load_page_for_llm(runner: PWStepExecutor, cfg: AppConfig, dom_id: int) -> Tuple[str, str]:
+    """(sanitized DOM, element digest) for the grounder, according to cfg.grounding.domPayload."""
+    with span("dom.read", payload=cfg.grounding.domPayload):
+        return _read_page_for_llm(runner, cfg, dom_id)
+
+
+def _read_page_for_llm(runner: PWStepExecutor, cfg: AppConfig, dom_id: int) -> Tuple[str, str]:
+    dom_text, digest_text = "", ""
+    # with a token budget the LLMAgent prunes low-value regions, no blind head/tail cut here
+    max_chars = sys.maxsize if cfg.llm.maxPromptTokens > 0 else 5_000_000
+    if cfg.grounding.domPayload in ("html", "both"):
+        dom_text = _load_dom_html(runner, dom_id, max_chars)
+    if cfg.grounding.domPayload in ("digest", "both"):
+        digest = runner.artifacts.get_digest_by_id(dom_id) if dom_id else None
+        if digest is not None:
+            from artifacts.element_digest import format_digest_for_llm
+            with span("digest.format"):
+                digest_text = format_digest_for_llm(digest)
+        elif not dom_text:
+            # no digest captured for this page, fall back to HTML
+            dom_text = _load_dom_html(runner, dom_id, max_chars)
+    return dom_text, digest_text
+
+
+# LLM endpoint (One can Toggle Between Various LLM Models, Its Abstracted In LLMClient)
+
+# API_BASE = "https://aiml04openai.openai.azure.com"
+# API_VERSION = "2025-01-01-preview"
+# MODEL_NAME = "insta-gpt-4o"
+
+API_BASE = "https://nt-genai-foundry-us2.cognitiveservices.azure.com/"
+API_VERSION = "2025-01-01-preview"
+MODEL_NAME = "gpt-4o"
+
+# region Generated File Details
+PW_STYLE_FILE_JSON = 'playwright.jsonl'
+PLAN_FILE_JSON = "plan.json"
+ARTIFACTS_FILE_JSON = "artifacts.json"
+RUN_LOG_FILE_JSON = "run_log.json"
+SCHEMA_BASED_OUTPUT_FILE_JSON = "schema_based_output.json"
+LLM_LEDGER_FILE_JSONL = "llm_calls.jsonl"
+# endregion
+
+
+def build_config() -> AppConfig:
     cfg = AppConfig()
     # --- Runtime toggles ---
 
@@ -71,6 +134,13 @@ def main():
     cfg.browser.slowMoMs = 250
     cfg.browser.locale = "en-IN"
     cfg.browser.recordVideo = True
+    cfg.browser.routing.enabled = False  # block analytics / ad hosts and heavy resource types
+    cfg.browser.routing.blockResourceTypes = ["media", "font"]
+    cfg.browser.routing.blockImages = False
+    cfg.browser.routing.blockThirdParty = False
+    cfg.browser.har.mode = "off"  # "record" (<run>/network.har.zip) or "replay" (cfg.browser.har.path, offline)
+    cfg.browserServer.enabled = False  # True: connect to a warm browser server kept between runs
+    cfg.browserServer.keepAlive = True
 
     # ------------
 
@@ -79,107 +149,267 @@ def main():
     cfg.grounding.artifactPolicy.captureOnAutoSuggestVisible = True
     cfg.grounding.artifactPolicy.captureOnEveryStep = True
     cfg.grounding.artifactPolicy.fullPageScreenshots = True
+    cfg.grounding.artifactPolicy.captureElementDigest = True
+    cfg.grounding.domPayload = "html"  # "html", "digest" (compact element list) or "both"
+    cfg.grounding.image.optimize = True
+    cfg.grounding.image.crop = "viewport"  # "viewport", "region" (top band) or "none"
+    cfg.grounding.image.format = "jpeg"  # "jpeg", "webp" or "png"
+    cfg.grounding.image.detail = "adaptive"  # "low", "high", "auto" or "adaptive"
     cfg.grounding.maxAltLocatorsPerStep = 3
+    cfg.grounding.cache.enabled = True
+    cfg.grounding.cache.maxEntries = 5000
+    cfg.grounding.cache.maxAgeDays = 30
+    cfg.grounding.speculative.enabled = False
+    cfg.grounding.speculative.similarityThreshold = 0.97
+
+    cfg.llm.history.mode = "window"  # "unbounded", "window" or "none"
+    cfg.llm.history.windowSize = 4
+    cfg.llm.history.perPhase = True
+    cfg.llm.history.compactSummary = True
+
+    cfg.llm.maxPromptTokens = 100_000  # per grounding call, 0 disables the token budget
+    cfg.llm.transport = "sync"  # "sync" or "async" (pooled connections, calls overlap with browser work)
+    cfg.llm.maxConcurrency = 4
+
+    cfg.llm.cassette.mode = "off"  # "off", "record" (live + save) or "replay" (offline)
+    cfg.llm.cassette.simulateLatency = False
 
     cfg.logging.verbosity = "verbose"
     cfg.logging.saveRunLog = True
+    return cfg
 
-    # region Generated File Details
+
+def new_run_dir() -> Path:
     time_stamp = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y%m%d_%H%M%S")
     log_dir = Path(os.path.join(LOG_FOLDER, f'run_{time_stamp}'))
     log_dir.mkdir(parents=True, exist_ok=True)
-    pw_style_file_json = 'playwright.jsonl'
-    plan_file_json = "plan.json"
-    artifacts_file_json = "artifacts.json"
-    run_log_file_json = "run_log.json"
-    schema_based_output_file_json = "schema_based_output.json"
-    # endregion
-
-    # endregion
+    return log_dir
 
-    # region LLM Initialization
-
-    # Use LLM client (One can Toggle Between Various LLM Models, Its Abstracted In LLMClient)
 
-    # API_BASE = "https://aiml04openai.openai.azure.com"
-    # API_VERSION = "2025-01-01-preview"
-    # MODEL_NAME = "insta-gpt-4o"
+def build_llm_client(cfg: AppConfig) -> AbstractLLMClient:
+    import dotenv
+    from llm_service.cassette_client import CassetteLLMClient
 
-    API_BASE = "https://nt-genai-foundry-us2.cognitiveservices.azure.com/"
-    API_VERSION = "2025-01-01-preview"
-    MODEL_NAME = "gpt-4o"
+    api_base = cfg.llm.apiBase or API_BASE
+    api_version = cfg.llm.apiVersion or API_VERSION
+    model_name = cfg.llm.model or MODEL_NAME
 
     # Azure OpenAI Configuration
     dotenv.load_dotenv(dotenv_path=os.path.join(PARENT_DIR, ".env"))
 
-    llm_client: AzureLLMClient = AzureLLMClient(base_url=API_BASE, api_key=os.getenv("API_KEY"),
-                                                api_version=API_VERSION, model=MODEL_NAME)
-    # llm_client = OpenAILLMClient(api_key=os.getenv("OPENAI_API_KEY"))
-
-    # endregion
-
-    # region Define Prompt For LLM -> User Story To List Of Intents - > [Execute Each UI Action For Each Intent ]
+    cassette = cfg.llm.cassette
+    llm_client: AbstractLLMClient
+    if cassette.mode == "replay":
+        # offline - no endpoint / key needed
+        llm_client = CassetteLLMClient(cassette.path or CASSETTE_FILE, mode="replay", model=model_name,
+                                       simulate_latency=cassette.simulateLatency,
+                                       latency_scale=cassette.latencyScale,
+                                       fixed_latency_ms=cassette.fixedLatencyMs,
+                                       sequential_fallback=cassette.sequentialFallback)
+    elif cfg.llm.transport == "async":
+        from llm_service.async_llm_client import AsyncAzureLLMClient, AsyncBackedLLMClient, AsyncLoopThread
+        # the keep-alive pool lives on the loop that uses it and is closed with it (close_llm_client)
+        loop_thread = AsyncLoopThread()
+        http_client = loop_thread.http_client(max_connections=cfg.llm.maxConnections,
+                                              max_keepalive=cfg.llm.maxConnections,
+                                              keepalive_expiry=cfg.llm.keepaliveExpirySec)
+        llm_client = AsyncBackedLLMClient(
+            AsyncAzureLLMClient(base_url=api_base, api_key=os.getenv("API_KEY"), api_version=api_version,
+                                model=model_name, max_concurrency=cfg.llm.maxConcurrency, http_client=http_client),
+            loop_thread=loop_thread, owns_loop=True)
+    else:
+        from llm_service.azure_client import AzureLLMClient
+        llm_client = AzureLLMClient(base_url=api_base, api_key=os.getenv("API_KEY"),
+                                    api_version=api_version, model=model_name)
+        # llm_client = OpenAILLMClient(api_key=os.getenv("OPENAI_API_KEY"))
+    if cassette.mode == "record":
+        llm_client = CassetteLLMClient(cassette.path or CASSETTE_FILE, mode="record", inner=llm_client)
+    return llm_client
+
+
+def build_llm_agent(cfg: AppConfig, llm_client: AbstractLLMClient, ledger: Optional[LLMLedger] = None) -> LLMAgent:
+    from llm_service.grounder import LLMAgent
+    from llm_service.token_budget import TokenBudget
 
     # -------- Phase 1: Intents --------
     system_prompt_llm_english = get_ai_sys_role_for_use_case_to_intent_mapping()
     system_prompt_pw_steps_generation = get_ai_sys_role_for_intent_to_pw_step_mapping()
 
+    # region Define Agent For Communication With AI Model
+    return LLMAgent(llm_client=llm_client,
+                    system_prompt_plain_english=system_prompt_llm_english,
+                    system_prompt_automation_steps=system_prompt_pw_steps_generation,
+                    history_policy=cfg.llm.history,
+                    token_budget=TokenBudget(cfg.llm.maxPromptTokens, model=cfg.llm.model or MODEL_NAME)
+                    if cfg.llm.maxPromptTokens > 0 else None,
+                    ledger=ledger)
     # endregion
 
-    # region Define Agent For Communication With AI Model
 
-    llm_agent = LLMAgent(llm_client=llm_client,
-                         system_prompt_plain_english=system_prompt_llm_english,
-                         system_prompt_automation_steps=system_prompt_pw_steps_generation)
+def build_grounder(cfg: AppConfig, llm_client: AbstractLLMClient,
+                   ledger: Optional[LLMLedger] = None) -> Tuple[LLMAgent, Grounder]:
+    from llm_service.grounder import Grounder
+    from llm_service.grounding_cache import GroundingCache
+
+    llm_agent = build_llm_agent(cfg, llm_client, ledger)
+
+    # -------- Phase 2: Grounder (per step) --------
+    grounding_cache = GroundingCache(cfg.grounding.cache.path or GROUNDING_CACHE_FILE,
+                                     max_entries=cfg.grounding.cache.maxEntries,
+                                     max_age_days=cfg.grounding.cache.maxAgeDays) \
+        if cfg.grounding.cache.enabled else None
+    grounder = Grounder(cfg=cfg, llm=llm_agent, cache=grounding_cache)
+    return llm_agent, grounder
 
-    # endregion
 
-    # region User's Story
+# region User's Story
+
+DEFAULT_USER_STORY = (
+
+    "Open JP Morgan site with url - https://am.jpmorgan.com/us/en/asset-management, "
+    "Click on popup window with text - Individual Investors"
+    "Click first 'search' button on header on top right of page, "
+    "Type text 'Investment' to mimic user is typing, no 'fill' action in 'Search' textbox in header below last clicked search button "
+    "and click second search button with visible text 'Search' to right of textbox where 'Investment' was typed, "
+    "Click the first relevant link having JPMorgan text aligned to link"
+)
+# endregion
 
-    user_prompt_wf_json = (
 
-        "Open JP Morgan site with url - https://am.jpmorgan.com/us/en/asset-management, "
-        "Click on popup window with text - Individual Investors"
-        "Click first 'search' button on header on top right of page, "
-        "Type text 'Investment' to mimic user is typing, no 'fill' action in 'Search' textbox in header below last clicked search button "
-        "and click second search button with visible text 'Search' to right of textbox where 'Investment' was typed, "
-        "Click the first relevant link having JPMorgan text aligned to link"
-    )
+def close_llm_client(llm_client: AbstractLLMClient) -> None:
+    from llm_service.async_llm_client import AsyncBackedLLMClient
+    # a recording cassette wraps the real client
+    llm_client = getattr(llm_client, "inner", None) or llm_client
+    if isinstance(llm_client, AsyncBackedLLMClient):
+        llm_client.close()
+
+
+def main(user_story: Optional[str] = None, cfg: Optional[AppConfig] = None) -> Dict[str, Any]:
+    setup_logging()
+    # region Initiate Configuration
+    cfg = cfg or build_config()
+    log_dir = new_run_dir()
+    # endregion
+
+    # region LLM Initialization
+    llm_client = build_llm_client(cfg)
     # endregion
 
-    # region LLM Service For Getting Use Case Into Intents
-    intents: Intents = extract_intents_dynamic(user_prompt_wf_json, llm_client=llm_agent)
+    try:
+        return run_story(cfg, user_story or DEFAULT_USER_STORY, log_dir, llm_client)
+    finally:
+        close_llm_client(llm_client)
+
+
+def extract_intents_main(user_story: str, cfg: Optional[AppConfig] = None) -> Intents:
+    """Phase 1 only: user story -> intents, no browser."""
+    from llm_service.grounder import extract_intents_dynamic
+
+    setup_logging()
+    cfg = cfg or build_config()
+    llm_client = build_llm_client(cfg)
+    try:
+        return extract_intents_dynamic(user_story, build_llm_agent(cfg, llm_client))
+    finally:
+        close_llm_client(llm_client)
+
+
+def run_story(cfg: AppConfig, user_story: str, log_dir: Path, llm_client: AbstractLLMClient,
+              browser: Optional[Browser] = None, schema_output: bool = True) -> Dict[str, Any]:
+    """
+    User story -> intents -> grounded, executed steps, outputs saved in log_dir.
+    browser: launched browser shared across stories (batch workers); the story gets its own context.
+    """
+    from llm_service.cassette_client import CassetteLLMClient
+    from llm_service.grounder import extract_intents_dynamic
+    from llm_service.ledger import LLMLedger, CALL_SCHEMA
+    from llm_service.speculative import SpeculativeGrounder
+    from pw_lib_ext.runner import PWStepExecutor
+    from pw_lib_ext.step_exporter import steps_to_playwright_jsonl
+
+    pw_style_file_json = PW_STYLE_FILE_JSON
+    plan_file_json = PLAN_FILE_JSON
+    artifacts_file_json = ARTIFACTS_FILE_JSON
+    run_log_file_json = RUN_LOG_FILE_JSON
+    schema_based_output_file_json = SCHEMA_BASED_OUTPUT_FILE_JSON
 
+    # region Define Prompt For LLM -> User Story To List Of Intents - > [Execute Each UI Action For Each Intent ]
+    # fresh agent (history) and ledger per story; the LLM client and its connection pool are shared
+    ledger = LLMLedger(log_dir / LLM_LEDGER_FILE_JSONL)
+    llm_agent, grounder = build_grounder(cfg, llm_client, ledger)
     # endregion
 
     # -------- Phase 2: Grounder (per step) --------
 
-    # region Ground The Intent To Actual Tool Based UI Action
-    grounder = Grounder(cfg=cfg, llm=llm_agent)
+    runner = PWStepExecutor(cfg, log_dir, browser=browser)
 
-    runner = PWStepExecutor(cfg, log_dir)
-    runner.start()
+    # region LLM Service For Getting Use Case Into Intents (overlaps with browser launch)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="intents") as pool:
+        intents_future = pool.submit(extract_intents_dynamic, user_story, llm_agent)
+        try:
+            # inside the try: a browser that fails to start half way is still closed
+            runner.start()
+            intents: Intents = intents_future.result()
+        except Exception:
+            runner.close()
+            raise
+
+    # endregion
+
+    speculative = SpeculativeGrounder(grounder, threshold=cfg.grounding.speculative.similarityThreshold) \
+        if cfg.grounding.speculative.enabled else None
     final_steps = []
     try:
-        for intent in intents.intents:
-            dom_id, sc_id = runner.artifacts.latest_ids()
-            dom_path = runner.artifacts.get_dom_path_by_id(dom_id) or ""
-            sc_path = runner.artifacts.get_screenshot_path_by_id(sc_id) or ""
-
-            dom_raw = _read_text_safe(dom_path, limit=5_000_000) if dom_path else ""
-            dom_clean = sanitize_html_for_llm(dom_raw, max_attr_len=1024) if dom_raw else ""
-            dom_summary = _summarize_dom_for_llm(dom_clean, max_chars=5_000_000) if dom_raw else ""
-            msg = f'Intent Being Processed is - {intent.step_no}. {intent.intent}'
-            logger.info(msg)
-            print(msg)
-            g_step = grounder.get_pw_step_from_llm(
-                intent.intent, dom_id=dom_id, sc_id=sc_id,
-                artifact_dom=dom_summary,
-                screenshot_path=sc_path
-            )
-
-            final_steps: List[Step] = runner.execute_steps([g_step], intent.step_no)
-            final_steps.extend(final_steps)
+        for pos, intent in enumerate(intents.intents):
+            # grounding-side spans of this intent (cache, DOM read, LLM call) join the step's timingsMs
+            with runner.tracer.collect() as timings, span("intent", stepNo=intent.step_no):
+                dom_id, sc_id = runner.artifacts.latest_ids()
+                dom_hash = runner.artifacts.get_dom_hash_by_id(dom_id)
+                sc_path = runner.artifacts.get_screenshot_path_by_id(sc_id) or ""
+                sc_scroll = runner.artifacts.get_screenshot_scroll_by_id(sc_id)
+                sc_png = runner.artifacts.get_screenshot_bytes_by_id(sc_id) if sc_id else None
+                page_text: Optional[Tuple[str, str]] = None
+                msg = f'Intent Being Processed is - {intent.step_no}. {intent.intent}'
+                logger.info(msg)
+                print(msg)
+
+                g_step = grounder.get_cached_step(intent.intent, dom_id=dom_id, sc_id=sc_id, dom_hash=dom_hash)
+                if speculative and g_step is None and speculative.pending_for(intent.intent):
+                    page_text = _load_page_for_llm(runner, cfg, dom_id)
+                    g_step = speculative.resolve(intent.intent, dom_id, sc_id, dom_hash, *page_text)
+                elif speculative:
+                    speculative.cancel()
+                if g_step is None:
+                    if page_text is None:
+                        page_text = _load_page_for_llm(runner, cfg, dom_id)
+                    g_step = grounder.get_pw_step_from_llm(
+                        intent.intent, dom_id=dom_id, sc_id=sc_id,
+                        artifact_dom=page_text[0],
+                        artifact_digest=page_text[1],
+                        screenshot_path=sc_path,
+                        dom_hash=dom_hash,
+                        screenshot_scroll=sc_scroll,
+                        screenshot_png=sc_png
+                    )
+
+                if speculative and dom_id and pos + 1 < len(intents.intents):
+                    # ground the next intent against the current page while this step executes
+                    if page_text is None:
+                        page_text = _load_page_for_llm(runner, cfg, dom_id)
+                    speculative.start(intents.intents[pos + 1].intent, dom_id, sc_id, page_text[0], sc_path, dom_hash,
+                                      digest_text=page_text[1], screenshot_scroll=sc_scroll,
+                                      screenshot_png=sc_png)
+
+                executed_steps: List[Step] = runner.execute_steps([g_step], intent.step_no)
+                if runner.run_log["steps"] and runner.run_log["steps"][-1]["status"] == "passed":
+                    grounder.record_success(g_step)
+                else:
+                    grounder.discard(g_step)
+                final_steps.extend(executed_steps)
+            if runner.run_log["steps"]:
+                step_timings = runner.run_log["steps"][-1].setdefault("timingsMs", {})
+                for name, ms in timings_ms(timings).items():
+                    step_timings.setdefault(name, ms)
     except Exception as e:
         runner.close()
         msg = f'Exception Encountered - {type(e).__name__}'
@@ -189,6 +419,8 @@ def main():
 
     finally:
         runner.close()
+        if speculative:
+            speculative.close()
 
         # region Write Execution Info To Log / JSON file
         msg = (f'Execution Completed...'
@@ -198,35 +430,54 @@ def main():
                )
         print(msg)
         logger.info(msg)
+        runner.run_log["llmHistory"] = llm_agent.history.stats()
+        runner.run_log["groundingCache"] = grounder.cache_stats()
+        runner.run_log["groundingCalls"] = grounder.call_log
+        if llm_agent.token_budget:
+            runner.run_log["tokenBudget"] = llm_agent.token_budget.stats()
+        if speculative:
+            runner.run_log["speculativeGrounding"] = speculative.stats
+        if isinstance(llm_client, CassetteLLMClient):
+            runner.run_log["llmCassette"] = {"mode": llm_client.mode, **llm_client.stats}
+        runner.run_log["llm"] = ledger.summary()
         runner.save_outputs(final_steps,
                             plan_file=plan_file_json,
                             artifacts_file=artifacts_file_json,
                             run_log_file=run_log_file_json)
         jsonl_path = log_dir / pw_style_file_json
         steps_to_playwright_jsonl(final_steps, jsonl_path)
-        schema = Path(SCHEMA_FILE).read_text(encoding='utf-8')
-
-        log_folder = runner.run_dir
-        artifacts_contents = Path(log_folder / artifacts_file_json).read_text(encoding='utf-8')
-        plan_contents = Path(log_folder / plan_file_json).read_text(encoding='utf-8')
-        plan_pw_contents = Path(log_folder / pw_style_file_json).read_text(encoding='utf-8')
-        run_log_contents = Path(log_folder / run_log_file_json).read_text(encoding='utf-8')
-        schema_based_output_file_json_path = Path(log_folder / schema_based_output_file_json)
-
-        system_prompt_to_generate_output_in_desired_schema = get_ai_sys_role_to_transform_artifacts_to_desired_schema()
-        user_prompt_to_generate_output_in_desired_schema = get_ai_user_role_artifacts_to_transform_to_desired_schema(
-            schema=schema,
-            artifacts_json=artifacts_contents,
-            plan_json=plan_contents,
-            pw_json=plan_pw_contents,
-            run_log_json=run_log_contents
-        )
-        messages = [
-            {"role": "system", "content": system_prompt_to_generate_output_in_desired_schema},
-            {"role": "system", "content": user_prompt_to_generate_output_in_desired_schema}
-        ]
-        response = llm_client.execute_chat_completion_api(message=messages, response_format={"type": "json_object"})
-        schema_based_output_file_json_path.write_text(json.dumps(response, indent=2), encoding='utf-8')
+        if schema_output:
+            schema = Path(SCHEMA_FILE).read_text(encoding='utf-8')
+
+            log_folder = runner.run_dir
+            artifacts_path = Path(log_folder / artifacts_file_json)
+            artifacts_contents = artifacts_path.read_text(encoding='utf-8') if artifacts_path.exists() else \
+                artifacts_to_json_str(artifacts_from_jsonl(str(runner.artifacts.jsonl_path)))
+            plan_contents = Path(log_folder / plan_file_json).read_text(encoding='utf-8')
+            plan_pw_contents = Path(log_folder / pw_style_file_json).read_text(encoding='utf-8')
+            run_log_contents = Path(log_folder / run_log_file_json).read_text(encoding='utf-8')
+            schema_based_output_file_json_path = Path(log_folder / schema_based_output_file_json)
+
+            system_prompt_to_generate_output_in_desired_schema = get_ai_sys_role_to_transform_artifacts_to_desired_schema()
+            user_prompt_to_generate_output_in_desired_schema = get_ai_user_role_artifacts_to_transform_to_desired_schema(
+                schema=schema,
+                artifacts_json=artifacts_contents,
+                plan_json=plan_contents,
+                pw_json=plan_pw_contents,
+                run_log_json=run_log_contents
+            )
+            messages = [
+                {"role": "system", "content": system_prompt_to_generate_output_in_desired_schema},
+                {"role": "system", "content": user_prompt_to_generate_output_in_desired_schema}
+            ]
+            with span("schema.transform"):
+                response = ledger.complete(llm_client, CALL_SCHEMA, messages, response_format={"type": "json_object"})
+            schema_based_output_file_json_path.write_text(json.dumps(response, indent=2), encoding='utf-8')
+            if cfg.logging.saveRunLog:
+                # roll-up again so run_log.json counts the schema call too
+                runner.run_log["llm"] = ledger.summary()
+                Path(log_folder / run_log_file_json).write_text(
+                    json.dumps(runner.run_log, indent=2, ensure_ascii=False), encoding='utf-8')
 
         # endregion
 
@@ -239,17 +490,99 @@ def main():
                f' - {artifacts_file_json}\n'
                f' - {pw_style_file_json}\n'
                f' - {run_log_file_json if cfg.logging.saveRunLog else ""}\n'
-               f' - {schema_based_output_file_json}')
+               f' - {schema_based_output_file_json if schema_output else ""}')
 
         print(msg)
         logger.info(msg)
 
         # endregion
 
+    steps = runner.run_log["steps"]
+    passed = sum(1 for e in steps if e["status"] == "passed")
+    return {"runDir": str(log_dir), "intents": len(intents.intents), "steps": len(steps), "passed": passed,
+            "failed": len(steps) - passed, "status": "passed" if steps and passed == len(steps) else "failed"}
+
     # endregion
 
 
+def replay_main(plan_path: str, llm_fallback: bool = True, har_path: Optional[str] = None,
+                cfg: Optional[AppConfig] = None) -> Dict[str, Any]:
+    """
+    Re-run a recorded plan (playwright.jsonl or plan.json) without the LLM. Failing steps are healed
+    with their alternates; only steps that still fail are grounded again (when llm_fallback).
+    har_path: serve the site from the run's recorded HAR, no network (cassette replay covers the LLM).
+    """
+    from llm_service.ledger import LLMLedger
+    from pw_lib_ext.replay import PlanReplayer
+    from pw_lib_ext.step_exporter import steps_to_playwright_jsonl, load_plan
+
+    setup_logging()
+    cfg = cfg or build_config()
+    if har_path:
+        cfg.browser.har.mode = "replay"
+        cfg.browser.har.path = har_path
+    # replay is not grounding: no per-step captures, slow motion or video unless a step needs the grounder
+    cfg.grounding.artifactPolicy.captureOnEveryStep = False
+    cfg.grounding.artifactPolicy.captureOnAutoSuggestVisible = False
+    cfg.browser.slowMoMs = 0
+    cfg.browser.recordVideo = False
+
+    log_dir = new_run_dir()
+    steps = load_plan(Path(plan_path))
+    msg = f'Replaying {len(steps)} steps from - {plan_path}'
+    logger.info(msg)
+    print(msg)
+
+    fallback: Dict[str, Any] = {}
+
+    def reground(runner: PWStepExecutor, step: Step) -> Optional[Step]:
+        if "grounder" not in fallback:
+            # built on first failure only: a clean replay never loads the LLM client
+            fallback["llm_client"] = build_llm_client(cfg)
+            fallback["ledger"] = LLMLedger(log_dir / LLM_LEDGER_FILE_JSONL)
+            fallback["llm_agent"], fallback["grounder"] = build_grounder(cfg, fallback["llm_client"],
+                                                                         fallback["ledger"])
+        grounder: Grounder = fallback["grounder"]
+        dom_id, sc_id = runner.capture_now()
+        page_text = _load_page_for_llm(runner, cfg, dom_id)
+        return grounder.get_pw_step_from_llm(
+            step.intent, dom_id=dom_id, sc_id=sc_id,
+            artifact_dom=page_text[0],
+            artifact_digest=page_text[1],
+            screenshot_path=runner.artifacts.get_screenshot_path_by_id(sc_id) or "",
+            dom_hash=runner.artifacts.get_dom_hash_by_id(dom_id),
+            screenshot_scroll=runner.artifacts.get_screenshot_scroll_by_id(sc_id),
+            screenshot_png=runner.artifacts.get_screenshot_bytes_by_id(sc_id)
+        )
+
+    replayer = PlanReplayer(cfg, log_dir, reground=reground if llm_fallback else None)
+    final_steps: List[Step] = []
+    try:
+        final_steps = replayer.run(steps)
+    finally:
+        runner = replayer.runner
+        if "grounder" in fallback:
+            runner.run_log["groundingCalls"] = fallback["grounder"].call_log
+            runner.run_log["llm"] = fallback["ledger"].summary()
+            close_llm_client(fallback["llm_client"])
+        runner.save_outputs(final_steps,
+                            plan_file=PLAN_FILE_JSON,
+                            artifacts_file=ARTIFACTS_FILE_JSON,
+                            run_log_file=RUN_LOG_FILE_JSON)
+        steps_to_playwright_jsonl(final_steps, log_dir / PW_STYLE_FILE_JSON)
+        stats = replayer.stats
+        msg = (f'Replay Completed - {stats["passed"]}/{stats["steps"]} passed, {stats["healed"]} healed, '
+               f'{stats["regrounded"]} re-grounded in {stats["replayMs"]} ms\n'
+               f'Saved outputs to - {log_dir.resolve()}')
+        print(msg)
+        logger.info(msg)
+    return {"runDir": str(log_dir), **replayer.stats}
+
+
 # endregion
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 2 and sys.argv[1] == "replay":
+        replay_main(sys.argv[2], har_path=sys.argv[3] if len(sys.argv) > 3 else None)
+    else:
+        main()
@@ -0,0 +1,94 @@
+"""
+Date                Author                                  Change Details
+17-10-2026          Coforge                                 Background Artifact Writer
+                                                            (disk writes off the per-step critical path)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from pathlib import Path
+from typing import Dict, Any, Union, Callable, Optional
+
+from telemetry.spans import span
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter:
+    """
+    Writes artifact files on a small thread pool. At most 'max_queue' writes are outstanding;
+    submit() blocks beyond that so a slow disk applies back-pressure instead of growing memory.
+    flush() waits for every submitted write; wait_for(path) waits for one file.
+    With enabled=False writes happen inline (the previous synchronous behaviour).
+    """
+
+    def __init__(self, enabled: bool = True, max_workers: int = 2, max_queue: int = 64):
+        self.enabled = enabled
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer") \
+            if enabled else None
+        self._slots = threading.BoundedSemaphore(max(1, max_queue))
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self.stats: Dict[str, Any] = {"writes": 0, "bytes": 0, "errors": 0, "blockedMs": 0, "flushMs": 0}
+
+    @staticmethod
+    def _write(path: Path, data: Union[bytes, str], encode: Optional[Callable[[bytes], bytes]] = None,
+               atomic: bool = False) -> None:
+        if encode is not None:
+            data = encode(data.encode("utf-8") if isinstance(data, str) else data)
+        target = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp") if atomic else path
+        if isinstance(data, str):
+            target.write_text(data, encoding="utf-8")
+        else:
+            target.write_bytes(data)
+        if atomic:
+            os.replace(target, path)
+
+    def _run(self, path: Path, data: Union[bytes, str], encode: Optional[Callable[[bytes], bytes]],
+             atomic: bool) -> None:
+        try:
+            with span("artifact.write", file=path.name):
+                self._write(path, data, encode, atomic)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.info(f'Artifact write failed for {path} - {type(e).__name__}: {e}')
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(str(path), None)
+            self._slots.release()
+
+    def submit(self, path: Path, data: Union[bytes, str], encode: Optional[Callable[[bytes], bytes]] = None,
+               atomic: bool = False) -> None:
+        """Queue a write; 'encode' (e.g. compression) runs on the writer thread, 'atomic' writes via rename."""
+        self.stats["writes"] += 1
+        self.stats["bytes"] += len(data)
+        if not self._pool:
+            self._write(path, data, encode, atomic)
+            return
+        started = time.perf_counter()
+        self._slots.acquire()
+        self.stats["blockedMs"] += int((time.perf_counter() - started) * 1000)
+        with self._lock:
+            self._pending[str(path)] = self._pool.submit(self._run, path, data, encode, atomic)
+
+    def wait_for(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            future = self._pending.get(str(path))
+        if future is not None:
+            wait([future])
+
+    def flush(self) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+        self.stats["flushMs"] += int((time.perf_counter() - started) * 1000)
+
+    def close(self) -> None:
+        self.flush()
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
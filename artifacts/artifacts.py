@@ -3,27 +3,55 @@ Date                Author                                  Change Details
 02-02-2026          Coforge                                 Managing Results/Generated Files
 """
 import hashlib
+import json
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple, Optional, Any, List
 
 from playwright.sync_api import Page
 
+from artifacts.artifact_writer import BackgroundWriter
+from artifacts.blob_store import BlobStore
+from artifacts.element_digest import capture_dom_and_digest
 from dataclass.conceptual_objects import (ArtifactsMap,
-                                          ArtifactsMapEntry)
+                                          ArtifactsMapEntry, artifact_entry_to_jsonl)
+from telemetry.spans import span
 
 
 class ArtifactManager:
-    def __init__(self, run_dir: Path, full_page: bool = False):
+    def __init__(self, run_dir: Path, full_page: bool = False, capture_digest: bool = False,
+                 background_writes: bool = True, writer_threads: int = 2, writer_queue: int = 64,
+                 memory_captures: int = 8, blob_dir: Optional[Path] = None, blob_codec: str = "auto",
+                 jsonl_name: Optional[str] = "artifacts.jsonl"):
         self.run_dir = run_dir
         self.full_page = full_page
+        self.capture_digest = capture_digest
         self.dom_dir = self.run_dir / "dom"
         self.sc_dir = self.run_dir / "screens"
-        self.dom_dir.mkdir(parents=True, exist_ok=True)
-        self.sc_dir.mkdir(parents=True, exist_ok=True)
+        self.digest_dir = self.run_dir / "digest"
         self.screenshot_id = 0
         self.dom_id = 0
         self.map = ArtifactsMap()
+        # every entry is appended here as it is captured (line buffered), nothing to dump at the end
+        self.jsonl_path = self.run_dir / jsonl_name if jsonl_name else None
+        self._jsonl = open(self.jsonl_path, "a", encoding="utf-8", buffering=1) if self.jsonl_path else None
+        # scroll offset at capture time, locates the viewport inside a full-page screenshot
+        self.screenshot_scroll: Dict[int, Tuple[int, int]] = {}
+        # the last 'memory_captures' DOMs / digests / screenshots stay in memory for the grounder;
+        # files are written by the background writer and only read back once evicted
+        self.writer = BackgroundWriter(enabled=background_writes, max_workers=writer_threads, max_queue=writer_queue)
+        self.memory_captures = max(1, memory_captures)
+        self._dom_buf: "OrderedDict[int, str]" = OrderedDict()
+        self._digest_buf: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._sc_buf: "OrderedDict[int, bytes]" = OrderedDict()
+        # content-addressed, compressed store: pathRef points at the blob, identical captures stored once
+        self.blobs = BlobStore(blob_dir, self.writer, codec=blob_codec) if blob_dir else None
+        if not self.blobs:
+            self.dom_dir.mkdir(parents=True, exist_ok=True)
+            self.sc_dir.mkdir(parents=True, exist_ok=True)
+            if self.capture_digest:
+                self.digest_dir.mkdir(parents=True, exist_ok=True)
 
     def _ts(self) -> str:
         return datetime.now().isoformat(timespec="seconds") + "Z"
@@ -31,53 +59,159 @@ class ArtifactManager:
     def _sha1(self, text: str) -> str:
         return "sha1:" + hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
 
+    def _keep(self, buf: OrderedDict, key: int, value: Any) -> None:
+        buf[key] = value
+        while len(buf) > self.memory_captures:
+            buf.popitem(last=False)
+
+    def _add(self, kind: str, entry: ArtifactsMapEntry) -> None:
+        self.map.add(kind, entry)
+        if self._jsonl:
+            self._jsonl.write(artifact_entry_to_jsonl(kind, entry))
+
+    def _persist(self, path: Path, data: Any, suffix: str, compress: bool = True) -> str:
+        """Queue 'data' for disk, as a blob when the store is enabled; returns the pathRef."""
+        if self.blobs:
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+            return self.blobs.put(raw, suffix, compress=compress)[0]
+        self.writer.submit(path, data)
+        return str(path)
+
     def capture_dom_and_screenshot(self, page: Page) -> Tuple[int, int]:
+        with span("capture"):
+            return self._capture(page)
+
+    def _capture(self, page: Page) -> Tuple[int, int]:
         # DOM
         self.dom_id += 1
         dom_path = self.dom_dir / f"{self.dom_id:04d}.html"
-        dom_content = page.content()
-        dom_path.write_text(dom_content, encoding="utf-8")
+        digest: Optional[Dict[str, Any]] = None
+        with span("capture.dom", digest=self.capture_digest):
+            if self.capture_digest:
+                # HTML and digest from one evaluate, so the digest describes exactly this DOM
+                try:
+                    dom_content, digest = capture_dom_and_digest(page)
+                except Exception as e:
+                    dom_content = page.content()
+                    digest = {"url": page.url, "error": type(e).__name__, "elements": []}
+            else:
+                dom_content = page.content()
+        self._keep(self._dom_buf, self.dom_id, dom_content)
+        dom_ref = self._persist(dom_path, dom_content, ".html")
         dom_entry = ArtifactsMapEntry(
             id=self.dom_id,
-            pathRef=str(dom_path),
+            pathRef=dom_ref,
             url=page.url,
             timestamp=self._ts(),
             domHash=self._sha1(dom_content),
         )
-        self.map.dom.append(dom_entry)
+        self._add("dom", dom_entry)
+
+        # Actionable-element digest (same id as the DOM it was taken with)
+        if digest is not None:
+            digest_path = self.digest_dir / f"{self.dom_id:04d}.json"
+            self._keep(self._digest_buf, self.dom_id, digest)
+            digest_ref = self._persist(digest_path, json.dumps(digest, ensure_ascii=False), ".json")
+            self._add("digest", ArtifactsMapEntry(
+                id=self.dom_id,
+                pathRef=digest_ref,
+                url=page.url,
+                timestamp=self._ts(),
+                domHash=dom_entry.domHash,
+            ))
 
         # Screenshot
         self.screenshot_id += 1
         sc_path = self.sc_dir / f"{self.screenshot_id:04d}.png"
-        page.screenshot(path=str(sc_path), full_page=self.full_page)
+        with span("capture.screenshot", fullPage=self.full_page):
+            png = page.screenshot(full_page=self.full_page)
+        self._keep(self._sc_buf, self.screenshot_id, png)
+        sc_ref = self._persist(sc_path, png, ".png", compress=False)
+        if self.full_page:
+            try:
+                self.screenshot_scroll[self.screenshot_id] = tuple(
+                    page.evaluate("() => [Math.round(scrollX), Math.round(scrollY)]"))
+            except Exception:
+                pass
         sc_entry = ArtifactsMapEntry(
             id=self.screenshot_id,
-            pathRef=str(sc_path),
+            pathRef=sc_ref,
             url=page.url,
             timestamp=self._ts(),
             domHash=None,
         )
-        self.map.screenshots.append(sc_entry)
+        self._add("screenshots", sc_entry)
 
         return (self.dom_id, self.screenshot_id)
 
     def latest_ids(self) -> Tuple[int, int]:
         return (self.dom_id, self.screenshot_id)
 
+    # ---------- reader API: memory first, then disk (waiting for a pending write, decompressing blobs) ----------
+    def _read_back(self, path: Optional[str]) -> Optional[bytes]:
+        if not path:
+            return None
+        if self.blobs:
+            return self.blobs.get(path)
+        self.writer.wait_for(path)
+        p = Path(path)
+        return p.read_bytes() if p.exists() else None
+
+    def get_dom_html_by_id(self, dom_id: int) -> str:
+        if dom_id in self._dom_buf:
+            return self._dom_buf[dom_id]
+        data = self._read_back(self.get_dom_path_by_id(dom_id))
+        return data.decode("utf-8", errors="ignore") if data else ""
+
+    def get_digest_by_id(self, dom_id: int) -> Optional[Dict[str, Any]]:
+        if dom_id in self._digest_buf:
+            return self._digest_buf[dom_id]
+        data = self._read_back(self.get_digest_path_by_id(dom_id))
+        return json.loads(data) if data else None
+
+    def get_screenshot_bytes_by_id(self, sc_id: int) -> Optional[bytes]:
+        if sc_id in self._sc_buf:
+            return self._sc_buf[sc_id]
+        return self._read_back(self.get_screenshot_path_by_id(sc_id))
+
+    def flush(self) -> None:
+        """Block until every artifact submitted so far is on disk."""
+        self.writer.flush()
+
+    def close(self) -> None:
+        self.writer.close()
+        if self._jsonl:
+            self._jsonl.close()
+            self._jsonl = None
+        self._dom_buf.clear()
+        self._digest_buf.clear()
+        self._sc_buf.clear()
+
     def to_dict(self) -> dict:
         return {
             "screenshots": [e.__dict__ for e in self.map.screenshots],
             "dom": [e.__dict__ for e in self.map.dom],
+            "digest": [e.__dict__ for e in self.map.digest],
         }
 
     def get_dom_path_by_id(self, dom_id: int) -> str | None:
-        for d in self.map.dom:
-            if d.id == dom_id:
-                return d.pathRef
-        return None
+        entry = self.map.get("dom", dom_id)
+        return entry.pathRef if entry else None
 
     def get_screenshot_path_by_id(self, sc_id: int) -> str | None:
-        for s in self.map.screenshots:
-            if s.id == sc_id:
-                return s.pathRef
-        return None
+        entry = self.map.get("screenshots", sc_id)
+        return entry.pathRef if entry else None
+
+    def get_screenshot_scroll_by_id(self, sc_id: int) -> Tuple[int, int]:
+        return self.screenshot_scroll.get(sc_id, (0, 0))
+
+    def get_dom_hash_by_id(self, dom_id: int) -> str | None:
+        entry = self.map.get("dom", dom_id)
+        return entry.domHash if entry else None
+
+    def get_digest_path_by_id(self, dom_id: int) -> str | None:
+        entry = self.map.get("digest", dom_id)
+        return entry.pathRef if entry else None
+
+    def get_dom_ids_by_hash(self, dom_hash: str) -> List[int]:
+        return [e.id for e in self.map.find_by_hash("dom", dom_hash)]
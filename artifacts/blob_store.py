@@ -0,0 +1,105 @@
+"""
+Date                Author                                  Change Details
+17-10-2026          Coforge                                 Content-Addressed, Compressed Artifact Store
+                                                            (identical DOMs / screenshots stored once)
+"""
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Literal
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is used without it
+    zstandard = None
+
+from artifacts.artifact_writer import BackgroundWriter
+
+logger = logging.getLogger(__name__)
+
+_EXT = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+
+
+def read_blob(path: str) -> bytes:
+    """Read a stored artifact and decompress it according to its extension."""
+    data = Path(path).read_bytes()
+    if path.endswith(".gz"):
+        return gzip.decompress(data)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+class BlobStore:
+    """
+    Artifacts keyed by the sha256 of their raw bytes: <root>/<2 hex>/<sha256><suffix><codec ext>.
+    A blob already known (this process) or present on disk (shared store) is not written again.
+    Compression runs on the background writer's threads; files are written atomically so runs
+    sharing one store never see a partial blob.
+    """
+
+    def __init__(self, root: Path, writer: BackgroundWriter,
+                 codec: Literal["auto", "zstd", "gzip", "none"] = "auto", level: int = 6):
+        if codec == "auto":
+            codec = "zstd" if zstandard is not None else "gzip"
+        elif codec == "zstd" and zstandard is None:
+            logger.info("zstandard not installed, artifact blobs use gzip")
+            codec = "gzip"
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.writer = writer
+        self.codec = codec
+        self.level = level
+        self._lock = threading.Lock()
+        self._known: set = set()
+        self.stats: Dict[str, Any] = {"codec": codec, "blobs": 0, "dedupHits": 0, "rawBytes": 0, "storedBytes": 0,
+                                      "dedupBytes": 0}
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            out = zstandard.ZstdCompressor(level=self.level).compress(data)
+        elif self.codec == "gzip":
+            out = gzip.compress(data, compresslevel=self.level, mtime=0)
+        else:
+            out = data
+        with self._lock:
+            self.stats["storedBytes"] += len(out)
+        return out
+
+    def path_for(self, digest: str, suffix: str, compress: bool = True) -> Path:
+        return self.root / digest[:2] / f"{digest}{suffix}{_EXT[self.codec] if compress else ''}"
+
+    def put(self, data: bytes, suffix: str = "", compress: bool = True) -> Tuple[str, str, bool]:
+        """
+        Store 'data'; returns (blob path, sha256 hex, newly written).
+        compress=False for payloads that are already compressed (PNG screenshots).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, suffix, compress)
+        with self._lock:
+            known = digest in self._known or path.exists()
+            self._known.add(digest)
+            if known:
+                self.stats["dedupHits"] += 1
+                self.stats["dedupBytes"] += len(data)
+            else:
+                self.stats["blobs"] += 1
+                self.stats["rawBytes"] += len(data)
+        if not known:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not compress:
+                with self._lock:
+                    self.stats["storedBytes"] += len(data)
+            self.writer.submit(path, data, encode=self._compress if compress else None, atomic=True)
+        return str(path), digest, not known
+
+    def get(self, path: str) -> Optional[bytes]:
+        self.writer.wait_for(path)
+        if not os.path.exists(path):
+            return None
+        return read_blob(path)
@@ -0,0 +1,132 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Actionable-Element Digest (accessibility-tree like view)
+                                                        Compact grounding payload instead of raw HTML
+"""
+import json
+from typing import List, Dict, Any, Tuple
+
+from playwright.sync_api import Page
+
+MAX_DIGEST_ELEMENTS = 1500
+
+# Single in-page evaluate: interactive + landmark elements with role, accessible name,
+# visible text, test ids, placeholder and bounding box. Hidden / zero-size nodes are skipped.
+DIGEST_JS = r"""
+(maxElements) => {
+  const SELECTOR = [
+    'a[href]', 'button', 'input:not([type=hidden])', 'select', 'textarea', 'summary', 'option',
+    '[role]', '[tabindex]:not([tabindex="-1"])', '[contenteditable=""]', '[contenteditable=true]', '[onclick]',
+    'header', 'nav', 'main', 'footer', 'aside', 'form', 'dialog', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label'
+  ].join(',');
+  const IMPLICIT = {A: 'link', BUTTON: 'button', SELECT: 'combobox', TEXTAREA: 'textbox', SUMMARY: 'button',
+    OPTION: 'option', HEADER: 'banner', NAV: 'navigation', MAIN: 'main', FOOTER: 'contentinfo',
+    ASIDE: 'complementary', FORM: 'form', DIALOG: 'dialog', H1: 'heading', H2: 'heading', H3: 'heading',
+    H4: 'heading', H5: 'heading', H6: 'heading', LABEL: 'label'};
+  const INPUT_ROLE = {button: 'button', submit: 'button', reset: 'button', image: 'button', checkbox: 'checkbox',
+    radio: 'radio', range: 'slider', search: 'searchbox', email: 'textbox', tel: 'textbox', url: 'textbox',
+    text: 'textbox', password: 'textbox', number: 'spinbutton'};
+  const clip = (s, n) => { s = (s || '').replace(/\s+/g, ' ').trim(); return s.length > n ? s.slice(0, n) + '…' : s; };
+  const roleOf = (el) => {
+    const r = el.getAttribute('role');
+    if (r) return r.split(' ')[0];
+    if (el.tagName === 'INPUT') return INPUT_ROLE[(el.type || 'text').toLowerCase()] || 'textbox';
+    return IMPLICIT[el.tagName] || el.tagName.toLowerCase();
+  };
+  const nameOf = (el) => {
+    const aria = el.getAttribute('aria-label');
+    if (aria) return aria;
+    const by = el.getAttribute('aria-labelledby');
+    if (by) {
+      const t = by.split(/\s+/).map(id => document.getElementById(id)).filter(Boolean).map(n => n.innerText).join(' ');
+      if (t.trim()) return t;
+    }
+    if (el.id && el.labels && el.labels.length) return Array.from(el.labels).map(l => l.innerText).join(' ');
+    return el.getAttribute('alt') || el.getAttribute('title') || (el.tagName === 'INPUT' ? (el.value || '') : '');
+  };
+  const visible = (el, rect) => {
+    if (rect.width <= 0 || rect.height <= 0) return false;
+    const st = getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none' && st.opacity !== '0'
+      && el.getAttribute('aria-hidden') !== 'true';
+  };
+  const out = [];
+  for (const el of document.querySelectorAll(SELECTOR)) {
+    if (out.length >= maxElements) break;
+    const rect = el.getBoundingClientRect();
+    if (!visible(el, rect)) continue;
+    const testAttr = Array.from(el.attributes).find(a => /test/i.test(a.name));
+    const item = {
+      i: out.length,
+      role: roleOf(el),
+      tag: el.tagName.toLowerCase(),
+      name: clip(nameOf(el), 80),
+      text: clip(el.innerText, 80),
+      box: [Math.round(rect.x), Math.round(rect.y), Math.round(rect.width), Math.round(rect.height)],
+    };
+    if (el.id) item.id = clip(el.id, 60);
+    if (el.getAttribute('name')) item.nameAttr = clip(el.getAttribute('name'), 60);
+    if (testAttr) item.testId = [testAttr.name, clip(testAttr.value, 60)];
+    if (el.getAttribute('placeholder')) item.placeholder = clip(el.getAttribute('placeholder'), 60);
+    if (el.getAttribute('href')) item.href = clip(el.getAttribute('href'), 100);
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true') item.disabled = true;
+    if (el.getAttribute('aria-expanded')) item.expanded = el.getAttribute('aria-expanded');
+    out.push(item);
+  }
+  return {url: location.href, title: document.title,
+    viewport: [window.innerWidth, window.innerHeight], scroll: [Math.round(scrollX), Math.round(scrollY)],
+    elements: out};
+}
+"""
+
+
+def capture_element_digest(page: Page, max_elements: int = MAX_DIGEST_ELEMENTS) -> Dict[str, Any]:
+    return page.evaluate(DIGEST_JS, max_elements)
+
+
+# page.content()'s serialisation (doctype + outerHTML) and the digest in one synchronous evaluate:
+# one round trip, and the page cannot change between the two
+DOM_AND_DIGEST_JS = r"""
+(maxElements) => {
+  let html = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '';
+  if (document.documentElement) html += document.documentElement.outerHTML;
+  return {html, digest: (""" + DIGEST_JS.strip() + r""")(maxElements)};
+}
+"""
+
+
+def capture_dom_and_digest(page: Page, max_elements: int = MAX_DIGEST_ELEMENTS) -> Tuple[str, Dict[str, Any]]:
+    """(page HTML as page.content() returns it, element digest of that same DOM)."""
+    result = page.evaluate(DOM_AND_DIGEST_JS, max_elements)
+    return result["html"], result["digest"]
+
+
+def format_digest_for_llm(digest: Dict[str, Any]) -> str:
+    """
+    One line per element, e.g.
+      [12] button "Search" text="Search" id=search-btn testId=data-testid:search box=1180,12,40,40
+    """
+    if not digest:
+        return ""
+    lines: List[str] = [
+        f'PAGE: {digest.get("title", "")} | {digest.get("url", "")} | viewport={digest.get("viewport")} '
+        f'scroll={digest.get("scroll")}'
+    ]
+    for el in digest.get("elements", []):
+        parts = [f'[{el.get("i")}] {el.get("role")}']
+        if el.get("name"):
+            parts.append(json.dumps(el["name"], ensure_ascii=False))
+        if el.get("tag") and el.get("tag") != el.get("role"):
+            parts.append(f'<{el["tag"]}>')
+        if el.get("text") and el.get("text") != el.get("name"):
+            parts.append("text=" + json.dumps(el["text"], ensure_ascii=False))
+        for key in ("id", "nameAttr", "placeholder", "href", "expanded"):
+            if el.get(key):
+                parts.append(f'{key}={el[key]}')
+        if el.get("testId"):
+            parts.append(f'testId={el["testId"][0]}:{el["testId"][1]}')
+        if el.get("disabled"):
+            parts.append("disabled")
+        parts.append("box=" + ",".join(str(v) for v in el.get("box", [])))
+        lines.append(" ".join(parts))
+    return "\n".join(lines)
@@ -0,0 +1,201 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Batch Script (Many User Stories, Worker Processes)
+                                                        (one browser per worker, one context + run dir per story)
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app import build_config, build_llm_client, close_llm_client, run_story, setup_logging
+from constant.const_config import LOG_FOLDER
+from pw_lib_ext.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FILE_JSON = "batch_summary.json"
+
+_UNSAFE_DIR_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+# per worker process: playwright, its browser and the LLM client, reused by every story the worker runs
+_WORKER: Dict[str, Any] = {}
+
+
+def load_stories(path: str) -> List[Dict[str, Any]]:
+    """
+    Stories from JSONL ({"id": ..., "story": ...} per line) or CSV (columns id, story).
+    A missing id becomes the 1-based line / row number; ids must be unique.
+    Each story gets 'pos' (its row number) and 'dirName', a run dir name that cannot leave
+    the batch dir whatever the id contains.
+    """
+    stories: List[Dict[str, Any]] = []
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    seen: Dict[str, int] = {}
+    for pos, row in enumerate(rows, start=1):
+        story = row.get("story") or row.get("prompt") or ""
+        if not story.strip():
+            raise ValueError(f"Story {pos} in {path} has no 'story' text.")
+        story_id = str(row.get("id") or pos)
+        if story_id in seen:
+            raise ValueError(f"Story {pos} in {path} repeats id {story_id!r} of story {seen[story_id]}.")
+        seen[story_id] = pos
+        safe_id = _UNSAFE_DIR_CHARS.sub("_", story_id).strip("._")[:60]
+        stories.append({"id": story_id, "story": story, "pos": pos,
+                        "dirName": f"story_{pos:04d}_{safe_id}" if safe_id else f"story_{pos:04d}"})
+    return stories
+
+
+def pool_size(cfg: AppConfig, story_count: int) -> int:
+    workers = cfg.batch.workers or min(os.cpu_count() or 1, cfg.batch.llmQuota)
+    return max(1, min(workers, story_count))
+
+
+def _launch_worker_browser() -> None:
+    from pw_lib_ext.browser_server import BrowserServer
+    from pw_lib_ext.runner import launch_browser
+    cfg: AppConfig = _WORKER["cfg"]
+    if cfg.browserServer.enabled:
+        # workers share the warm server; each connection gets its own contexts
+        _WORKER["browser"], _WORKER["browserServer"] = BrowserServer(cfg).connect(_WORKER["pw"])
+    else:
+        _WORKER["browser"] = launch_browser(_WORKER["pw"], cfg.browser)
+
+
+def _close_worker() -> None:
+    browser = _WORKER.pop("browser", None)
+    pw = _WORKER.pop("pw", None)
+    llm_client = _WORKER.pop("llm_client", None)
+    try:
+        if browser: browser.close()
+        if pw: pw.stop()
+    finally:
+        if llm_client is not None:
+            close_llm_client(llm_client)
+
+
+def _init_worker(cfg: AppConfig, batch_dir: str) -> None:
+    from playwright.sync_api import sync_playwright
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    fh = logging.FileHandler(os.path.join(batch_dir, f"worker_{os.getpid()}.log"), mode="w", encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s "
+                                      "[%(name)s %(filename)s:%(lineno)d %(funcName)s] %(message)s"))
+    root.addHandler(fh)
+
+    _WORKER["cfg"] = cfg
+    _WORKER["llm_client"] = build_llm_client(cfg)
+    _WORKER["pw"] = sync_playwright().start()
+    _launch_worker_browser()
+    # ProcessPoolExecutor workers skip atexit; multiprocessing finalizers still run on a clean exit
+    Finalize(None, _close_worker, exitpriority=10)
+
+
+def _run_story_in_worker(story_id: str, story: str, run_dir: str) -> Dict[str, Any]:
+    cfg: AppConfig = _WORKER["cfg"]
+    if not _WORKER["browser"].is_connected():
+        logger.info("Worker browser disconnected, launching a new one")
+        _launch_worker_browser()
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"id": story_id, "worker": os.getpid()}
+    if "browserServer" in _WORKER:
+        # reported once per connection: the first story the worker runs after connecting
+        result["browserServer"] = _WORKER.pop("browserServer")
+    try:
+        result.update(run_story(cfg, story, Path(run_dir), _WORKER["llm_client"], browser=_WORKER["browser"],
+                                schema_output=cfg.batch.schemaOutput))
+    except Exception as e:
+        logger.exception(f"Story {story_id} failed")
+        result.update({"runDir": run_dir, "status": "error", "error": f"{type(e).__name__}: {e}"})
+    result["durationSec"] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def batch_main(stories_path: str, cfg: Optional[AppConfig] = None) -> Dict[str, Any]:
+    setup_logging()
+    cfg = cfg or build_config()
+    cfg.browser.headless = cfg.batch.headless
+    cfg.browser.slowMoMs = 0
+
+    stories = load_stories(stories_path)
+    time_stamp = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y%m%d_%H%M%S")
+    batch_dir = Path(os.path.join(LOG_FOLDER, f'batch_{time_stamp}'))
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    workers = pool_size(cfg, len(stories))
+    server = None
+    if cfg.browserServer.enabled:
+        # launched (or health-checked) once here, so workers don't race to start it
+        from pw_lib_ext.browser_server import BrowserServer
+        server = BrowserServer(cfg)
+        server.ensure()
+    msg = f'Running {len(stories)} stories on {workers} workers - {batch_dir.resolve()}'
+    logger.info(msg)
+    print(msg)
+
+    started_at = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds")
+    started = time.perf_counter()
+    results: List[Tuple[int, Dict[str, Any]]] = []
+    # spawn: workers must not inherit the parent's threads / playwright state
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(cfg, str(batch_dir))) as pool:
+        futures = {pool.submit(_run_story_in_worker, s["id"], s["story"], str(batch_dir / s["dirName"])): s
+                   for s in stories}
+        for future in as_completed(futures):
+            story = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # worker process died
+                result = {"id": story["id"], "status": "error", "error": f"{type(e).__name__}: {e}"}
+            results.append((story["pos"], result))
+            print(f'[STORY - {result["id"]}] -> {result["status"]} ({len(results)}/{len(stories)})')
+    elapsed = time.perf_counter() - started
+    if server and not cfg.browserServer.keepAlive and server.launched_endpoint:
+        # this batch started the server and its workers are done: stop it, or the one a worker relaunched
+        server.stop()
+
+    # input order (not id order: "10" would sort before "2")
+    results_in_order = [r for _, r in sorted(results, key=lambda pr: pr[0])]
+    passed = sum(1 for r in results_in_order if r["status"] == "passed")
+    summary = {
+        "startedAt": started_at,
+        "endedAt": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds"),
+        "storiesFile": str(stories_path),
+        "workers": workers,
+        "stories": len(stories),
+        "passed": passed,
+        "failed": sum(1 for r in results_in_order if r["status"] == "failed"),
+        "errors": sum(1 for r in results_in_order if r["status"] == "error"),
+        "durationSec": round(elapsed, 2),
+        "storiesPerHour": round(len(stories) * 3600 / elapsed, 1) if elapsed > 0 else 0.0,
+        "results": results_in_order,
+    }
+    (batch_dir / SUMMARY_FILE_JSON).write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    msg = (f'Batch Completed - {passed}/{len(stories)} passed in {summary["durationSec"]} s '
+           f'({summary["storiesPerHour"]} stories/hour)\nSummary - {batch_dir / SUMMARY_FILE_JSON}')
+    logger.info(msg)
+    print(msg)
+    return summary
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python batch_runner.py <stories.jsonl|stories.csv>")
+        sys.exit(2)
+    batch_main(sys.argv[1])
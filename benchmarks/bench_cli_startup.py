@@ -0,0 +1,91 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - CLI Startup / Import Time (-X importtime)
+                                                        lazy CLI vs. the eager import set of the old app.py
+
+Usage (from project root):
+    python -m benchmarks.bench_cli_startup
+    python -m benchmarks.bench_cli_startup --repeat 10 --top 15 --json out.json
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+from constant.const_config import PARENT_DIR
+
+TARGETS = {
+    # what `prompt-web-test --help` costs
+    "cliHelp": "import cli; cli.build_parser().format_help()",
+    # what batch workers and the CLI pay for `import app` now
+    "importApp": "import app",
+    # what importing app.py used to load before any command ran
+    "eagerBaseline": "import dotenv, bs4, lxml.html, openai, httpx, playwright.sync_api",
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _parse_importtime(stderr: str) -> Dict[str, Any]:
+    """Total of top-level cumulative times and the slowest top-level imports."""
+    total_us = 0
+    top: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, module = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent <= 1:  # top level: imported by the -c code itself
+            total_us += cumulative
+            top.append({"module": module, "ms": round(cumulative / 1000, 2)})
+    top.sort(key=lambda t: -t["ms"])
+    return {"importMs": round(total_us / 1000, 2), "top": top}
+
+
+def _measure(code: str, repeat: int, top_n: int) -> Dict[str, Any]:
+    wall, imports = [], []
+    slowest: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=str(PARENT_DIR),
+                              capture_output=True, text=True)
+        wall.append((time.perf_counter() - started) * 1000)
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+        parsed = _parse_importtime(proc.stderr)
+        imports.append(parsed["importMs"])
+        slowest = parsed["top"][:top_n]
+    return {
+        "wallMsMedian": round(statistics.median(wall), 1),
+        "importMsMedian": round(statistics.median(imports), 1),
+        "slowestImports": slowest,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest top-level imports listed per target")
+    ap.add_argument("--json", dest="json_out", default=None, help="write results to this JSON file")
+    args = ap.parse_args(argv)
+
+    results: Dict[str, Any] = {"python": sys.version.split()[0], "repeat": args.repeat}
+    for name, code in TARGETS.items():
+        results[name] = _measure(code, args.repeat, args.top)
+    cli_ms = results["cliHelp"].get("wallMsMedian")
+    eager_ms = results["eagerBaseline"].get("wallMsMedian")
+    results["cliVsEagerSpeedup"] = round(eager_ms / cli_ms, 2) if cli_ms and eager_ms else None
+
+    print(json.dumps(results, indent=2))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - Grounding Payload Size, Sanitized HTML vs Element Digest
+
+Compares estimated prompt tokens of the two DOM payloads for every capture that has both a DOM
+and a digest (artifacts.jsonl of the run, or dom/NNNN.html + digest/NNNN.json). Grounding latency per payload kind is recorded at run time
+in run_log.json -> groundingCalls.
+
+Usage (from project root):
+    python -m benchmarks.bench_digest_payload [run_dir ...] [--json out.json]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Iterator, Tuple
+
+from artifacts.blob_store import read_blob
+from artifacts.element_digest import format_digest_for_llm
+from constant.const_config import LOG_FOLDER
+from dataclass.conceptual_objects import artifacts_from_jsonl
+from llm_service.dom_pipeline import preprocess_dom_for_llm
+from llm_service.tokens import estimate_text_tokens
+
+
+def _captures(run: str) -> Iterator[Tuple[str, str]]:
+    """(dom path, digest path) pairs of a run; blob-store runs are resolved through artifacts.jsonl."""
+    artifacts_jsonl = Path(run, "artifacts.jsonl")
+    if artifacts_jsonl.exists():
+        amap = artifacts_from_jsonl(str(artifacts_jsonl))
+        for e in amap.digest:
+            dom = amap.get("dom", e.id)
+            if dom and Path(e.pathRef).exists():
+                yield dom.pathRef, e.pathRef
+        return
+    for digest_path in sorted(Path(run, "digest").glob("*.json")):
+        dom_path = Path(run, "dom", digest_path.stem + ".html")
+        if dom_path.exists():
+            yield str(dom_path), str(digest_path)
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("runs", nargs="*", help="run directories (default: Logs/run_*)")
+    ap.add_argument("--json", dest="json_out", default=None)
+    args = ap.parse_args(argv)
+
+    runs = args.runs or sorted(glob.glob(os.path.join(LOG_FOLDER, "run_*")))
+    rows = []
+    for run in runs:
+        for dom_path, digest_path in _captures(run):
+            html_tokens = estimate_text_tokens(
+                preprocess_dom_for_llm(read_blob(dom_path).decode("utf-8", errors="ignore")))
+            digest = json.loads(read_blob(digest_path))
+            digest_tokens = estimate_text_tokens(format_digest_for_llm(digest))
+            rows.append({"capture": digest_path, "htmlTokens": html_tokens, "digestTokens": digest_tokens,
+                         "elements": len(digest.get("elements", []))})
+    if not rows:
+        print("No captures with both DOM and digest found - run app.py with captureElementDigest=True.")
+        return 2
+
+    html_total = sum(r["htmlTokens"] for r in rows)
+    digest_total = sum(r["digestTokens"] for r in rows)
+    result = {
+        "captures": len(rows),
+        "htmlTokens": html_total,
+        "digestTokens": digest_total,
+        "reduction": round(1 - digest_total / html_total, 4) if html_total else None,
+        "perCapture": rows,
+    }
+    print(json.dumps({k: v for k, v in result.items() if k != "perCapture"}, indent=2))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - DOM Preprocessing Throughput (MB/s)
+                                                        legacy BeautifulSoup two-parse path vs single-pass lxml
+
+Usage (from project root):
+    python -m benchmarks.bench_dom_pipeline                      # all captured pages under Logs/run_*
+    python -m benchmarks.bench_dom_pipeline page1.html page2.html
+    python -m benchmarks.bench_dom_pipeline --repeat 5 --json out.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Callable, Dict, Any
+
+from artifacts.blob_store import read_blob
+from constant.const_config import LOG_FOLDER
+from llm_service.dom_pipeline import preprocess_dom_for_llm
+from llm_service.grounder import sanitize_html_for_llm, _summarize_dom_for_llm
+
+
+def _legacy(html: str) -> str:
+    return _summarize_dom_for_llm(sanitize_html_for_llm(html, max_attr_len=1024), max_chars=5_000_000)
+
+
+def _single_pass(html: str) -> str:
+    return preprocess_dom_for_llm(html, max_attr_len=1024, max_chars=5_000_000)
+
+
+def _measure(fn: Callable[[str], str], pages: List[str], repeat: int) -> Dict[str, Any]:
+    total_bytes = sum(len(p.encode("utf-8")) for p in pages) * repeat
+    out_chars = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            out_chars += len(fn(page))
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 4),
+        "mbPerSec": round(total_bytes / (1024 * 1024) / elapsed, 3) if elapsed else None,
+        "outputChars": out_chars // repeat,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="*", help="HTML files (default: captured DOMs under Logs/run_*)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", dest="json_out", default=None, help="write results to this JSON file")
+    args = ap.parse_args(argv)
+
+    paths = args.pages or sorted(glob.glob(os.path.join(LOG_FOLDER, "run_*", "dom", "*.html")) +
+                                 glob.glob(os.path.join(LOG_FOLDER, "run_*", "blobs", "*", "*.html*")))
+    if not paths:
+        print("No captured pages found - run app.py once or pass HTML files explicitly.")
+        return 2
+    pages = [read_blob(p).decode("utf-8", errors="ignore") for p in paths]
+    size_mb = sum(len(p.encode("utf-8")) for p in pages) / (1024 * 1024)
+
+    results = {
+        "pages": len(pages),
+        "inputMB": round(size_mb, 3),
+        "repeat": args.repeat,
+        "legacyBeautifulSoup": _measure(_legacy, pages, args.repeat),
+        "singlePassLxml": _measure(_single_pass, pages, args.repeat),
+    }
+    legacy, fast = results["legacyBeautifulSoup"]["seconds"], results["singlePassLxml"]["seconds"]
+    results["speedup"] = round(legacy / fast, 2) if fast else None
+
+    print(json.dumps(results, indent=2))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - Offline End-To-End Pipeline
+                                                        (local fixture sites + scripted LLM through app.run_story)
+
+Runs app.run_story for each scenario against the fixture sites (benchmarks/fixture_server.py) with
+ScriptedLLMClient answering intent extraction and grounding, so the numbers cover the pipeline itself:
+browser, settle, locator resolution, captures, DOM / image preparation and output writing.
+Each run executes in a fresh process so peak RSS is per scenario.
+
+Reported per scenario (median over --repeat runs, every run kept under "runs"):
+    wallMs, stepsPerMin, passed / failed, phasesMs (from the run's timing spans),
+    llm (ledger roll-up), peakRssMb (process tree: python + driver + browser), artifactBytes
+
+Usage (from project root):
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --scenario search --scenario large --repeat 3 --large-rows 20000
+    python -m benchmarks.bench_e2e --set grounding.domPayload=both --llm-latency-ms 800
+    python -m benchmarks.bench_e2e --compare benchmarks/results/e2e_<ts>_<commit>.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+from zoneinfo import ZoneInfo
+
+from constant.const_config import BENCHMARK_RESULTS_FOLDER, LOG_FOLDER, PARENT_DIR
+from pw_lib_ext.config import AppConfig, load_config_file, set_config_value
+
+# phase name in the report -> timing span recorded by the pipeline (telemetry/spans.py)
+PHASE_SPANS = {
+    "browserStart": "browser.start",
+    "goto": "goto",
+    "settle": "settle",
+    "locatorResolve": "locator.resolve",
+    "action": "action",
+    "heal": "heal",
+    "capture": "capture",
+    "captureDom": "capture.dom",  # includes the element digest (same evaluate)
+    "captureScreenshot": "capture.screenshot",
+    "domRead": "dom.read",
+    "domSanitize": "dom.sanitize",
+    "imageEncode": "image.encode",
+    "llmRequest": "llm.request",
+    "ground": "ground",
+}
+
+MEDIAN_FIELDS = ("wallMs", "stepsPerMin", "peakRssMb", "pythonPeakRssMb", "artifactBytes")
+
+
+# ---------- scenarios ----------
+def _step(intent: str, action: str, strategy: str, value: Optional[str] = None, role: Optional[str] = None,
+          name: Optional[str] = None, input: Optional[str] = None, expected_text: Optional[str] = None,
+          pattern: Optional[str] = None) -> Dict[str, Any]:
+    """A grounded step as the LLM returns it (see build_grounder_system_prompt)."""
+    return {
+        "intent": intent,
+        "action": action,
+        "input": input,
+        "locator": {"strategy": strategy, "role": role, "name": name, "value": value, "frame": None, "index": 0},
+        "altLocators": [],
+        "wait": {"type": "domReady", "timeoutMs": 10000},
+        "reason": "scripted",
+        "confidence": 0.95,
+        "expectedText": expected_text,
+        "pattern": pattern,
+        "domReference": 0,
+        "screenReference": 0,
+    }
+
+
+def _search(base: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [
+        _step(f"Open the Fixture Store at {base}/search/", "navigate", "css", "body", input=f"{base}/search/"),
+        _step("Type laptop into the header search box", "fill", "placeholder", "Search products", input="laptop"),
+        _step("Click the Search button", "click", "dataTestId", "search-submit"),
+        _step("Verify the results heading mentions laptop", "assert_match", "id", "results-heading",
+              pattern="/Results for laptop/i"),
+        _step("Open the Laptop stand result", "click", "role", role="link", name="Laptop stand"),
+        _step("Verify the product page shows Laptop stand", "assert_text", "id", "product-name",
+              expected_text="Laptop stand"),
+    ]
+
+
+def _autosuggest(base: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [
+        _step(f"Open the quick find page at {base}/autosuggest/", "navigate", "css", "body",
+              input=f"{base}/autosuggest/"),
+        _step("Type lap into the Find a product field", "fill", "role", role="combobox", name="Find a product",
+              input="lap"),
+        _step("Choose Laptop sleeve from the suggestions", "click", "role", role="option", name="Laptop sleeve"),
+        _step("Add the product to the cart", "click", "dataTestId", "add-to-cart"),
+        _step("Verify the cart confirmation", "assert_text", "id", "cart-status",
+              expected_text="Laptop sleeve added to cart"),
+    ]
+
+
+def _popups(base: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [
+        _step(f"Open Fixture Cloud at {base}/popups/", "navigate", "css", "body", input=f"{base}/popups/"),
+        _step("Accept all cookies", "click", "role", role="button", name="Accept all cookies"),
+        _step("Close the newsletter popup", "click", "aria", name="Close newsletter"),
+        _step("Open the Pricing page", "click", "role", role="link", name="Pricing"),
+        _step("Verify the Team plan is listed", "assert_visible", "role", role="cell", name="Team"),
+    ]
+
+
+def _large(base: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    rows = args.large_rows
+    row = max(1, rows * 4 // 5)
+    url = f"{base}/large/?rows={rows}"
+    return [
+        _step(f"Open the orders admin at {url}", "navigate", "css", "body", input=url),
+        _step(f"Scroll to order {row:05d}", "scroll", "css", f"#row-{row}"),
+        _step(f"Open the details of order {row:05d}", "click", "role", role="button", name=f"Details {row}"),
+        _step(f"Verify the detail panel shows order {row:05d}", "assert_text", "id", "detail-title",
+              expected_text=f"Order {row:05d}"),
+    ]
+
+
+SCENARIOS: Dict[str, Callable[[str, argparse.Namespace], List[Dict[str, Any]]]] = {
+    "search": _search,
+    "autosuggest": _autosuggest,
+    "popups": _popups,
+    "large": _large,
+}
+
+
+# ---------- measurement ----------
+def _proc_tree_rss(root_pid: int) -> Optional[int]:
+    """Resident bytes of root_pid and all its descendants (Linux /proc); None elsewhere."""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children: Dict[int, List[int]] = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    page = os.sysconf("SC_PAGE_SIZE")
+    total, todo = 0, [root_pid]
+    while todo:
+        pid = todo.pop()
+        try:
+            total += int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+        todo.extend(children.get(pid, []))
+    return total
+
+
+class _RssSampler:
+    """Peak RSS of this process tree, sampled on a daemon thread every 'interval' seconds."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            rss = _proc_tree_rss(os.getpid())
+            if rss is None:
+                return
+            self.peak = max(self.peak, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "_RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+
+def _artifact_bytes(run_dir: Path) -> Dict[str, int]:
+    """Bytes on disk per top-level entry of the run directory (dirs summed recursively)."""
+    out: Dict[str, int] = {}
+    for entry in sorted(run_dir.iterdir()):
+        if entry.is_dir():
+            out[entry.name] = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+        else:
+            out[entry.name] = entry.stat().st_size
+    return out
+
+
+def _run_scenario(name: str, steps: List[Dict[str, Any]], cfg: AppConfig, run_dir: str,
+                  llm_latency_ms: int) -> Dict[str, Any]:
+    """One scenario in this (fresh) process: run_story with the scripted LLM, then collect the metrics."""
+    from app import run_story, setup_logging
+    from benchmarks.scripted_llm import ScriptedLLMClient
+
+    run_path = Path(run_dir)
+    run_path.mkdir(parents=True, exist_ok=True)
+    setup_logging(log_file=str(run_path.parent / f"{run_path.name}.log"))
+    story = ". ".join(s["intent"] for s in steps)
+    llm_client = ScriptedLLMClient(steps, latency_ms=llm_latency_ms)
+
+    started = time.perf_counter()
+    with _RssSampler() as sampler:
+        result = run_story(cfg, story, run_path, llm_client, schema_output=False)
+    wall_ms = int((time.perf_counter() - started) * 1000)
+
+    run_log = json.loads((run_path / "run_log.json").read_text(encoding="utf-8")) \
+        if (run_path / "run_log.json").exists() else {}
+    spans = (run_log.get("trace") or {}).get("spans", {})
+    by_file = _artifact_bytes(run_path)
+    python_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {
+        "scenario": name,
+        "status": result["status"],
+        "steps": result["steps"],
+        "passed": result["passed"],
+        "failed": result["failed"],
+        "wallMs": wall_ms,
+        "stepsPerMin": round(result["steps"] * 60_000 / wall_ms, 2) if wall_ms else 0.0,
+        "phasesMs": {phase: spans[span]["totalMs"] for phase, span in PHASE_SPANS.items() if span in spans},
+        "llm": {k: v for k, v in (run_log.get("llm") or {}).items() if k != "file"},
+        "peakRssMb": round(sampler.peak / 2 ** 20, 1) if sampler.peak else None,
+        "pythonPeakRssMb": round(python_peak / 2 ** 20, 1),
+        "artifactBytes": sum(by_file.values()),
+        "artifactBytesByEntry": by_file,
+        "runDir": str(run_path),
+    }
+
+
+# ---------- reporting ----------
+def _git_commit() -> Dict[str, Any]:
+    def git(*cmd: str) -> str:
+        return subprocess.run(["git", *cmd], cwd=str(PARENT_DIR), capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD") or None, "dirty": bool(git("status", "--porcelain"))}
+
+
+def _median(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [r for r in runs if "error" not in r]
+    out: Dict[str, Any] = {"runs": len(runs), "errors": len(runs) - len(ok)}
+    for field in MEDIAN_FIELDS:
+        values = [r[field] for r in ok if r.get(field) is not None]
+        out[field] = round(statistics.median(values), 2) if values else None
+    phases = sorted({p for r in ok for p in r["phasesMs"]})
+    out["phasesMs"] = {p: round(statistics.median([r["phasesMs"].get(p, 0) for r in ok]), 1) for p in phases}
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Lines 'scenario field: base -> current (+x%)' for the median fields present in both results."""
+    lines = [f'baseline {baseline.get("git", {}).get("commit")} -> current {current.get("git", {}).get("commit")}']
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for field in MEDIAN_FIELDS:
+            a, b = base["median"].get(field), cur["median"].get(field)
+            if a is None or b is None:
+                continue
+            delta = f"{(b - a) * 100 / a:+.1f}%" if a else "n/a"
+            lines.append(f"{name:12s} {field:16s} {a:>12} -> {b:>12} ({delta})")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="default: all (repeatable)")
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--large-rows", type=int, default=5000, help="table rows of the large-DOM page")
+    ap.add_argument("--llm-latency-ms", type=int, default=0, help="scripted LLM delay per call")
+    ap.add_argument("--engine", choices=["chromium", "firefox", "webkit"], default=None)
+    ap.add_argument("--config", help="JSON or TOML file shaped like AppConfig, applied over the bench defaults")
+    ap.add_argument("--set", action="append", metavar="KEY=VALUE", help="override one setting (repeatable)")
+    ap.add_argument("--json", dest="json_out", default=None,
+                    help="results file (default: benchmarks/results/e2e_<ts>_<commit>.json)")
+    ap.add_argument("--compare", default=None, help="earlier results JSON to diff the medians against")
+    args = ap.parse_args(argv)
+
+    from app import build_config
+    from benchmarks.fixture_server import FixtureServer
+
+    cfg = build_config()
+    # offline and comparable: headless, no slow motion / video, every intent grounded by the scripted LLM
+    cfg.browser.headless = True
+    cfg.browser.slowMoMs = 0
+    cfg.browser.recordVideo = False
+    cfg.browserServer.enabled = False
+    cfg.grounding.cache.enabled = False
+    cfg.llm.cassette.mode = "off"
+    cfg.logging.verbosity = "normal"
+    if args.engine:
+        cfg.browser.engine = args.engine
+    if args.config:
+        load_config_file(cfg, args.config)
+    for assignment in args.set or []:
+        set_config_value(cfg, assignment)
+    # the report is built from the trace summary and the LLM roll-up in run_log.json
+    cfg.logging.trace = True
+    cfg.logging.saveRunLog = True
+
+    time_stamp = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y%m%d_%H%M%S")
+    bench_dir = Path(LOG_FOLDER) / f"bench_e2e_{time_stamp}"
+    git = _git_commit()
+    results: Dict[str, Any] = {
+        "benchmark": "e2e",
+        "startedAt": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds"),
+        "git": git,
+        "python": sys.version.split()[0],
+        "options": {"repeat": args.repeat, "largeRows": args.large_rows, "llmLatencyMs": args.llm_latency_ms,
+                    "engine": cfg.browser.engine, "set": args.set or [], "config": args.config},
+        "scenarios": {},
+    }
+    try:
+        from importlib.metadata import version
+        results["playwright"] = version("playwright")
+    except Exception:
+        results["playwright"] = None
+
+    names = args.scenario or list(SCENARIOS)
+    with FixtureServer() as server, \
+            ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                max_tasks_per_child=1) as pool:
+        for name in names:
+            steps = SCENARIOS[name](server.base_url, args)
+            runs: List[Dict[str, Any]] = []
+            for i in range(1, args.repeat + 1):
+                # each scenario's locator statistics start empty, so repeats measure the same work
+                run_cfg = cfg
+                if cfg.grounding.locatorStats.enabled:
+                    run_cfg = deepcopy(cfg)
+                    run_cfg.grounding.locatorStats.path = str(bench_dir / f"{name}_{i}.locator_stats.sqlite")
+                run_dir = bench_dir / f"{name}_{i}"
+                try:
+                    run = pool.submit(_run_scenario, name, steps, run_cfg, str(run_dir), args.llm_latency_ms).result()
+                except Exception as e:  # e.g. browser not installed; Playwright appends a banner after line one
+                    first_line = (str(e).splitlines() or [""])[0]
+                    run = {"scenario": name, "error": f"{type(e).__name__}: {first_line}", "runDir": str(run_dir)}
+                runs.append(run)
+                outcome = run["error"] if "error" in run else \
+                    f'{run["status"]} - {run["steps"]} steps in {run["wallMs"]} ms'
+                print(f'[{name} {i}/{args.repeat}] {outcome}')
+            results["scenarios"][name] = {"median": _median(runs), "runs": runs}
+
+    out = Path(args.json_out) if args.json_out else \
+        Path(BENCHMARK_RESULTS_FOLDER) / f'e2e_{time_stamp}_{git["commit"] or "nogit"}.json'
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps({name: s["median"] for name, s in results["scenarios"].items()}, indent=2))
+    print(f"Results - {out}")
+    if args.compare:
+        print("\n".join(compare(results, json.loads(Path(args.compare).read_text(encoding="utf-8")))))
+    return 0 if all(s["median"]["errors"] == 0 for s in results["scenarios"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - Local Fixture Sites Server
+                                                        (static pages + small JSON APIs + generated large-DOM page)
+
+Serves benchmarks/fixture_sites on 127.0.0.1 from a background thread:
+    /search/       header search form, client-rendered results (/api/search)
+    /autosuggest/  combobox with a debounced listbox of suggestions (/api/suggest)
+    /popups/       cookie banner followed by a delayed modal dialog
+    /large/?rows=N generated table of N rows, each with its own button (large DOM)
+
+Usage (from project root, to browse the fixtures):
+    python -m benchmarks.fixture_server [--port 8765]
+"""
+import argparse
+import html
+import json
+import logging
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_SITES_DIR = Path(__file__).parent / "fixture_sites"
+
+PRODUCTS = [
+    "Laptop", "Laptop stand", "Laptop sleeve", "Laptop charger", "Lamp", "Monitor", "Monitor arm",
+    "Mechanical keyboard", "Mouse", "Mouse pad", "USB-C hub", "Webcam", "Headphones", "Desk mat",
+]
+
+DEFAULT_LARGE_ROWS = 5000
+
+
+def large_dom_page(rows: int) -> str:
+    """Table with 'rows' rows, a button per row and a detail panel filled by the clicked button."""
+    body: List[str] = []
+    for i in range(1, rows + 1):
+        body.append(f'<tr id="row-{i}"><td>{i}</td><td>Order {i:05d}</td><td>{(i * 37) % 1000}.00</td>'
+                    f'<td><span class="status">{("Open", "Shipped", "Closed")[i % 3]}</span></td>'
+                    f'<td><button type="button" class="details" data-row="{i}" '
+                    f'aria-label="Details {i}">Details</button></td></tr>')
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Fixture Admin - Orders ({rows})</title>
+  <link rel="stylesheet" href="/shared.css">
+</head>
+<body>
+<header class="site-header"><a class="logo" href="/large/">Fixture Admin</a></header>
+<main>
+  <h1>Orders</h1>
+  <section id="detail" aria-live="polite" hidden><h2 id="detail-title"></h2></section>
+  <table class="grid" aria-label="Orders">
+    <thead><tr><th>#</th><th>Order</th><th>Amount</th><th>Status</th><th></th></tr></thead>
+    <tbody>{"".join(body)}</tbody>
+  </table>
+</main>
+<script>
+  document.querySelector("table.grid").addEventListener("click", e => {{
+    const button = e.target.closest("button.details");
+    if (!button) return;
+    document.getElementById("detail-title").textContent = "Order " + String(button.dataset.row).padStart(5, "0");
+    document.getElementById("detail").hidden = false;
+  }});
+</script>
+</body>
+</html>"""
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    api_delay_ms = 80  # simulated backend latency of the JSON APIs
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("fixture %s - " + format, self.address_string(), *args)
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj: Dict[str, Any]) -> None:
+        time.sleep(self.api_delay_ms / 1000.0)
+        self._send(json.dumps(obj).encode("utf-8"), "application/json")
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        q = (query.get("q") or [""])[0].strip().lower()
+        if parts.path == "/api/search":
+            self._send_json({"items": [p for p in PRODUCTS if q and q in p.lower()]})
+        elif parts.path == "/api/suggest":
+            self._send_json({"items": [p for p in PRODUCTS if q and p.lower().startswith(q)][:8]})
+        elif parts.path in ("/large", "/large/"):
+            try:
+                rows = int((query.get("rows") or [DEFAULT_LARGE_ROWS])[0])
+            except ValueError:
+                rows = DEFAULT_LARGE_ROWS
+            self._send(large_dom_page(max(1, min(rows, 100_000))).encode("utf-8"), "text/html; charset=utf-8")
+        elif parts.path == "/":
+            links = "".join(f'<li><a href="/{html.escape(s)}/">{html.escape(s)}</a></li>'
+                            for s in ("search", "autosuggest", "popups", "large"))
+            self._send(f"<!doctype html><title>Fixture sites</title><ul>{links}</ul>".encode("utf-8"),
+                       "text/html; charset=utf-8")
+        else:
+            super().do_GET()
+
+
+class FixtureServer:
+    """The fixture sites on a free local port (or 'port'); use as a context manager or start() / stop()."""
+
+    def __init__(self, port: int = 0, root: Path = FIXTURE_SITES_DIR):
+        self.root = root
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), partial(_FixtureHandler, directory=str(root)))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Fixture sites served at {self.base_url} from {self.root}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    server = FixtureServer(args.port)
+    print(f"Serving fixture sites at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
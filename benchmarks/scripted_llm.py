@@ -0,0 +1,76 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Benchmark - Scripted Stand-In LLM Client
+                                                        (canned intents + grounded steps, no network)
+"""
+import copy
+import json
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from llm_service.abstract_llm_client import AbstractLLMClient
+from llm_service.tokens import estimate_message_tokens, estimate_text_tokens
+
+INTENT_MARKER = "INTENT: "
+
+
+def _grounding_intent(message: List[Dict]) -> Optional[str]:
+    """Intent text of a grounding request (LLMAgent.get_playwright_json sends 'INTENT: ...'), else None."""
+    for m in message:
+        content = m.get("content")
+        if not isinstance(content, list):
+            continue
+        for part in content:
+            text = part.get("text", "") if isinstance(part, dict) else ""
+            if text.startswith(INTENT_MARKER):
+                return text[len(INTENT_MARKER):].strip()
+    return None
+
+
+class ScriptedLLMClient(AbstractLLMClient):
+    """
+    Answers the app's three kinds of LLM calls from a script instead of a model:
+      - intent extraction (a 'user' message without a grounding envelope): the scripted intents, in order
+      - grounding ('INTENT: ...' in the user content): the step scripted for that intent
+      - schema transform (system messages only): 'schema_response'
+    Token usage is estimated from the request / response text so the LLM ledger has realistic counts.
+    latency_ms: sleep per call to stand in for model latency (0: measure the pipeline alone).
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]], latency_ms: int = 0,
+                 schema_response: Optional[Dict[str, Any]] = None, model: str = "scripted"):
+        self.steps_by_intent = {s["intent"]: s for s in steps}
+        self.intents = [s["intent"] for s in steps]
+        self.latency_ms = latency_ms
+        self.schema_response = schema_response or {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"intents": 0, "grounding": 0, "schema": 0}
+        super().__init__({"model": model, "client": None})
+
+    def execute_chat_completion_api(self, message: List[Dict], response_format=None,
+                                    temperature=0, max_tokens=16000, call_info: Optional[Dict[str, Any]] = None
+                                    ) -> Any:
+        started = time.perf_counter()
+        intent = _grounding_intent(message)
+        if intent is not None:
+            call_type = "grounding"
+            if intent not in self.steps_by_intent:
+                raise KeyError(f"No scripted step for intent: {intent!r}")
+            response: Any = copy.deepcopy(self.steps_by_intent[intent])
+        elif any(m.get("role") == "user" for m in message):
+            call_type = "intents"
+            response = {"intents": [{"step": i, "intent": text} for i, text in enumerate(self.intents, start=1)]}
+        else:
+            call_type = "schema"
+            response = copy.deepcopy(self.schema_response)
+        with self._lock:
+            self.stats[call_type] += 1
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+        if call_info is not None:
+            call_info.update(attempts=1, attemptMs=[int((time.perf_counter() - started) * 1000)], errors=[],
+                             usage={"promptTokens": estimate_message_tokens(message),
+                                    "completionTokens": estimate_text_tokens(json.dumps(response)),
+                                    "cachedTokens": 0})
+        return response
@@ -0,0 +1,133 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Command Line Entry Point
+                                                        (run / replay / batch / extract-intents, heavy imports per command)
+
+Usage (from project root):
+    python cli.py run --story "Open https://example.com and click More information"
+    python cli.py run --story-file story.txt --config run.toml --set browser.headless=true
+    python cli.py replay Logs/run_<ts>/playwright.jsonl [--har Logs/run_<ts>/network.har.zip] [--no-llm]
+    python cli.py batch stories.jsonl --workers 4
+    python cli.py extract-intents --story "..." [--out intents.json]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def _build_cfg(args: argparse.Namespace):
+    # app / config are cheap to import: Playwright, OpenAI and lxml load inside the commands
+    from app import build_config
+    from pw_lib_ext.config import load_config_file, set_config_value
+
+    cfg = build_config()
+    try:
+        if args.config:
+            load_config_file(cfg, args.config)
+        for assignment in args.set or []:
+            set_config_value(cfg, assignment)
+    except (OSError, ValueError) as e:  # missing file, bad JSON / TOML, unknown key
+        raise SystemExit(f"error: configuration - {e}")
+    if args.headless is not None:
+        cfg.browser.headless = args.headless
+    if args.engine:
+        cfg.browser.engine = args.engine
+    if args.api_base:
+        cfg.llm.apiBase = args.api_base
+    if args.api_version:
+        cfg.llm.apiVersion = args.api_version
+    if args.model:
+        cfg.llm.model = args.model
+    return cfg
+
+
+def _story(args: argparse.Namespace) -> str:
+    if args.story_file:
+        return Path(args.story_file).read_text(encoding="utf-8").strip()
+    if args.story:
+        return args.story
+    raise SystemExit("A user story is required: --story TEXT or --story-file PATH")
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    from app import main as run_main
+    result = run_main(_story(args), _build_cfg(args))
+    return 0 if result.get("status") == "passed" else 1
+
+
+def _cmd_replay(args: argparse.Namespace) -> int:
+    from app import replay_main
+    result = replay_main(args.plan, llm_fallback=not args.no_llm, har_path=args.har, cfg=_build_cfg(args))
+    return 0 if result["failed"] == 0 else 1
+
+
+def _cmd_batch(args: argparse.Namespace) -> int:
+    from batch_runner import batch_main
+    cfg = _build_cfg(args)
+    if args.workers:
+        cfg.batch.workers = args.workers
+    if args.headless is not None:
+        # batch_main applies cfg.batch.headless to the browser of every worker
+        cfg.batch.headless = args.headless
+    summary = batch_main(args.stories, cfg)
+    return 0 if summary["passed"] == summary["stories"] else 1
+
+
+def _cmd_extract_intents(args: argparse.Namespace) -> int:
+    from app import extract_intents_main
+    from dataclass.conceptual_objects import intents_to_json_str
+    out = intents_to_json_str(extract_intents_main(_story(args), _build_cfg(args)))
+    if args.out:
+        Path(args.out).write_text(out, encoding="utf-8")
+    else:
+        print(out)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", help="JSON or TOML file shaped like AppConfig, applied over the defaults")
+    common.add_argument("--set", action="append", metavar="KEY=VALUE",
+                        help="override one setting, e.g. grounding.cache.enabled=false (repeatable)")
+    common.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None)
+    common.add_argument("--engine", choices=["chromium", "firefox", "webkit"])
+    common.add_argument("--api-base", help="LLM endpoint (default: app.API_BASE)")
+    common.add_argument("--api-version")
+    common.add_argument("--model")
+
+    story = argparse.ArgumentParser(add_help=False)
+    story.add_argument("--story", help="user story text")
+    story.add_argument("--story-file", help="file with the user story")
+
+    ap = argparse.ArgumentParser(prog="prompt-web-test", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", parents=[common, story], help="ground and execute one user story")
+    p.set_defaults(func=_cmd_run)
+
+    p = sub.add_parser("replay", parents=[common], help="re-run a recorded playwright.jsonl / plan.json")
+    p.add_argument("plan")
+    p.add_argument("--har", help="serve the site from this HAR (offline)")
+    p.add_argument("--no-llm", action="store_true", help="never re-ground failing steps")
+    p.set_defaults(func=_cmd_replay)
+
+    p = sub.add_parser("batch", parents=[common], help="run a JSONL / CSV of stories on worker processes")
+    p.add_argument("stories")
+    p.add_argument("--workers", type=int, default=0, help="worker processes (default: cfg.batch.workers)")
+    p.set_defaults(func=_cmd_batch)
+
+    p = sub.add_parser("extract-intents", parents=[common, story], help="user story -> intents JSON (no browser)")
+    p.add_argument("--out", help="write the intents here instead of stdout")
+    p.set_defaults(func=_cmd_extract_intents)
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,3 +14,10 @@ LOG_FOLDER = os.path.join(PARENT_DIR, 'Logs')
 LOG_FILE = os.path.join(LOG_FOLDER, 'app.log')
 SCHEMA_FOLDER = os.path.join(PARENT_DIR, 'artifacts')
 SCHEMA_FILE = os.path.join(SCHEMA_FOLDER, 'output_schema_1.json')
+CACHE_FOLDER = os.path.join(PARENT_DIR, 'Cache')
+GROUNDING_CACHE_FILE = os.path.join(CACHE_FOLDER, 'grounding_cache.sqlite')
+CASSETTE_FILE = os.path.join(CACHE_FOLDER, 'cassettes', 'llm_cassette.jsonl')
+SHARED_BLOB_FOLDER = os.path.join(CACHE_FOLDER, 'blobs')
+LOCATOR_STATS_FILE = os.path.join(CACHE_FOLDER, 'locator_stats.sqlite')
+BROWSER_SERVER_STATE_FILE = os.path.join(CACHE_FOLDER, 'browser_server.json')
+BENCHMARK_RESULTS_FOLDER = os.path.join(PARENT_DIR, 'benchmarks', 'results')
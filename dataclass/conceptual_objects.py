@@ -50,6 +50,7 @@ class Step:
     pattern: Optional[str] = None
     domReference: int = 0
     screenReference: int = 0
+    healedFrom: Optional[Locator] = None  # locator that failed at execution when an alternate won
 
     def to_dict(self) -> Dict[str, Any]:
         d = asdict(self)
@@ -68,10 +69,38 @@ class ArtifactsMapEntry:
     domHash: Optional[str] = None
 
 
+ArtifactKind = Literal["screenshots", "dom", "digest"]
+ARTIFACT_KINDS = ("screenshots", "dom", "digest")
+
+
 @dataclass
 class ArtifactsMap:
     screenshots: List[ArtifactsMapEntry] = field(default_factory=list)
     dom: List[ArtifactsMapEntry] = field(default_factory=list)
+    digest: List[ArtifactsMapEntry] = field(default_factory=list)  # actionable-element digest, id == dom id
+
+    def __post_init__(self):
+        # id and domHash indexes per kind, kept in step with the lists by add()
+        self._by_id: Dict[str, Dict[int, ArtifactsMapEntry]] = {k: {} for k in ARTIFACT_KINDS}
+        self._by_hash: Dict[str, Dict[str, List[ArtifactsMapEntry]]] = {k: {} for k in ARTIFACT_KINDS}
+        for kind in ARTIFACT_KINDS:
+            for entry in getattr(self, kind):
+                self._index(kind, entry)
+
+    def _index(self, kind: str, entry: ArtifactsMapEntry) -> None:
+        self._by_id[kind][entry.id] = entry
+        if entry.domHash:
+            self._by_hash[kind].setdefault(entry.domHash, []).append(entry)
+
+    def add(self, kind: ArtifactKind, entry: ArtifactsMapEntry) -> None:
+        getattr(self, kind).append(entry)
+        self._index(kind, entry)
+
+    def get(self, kind: ArtifactKind, entry_id: int) -> Optional[ArtifactsMapEntry]:
+        return self._by_id[kind].get(entry_id)
+
+    def find_by_hash(self, kind: ArtifactKind, dom_hash: str) -> List[ArtifactsMapEntry]:
+        return self._by_hash[kind].get(dom_hash, [])
 
 
 @dataclass
@@ -135,7 +164,8 @@ def json_obj_to_step(obj: Dict[str, Any]) -> Step:
         expectedText=obj.get("expectedText"),
         pattern=obj.get("pattern"),
         domReference=int(obj["domReference"]),
-        screenReference=int(obj["screenReference"])
+        screenReference=int(obj["screenReference"]),
+        healedFrom=Locator(**obj["healedFrom"]) if obj.get("healedFrom") else None
     )
 
 
@@ -155,8 +185,26 @@ def artifacts_to_json_dict(art: ArtifactsMap) -> Dict[str, Any]:
     return {
         "screenshots": [asdict(e) for e in art.screenshots],
         "dom": [asdict(e) for e in art.dom],
+        "digest": [asdict(e) for e in art.digest],
     }
 
 
 def artifacts_to_json_str(art: ArtifactsMap, indent: int = 2) -> str:
     return json.dumps(artifacts_to_json_dict(art), ensure_ascii=False, indent=indent)
+
+
+def artifact_entry_to_jsonl(kind: str, entry: ArtifactsMapEntry) -> str:
+    return json.dumps({"kind": kind, **asdict(entry)}, ensure_ascii=False) + "\n"
+
+
+def artifacts_from_jsonl(path: str) -> ArtifactsMap:
+    """Rebuild an ArtifactsMap from the artifacts.jsonl appended during a run."""
+    art = ArtifactsMap()
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            raw = json.loads(line)
+            kind = raw.pop("kind")
+            art.add(kind, ArtifactsMapEntry(**raw))
+    return art
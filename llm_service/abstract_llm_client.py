@@ -7,13 +7,25 @@ import logging
 import time
 from abc import ABC
 from multiprocessing.context import AuthenticationError
-from typing import List, Dict
+from typing import List, Dict, Optional, Any
 
 from openai import OpenAI, BadRequestError, PermissionDeniedError
 
 logger = logging.getLogger(__name__)
 
 
+def usage_to_dict(usage: Any) -> Dict[str, int]:
+    """Token counts of a chat completion 'usage' object (zeros when the endpoint sends none)."""
+    if usage is None:
+        return {"promptTokens": 0, "completionTokens": 0, "cachedTokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "promptTokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completionTokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cachedTokens": (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0,
+    }
+
+
 class AbstractLLMClient(ABC):
     def __init__(self, init_client_config: dict):
         self.history: List[Dict] = []
@@ -27,16 +39,25 @@ class AbstractLLMClient(ABC):
             f'base_url: {self.base_url}, api_version: {self.api_version}, model: {self.model}, client: {client_msg}')
 
     def execute_chat_completion_api(self, message: List[Dict], response_format=None,
-                                    temperature=0, max_tokens=16000
+                                    temperature=0, max_tokens=16000, call_info: Optional[Dict[str, Any]] = None
                                     ) -> str:
+        """
+        call_info: optional dict filled with 'usage' (token counts), 'attempts', 'attemptMs'
+        and 'errors' (exception names of failed attempts) for the LLM ledger.
+        """
         if response_format is None:
             response_format = dict(
                 type="json_object")
+        if call_info is None:
+            call_info = {}
+        call_info.update(attempts=0, attemptMs=[], errors=[])
         success: bool = False
         MAX_ATTEMPT_COUNTER = 10
         attempt_counter = 1
         while not success and attempt_counter <= MAX_ATTEMPT_COUNTER:
             print(f'Fetching LLM Chat Completion API Response (Attempt Counter) - {attempt_counter}')
+            call_info["attempts"] = attempt_counter
+            attempt_started = time.perf_counter()
             try:
 
                 response = self.client.chat.completions.create(model=self.model,
@@ -44,6 +65,8 @@ class AbstractLLMClient(ABC):
                                                                response_format=response_format,
                                                                temperature=temperature,
                                                                max_tokens=max_tokens)
+                call_info["attemptMs"].append(int((time.perf_counter() - attempt_started) * 1000))
+                call_info["usage"] = usage_to_dict(getattr(response, "usage", None))
 
                 logger.info(f'chat completion response after Attempt - {attempt_counter}- \n '
                             f'message - {message} \n'
@@ -70,6 +93,9 @@ class AbstractLLMClient(ABC):
                 raise e
 
             except Exception as e:
+                if len(call_info["attemptMs"]) < attempt_counter:  # not already timed (bad JSON in a reply)
+                    call_info["attemptMs"].append(int((time.perf_counter() - attempt_started) * 1000))
+                call_info["errors"].append(type(e).__name__)
                 msg = f'\n✗ Error occurred: {type(e).__name__}'
                 logger.info(msg)
                 print(msg)
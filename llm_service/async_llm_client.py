@@ -0,0 +1,242 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Async LLM Clients (AsyncAzureOpenAI / AsyncOpenAI)
+                                                        With Shared Keep-Alive Connection Pool And Bounded Concurrency
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from abc import ABC
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Coroutine, Any, Tuple
+
+import httpx
+from openai import AsyncOpenAI, AsyncAzureOpenAI, DefaultAsyncHttpxClient, AuthenticationError, BadRequestError, \
+    PermissionDeniedError
+
+from llm_service.abstract_llm_client import AbstractLLMClient, usage_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class AbstractAsyncLLMClient(ABC):
+    """asyncio counterpart of AbstractLLMClient; at most 'max_concurrency' requests in flight."""
+
+    def __init__(self, init_client_config: dict):
+        self.base_url = init_client_config.get("base_url") if init_client_config.get("base_url") else None
+        self.api_key = init_client_config.get("api_key") if init_client_config.get("api_key") else None
+        self.api_version = init_client_config.get("api_version") if init_client_config.get("api_version") else None
+        self.model = init_client_config.get("model") if init_client_config.get("model") else None
+        self.client: AsyncOpenAI = init_client_config.get("client") if init_client_config.get("client") else None
+        self.max_concurrency = init_client_config.get("max_concurrency") or 4
+        # True when the SDK created its own http client (no pooled one was passed in)
+        self.owns_http_client = bool(init_client_config.get("owns_http_client"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        client_msg = f'Initialized' if self.client is not None else None
+        logger.info(
+            f'base_url: {self.base_url}, api_version: {self.api_version}, model: {self.model}, client: {client_msg}, '
+            f'max_concurrency: {self.max_concurrency}')
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # created lazily so it binds to the loop that actually runs the requests
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def execute_chat_completion_api(self, message: List[Dict], response_format=None,
+                                          temperature=0, max_tokens=16000,
+                                          call_info: Optional[Dict[str, Any]] = None) -> str:
+        """call_info: see AbstractLLMClient.execute_chat_completion_api; 'queueMs' is the wait for a slot."""
+        if response_format is None:
+            response_format = dict(
+                type="json_object")
+        if call_info is None:
+            call_info = {}
+        call_info.update(attempts=0, attemptMs=[], errors=[])
+        MAX_ATTEMPT_COUNTER = 10
+        attempt_counter = 1
+        queued = time.perf_counter()
+        async with self._get_semaphore():
+            call_info["queueMs"] = int((time.perf_counter() - queued) * 1000)
+            while attempt_counter <= MAX_ATTEMPT_COUNTER:
+                print(f'Fetching LLM Chat Completion API Response (Async, Attempt Counter) - {attempt_counter}')
+                call_info["attempts"] = attempt_counter
+                attempt_started = time.perf_counter()
+                try:
+                    response = await self.client.chat.completions.create(model=self.model,
+                                                                         messages=message,
+                                                                         response_format=response_format,
+                                                                         temperature=temperature,
+                                                                         max_tokens=max_tokens)
+                    call_info["attemptMs"].append(int((time.perf_counter() - attempt_started) * 1000))
+                    call_info["usage"] = usage_to_dict(getattr(response, "usage", None))
+                    logger.info(f'chat completion response after Attempt - {attempt_counter}- \n '
+                                f'message - {message} \n'
+                                f'response - {response}')
+                    if response_format.get("type") in "json_object":
+                        return json.loads(response.choices[0].message.content)
+                    return response.choices[0].message.content
+                except (AuthenticationError, BadRequestError, PermissionDeniedError) as e:
+                    msg = f'LLM {type(e).__name__}'
+                    logger.info(msg)
+                    print(msg)
+                    raise e
+                except Exception as e:
+                    if len(call_info["attemptMs"]) < attempt_counter:  # not already timed (bad JSON in a reply)
+                        call_info["attemptMs"].append(int((time.perf_counter() - attempt_started) * 1000))
+                    call_info["errors"].append(type(e).__name__)
+                    msg = f'\n✗ Error occurred: {type(e).__name__}'
+                    logger.info(msg)
+                    print(msg)
+                    attempt_counter += 1
+                    await asyncio.sleep(1)
+        raise ValueError(f'LLM Codel - Chat Completion Not Working')
+
+    async def aclose(self):
+        # a pooled http client belongs to its AsyncLoopThread, only the SDK wrapper is dropped here
+        if self.client is not None and self.owns_http_client:
+            await self.client.close()
+        self.client = None
+
+
+class AsyncAzureLLMClient(AbstractAsyncLLMClient):
+    def __init__(self, base_url: str = None, api_key: str = None, api_version: str = None, model: str = None,
+                 max_concurrency: int = 4, http_client: Optional[httpx.AsyncClient] = None):
+        try:
+            client = AsyncAzureOpenAI(
+                api_version=api_version,
+                azure_endpoint=base_url,
+                api_key=api_key,
+                http_client=http_client,
+            )
+            logger.info("Async Azure OpenAI client initialized successfully")
+        except Exception as e:
+            logger.error(f"Error initializing Async Azure OpenAI client: {e}")
+            raise e
+
+        super().__init__({
+            "base_url": base_url,
+            "api_key": api_key,
+            "api_version": api_version,
+            "model": model,
+            "client": client,
+            "max_concurrency": max_concurrency,
+            "owns_http_client": http_client is None
+        })
+
+
+class AsyncOpenAILLMClient(AbstractAsyncLLMClient):
+    def __init__(self, api_key: str, model: str = 'gpt-4o', max_concurrency: int = 4,
+                 http_client: Optional[httpx.AsyncClient] = None):
+        try:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                http_client=http_client,
+            )
+            logger.info("Async OpenAI client initialized successfully")
+        except Exception as e:
+            logger.error(f"Error initializing Async OpenAI client: {e}")
+            raise e
+
+        super().__init__({
+            "api_key": api_key,
+            "model": model,
+            "client": client,
+            "max_concurrency": max_concurrency,
+            "owns_http_client": http_client is None
+        })
+
+
+class AsyncLoopThread:
+    """
+    Runs an asyncio loop on a daemon thread so the synchronous Playwright code path
+    can hand coroutines off and keep working while LLM calls are in flight.
+    The loop owns its keep-alive pools (http_client()); stop() closes them.
+    """
+
+    def __init__(self, name: str = "llm-async-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._http_clients: Dict[Tuple[int, int, float], httpx.AsyncClient] = {}
+        self._http_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def http_client(self, max_connections: int = 10, max_keepalive: int = 10,
+                    keepalive_expiry: float = 30.0) -> httpx.AsyncClient:
+        """
+        One keep-alive pool per limits tuple on this loop, shared by every async client that
+        runs here, so grounding / intent / schema calls reuse warm TLS connections.
+        """
+        key = (max_connections, max_keepalive, keepalive_expiry)
+        with self._http_lock:
+            client = self._http_clients.get(key)
+            if client is None or client.is_closed:
+                client = DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                                        keepalive_expiry=keepalive_expiry))
+                self._http_clients[key] = client
+            return client
+
+    async def _close_http_clients(self):
+        with self._http_lock:
+            clients, self._http_clients = list(self._http_clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def stop(self):
+        if self.loop.is_running():
+            try:
+                self.submit(self._close_http_clients()).result(timeout=5)
+            except Exception as e:
+                logger.warning(f'Closing the LLM http pool failed: {e}')
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+
+class AsyncBackedLLMClient(AbstractLLMClient):
+    """
+    Synchronous AbstractLLMClient facade over an AbstractAsyncLLMClient, so LLMAgent / Grounder
+    work unchanged. 'submit_chat_completion' returns a Future for callers that want to overlap
+    the request with browser work; 'execute_chat_completion_api' blocks on it.
+    """
+
+    def __init__(self, async_client: AbstractAsyncLLMClient, loop_thread: Optional[AsyncLoopThread] = None,
+                 owns_loop: Optional[bool] = None):
+        """owns_loop: stop 'loop_thread' (and close its http pools) in close(); default: only a loop made here."""
+        self.async_client = async_client
+        self.loop_thread = loop_thread or AsyncLoopThread()
+        self._owns_loop = loop_thread is None if owns_loop is None else owns_loop
+        super().__init__({
+            "base_url": async_client.base_url,
+            "api_key": async_client.api_key,
+            "api_version": async_client.api_version,
+            "model": async_client.model,
+            "client": None
+        })
+
+    def submit_chat_completion(self, message: List[Dict], response_format=None, temperature=0,
+                               max_tokens=16000, call_info: Optional[Dict[str, Any]] = None) -> "Future[Any]":
+        return self.loop_thread.submit(
+            self.async_client.execute_chat_completion_api(message, response_format=response_format,
+                                                          temperature=temperature, max_tokens=max_tokens,
+                                                          call_info=call_info))
+
+    def execute_chat_completion_api(self, message: List[Dict], response_format=None,
+                                    temperature=0, max_tokens=16000, call_info: Optional[Dict[str, Any]] = None
+                                    ) -> str:
+        return self.submit_chat_completion(message, response_format=response_format, temperature=temperature,
+                                           max_tokens=max_tokens, call_info=call_info).result()
+
+    def close(self):
+        self.loop_thread.submit(self.async_client.aclose()).result(timeout=5)
+        if self._owns_loop:
+            self.loop_thread.stop()
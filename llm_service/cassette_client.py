@@ -0,0 +1,149 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Record/Replay (Cassette) LLM Client
+                                                        For Offline, Deterministic Benchmarking
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Literal, Any
+
+from llm_service.abstract_llm_client import AbstractLLMClient
+
+logger = logging.getLogger(__name__)
+
+CassetteMode = Literal["record", "replay"]
+
+
+def request_hash(model: Optional[str], message: List[Dict], response_format: Optional[dict], temperature,
+                 max_tokens) -> str:
+    """Stable hash of a chat completion request (image data URIs included as-is)."""
+    raw = json.dumps({
+        "model": model,
+        "messages": message,
+        "response_format": response_format,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CassetteLLMClient(AbstractLLMClient):
+    """
+    Cassette-style client.
+      - record: forwards each call to the wrapped live client and appends
+                {key, seq, latencyMs, response} as one JSON line to the cassette.
+      - replay: serves responses from the cassette without any network access,
+                optionally sleeping for the recorded (scaled) or a fixed latency.
+    Requests are matched on their hash; pages captured at run time rarely hash identically
+    (timestamps, tokens in DOM), so by default a miss falls back to the recording at the
+    same call position.
+    """
+
+    def __init__(self, cassette_path: str, mode: CassetteMode = "replay", inner: Optional[AbstractLLMClient] = None,
+                 model: Optional[str] = None, simulate_latency: bool = False, latency_scale: float = 1.0,
+                 fixed_latency_ms: Optional[int] = None, sequential_fallback: bool = True):
+        if mode == "record" and inner is None:
+            raise ValueError("Cassette record mode requires a live 'inner' LLM client.")
+        self.cassette_path = Path(cassette_path)
+        self.mode = mode
+        self.inner = inner
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self.fixed_latency_ms = fixed_latency_ms
+        self.sequential_fallback = sequential_fallback
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._ordered: List[Dict[str, Any]] = []
+        self.stats: Dict[str, int] = {"calls": 0, "exactHits": 0, "sequentialHits": 0, "recorded": 0}
+
+        if mode == "record":
+            self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cassette_path.write_text("", encoding="utf-8")
+        else:
+            self._load()
+
+        init_client_config = {
+            "base_url": inner.base_url if inner else None,
+            "api_version": inner.api_version if inner else None,
+            "model": model or (inner.model if inner else None) or self._recorded_model(),
+            "client": None
+        }
+        super().__init__(init_client_config)
+
+    # ---------- cassette I/O ----------
+    def _load(self):
+        if not self.cassette_path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.cassette_path}")
+        records = [json.loads(line) for line in self.cassette_path.read_text(encoding="utf-8").splitlines()
+                   if line.strip()]
+        # concurrent calls (speculative grounding, async client) finish - and are written - out of
+        # call order: replay by the call position recorded in 'seq', not by line
+        records.sort(key=lambda r: r.get("seq", 0))
+        for rec in records:
+            self._by_key.setdefault(rec["key"], []).append(rec)
+            self._ordered.append(rec)
+        logger.info(f'Cassette loaded - {len(self._ordered)} recorded calls from {self.cassette_path}')
+
+    def _recorded_model(self) -> Optional[str]:
+        return self._ordered[0].get("model") if self._ordered else None
+
+    def _append(self, rec: Dict[str, Any]):
+        with self.cassette_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def _sleep_for(self, rec: Dict[str, Any]):
+        if not self.simulate_latency:
+            return
+        ms = self.fixed_latency_ms if self.fixed_latency_ms is not None else rec.get("latencyMs", 0) * self.latency_scale
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+
+    # ---------- AbstractLLMClient ----------
+    def execute_chat_completion_api(self, message: List[Dict], response_format=None,
+                                    temperature=0, max_tokens=16000, call_info: Optional[Dict[str, Any]] = None
+                                    ) -> str:
+        if call_info is None:
+            call_info = {}
+        if response_format is None:
+            response_format = dict(type="json_object")
+        key = request_hash(self.model, message, response_format, temperature, max_tokens)
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            self.stats["calls"] += 1
+
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = self.inner.execute_chat_completion_api(message, response_format=response_format,
+                                                              temperature=temperature, max_tokens=max_tokens,
+                                                              call_info=call_info)
+            latency_ms = int((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self._append({"key": key, "seq": seq, "model": self.model, "latencyMs": latency_ms,
+                              "usage": call_info.get("usage"), "responseFormat": response_format,
+                              "response": response})
+                self.stats["recorded"] += 1
+            return response
+
+        with self._lock:
+            queue = self._by_key.get(key)
+            if queue:
+                rec = queue.pop(0) if len(queue) > 1 else queue[0]
+                self.stats["exactHits"] += 1
+            elif self.sequential_fallback and seq < len(self._ordered):
+                rec = self._ordered[seq]
+                self.stats["sequentialHits"] += 1
+                logger.info(f'Cassette miss for request #{seq}, serving recording at same position')
+            else:
+                raise RuntimeError(f"Cassette has no recorded response for request #{seq} ({key[:12]})")
+        self._sleep_for(rec)
+        # token counts of the recorded call (cassettes written before usage was kept have none)
+        call_info.update(attempts=1, cassette=True)
+        if rec.get("usage"):
+            call_info["usage"] = rec["usage"]
+        return rec["response"]
@@ -0,0 +1,64 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Single-Pass DOM Preprocessing (lxml)
+                                                        sanitize + clamp attributes + pretty serialize in one parse
+"""
+import logging
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional, fall back to the BeautifulSoup pipeline
+    etree = None
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+_DROP_TAGS = ("script", "style", "noscript", "template")
+
+
+def _clamp_middle(text: str, max_chars: int) -> str:
+    if len(text) > max_chars:
+        half = max_chars // 2
+        return text[:half] + "\n...\n" + text[-half:]
+    return text
+
+
+def preprocess_dom_for_llm(html: str, max_attr_len: int = 1024, max_chars: int = 5_000_000) -> str:
+    """
+    Equivalent of _summarize_dom_for_llm(sanitize_html_for_llm(html)) with ONE parse:
+    - remove <script>, <style>, <noscript>, <template> and HTML comments
+    - drop inline event handlers (on*) and trim overly long attribute values
+    - serialize indented for the LLM and clamp to 'max_chars'
+    Falls back to the BeautifulSoup functions when lxml is not installed.
+    """
+    if not html:
+        return ""
+    if lxml_html is None:
+        from llm_service.grounder import sanitize_html_for_llm, _summarize_dom_for_llm
+        return _summarize_dom_for_llm(sanitize_html_for_llm(html, max_attr_len=max_attr_len), max_chars=max_chars)
+
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, remove_blank_text=True,
+                                  encoding="utf-8")
+    try:
+        root = lxml_html.document_fromstring(html.encode("utf-8", errors="ignore"), parser=parser)
+    except (etree.ParserError, ValueError) as e:
+        logger.info(f'lxml could not parse DOM ({e}), falling back to BeautifulSoup')
+        from llm_service.grounder import sanitize_html_for_llm, _summarize_dom_for_llm
+        return _summarize_dom_for_llm(sanitize_html_for_llm(html, max_attr_len=max_attr_len), max_chars=max_chars)
+
+    # keep the tail text of dropped nodes, it belongs to the parent
+    etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
+
+    for el in root.iter(etree.Element):
+        attrib = el.attrib
+        if not attrib:
+            continue
+        for attr, val in list(attrib.items()):
+            if attr.lower().startswith("on"):
+                del attrib[attr]
+            elif len(val) > max_attr_len:
+                attrib[attr] = val[:max_attr_len] + "…"
+
+    out = lxml_html.tostring(root, pretty_print=True, encoding="unicode", doctype="<!DOCTYPE html>")
+    return _clamp_middle(out, max_chars)
@@ -5,12 +5,13 @@ Date                    Author                          Change Details
                                                         Execution
 
 """
-import base64
 import json
 import logging
 import re
+import time
+import weakref
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from bs4 import BeautifulSoup, Comment
 
@@ -18,7 +19,14 @@ from dataclass.conceptual_objects import (
     Intents, IntentItem, get_intents_from_json_str, get_intents_from_dict, Step, Locator, WaitConfig, json_obj_to_step
 )
 from llm_service.abstract_llm_client import AbstractLLMClient
-from pw_lib_ext.config import AppConfig
+from llm_service.grounding_cache import GroundingCache, prompt_version
+from llm_service.history import ChatHistory, PHASE_INTENTS, PHASE_GROUNDING
+from llm_service.image_pipeline import EncodedImage, prepare_screenshot
+from llm_service.ledger import LLMLedger
+from llm_service.token_budget import TokenBudget
+from llm_service.tokens import estimate_text_tokens
+from pw_lib_ext.config import AppConfig, HistoryPolicy
+from telemetry.spans import span
 
 
 def _read_text_safe(path: str, limit: int = 5_000_000) -> str:
@@ -38,22 +46,28 @@ def _read_text_safe(path: str, limit: int = 5_000_000) -> str:
         raise e
 
 
-def _image_to_data_uri(path: str) -> str:
+def _prepare_image(path: str, cfg: AppConfig, intent: str, scroll: Tuple[int, int] = (0, 0),
+                   png_bytes: Optional[bytes] = None) -> Optional[EncodedImage]:
     """
-    Convert local PNG/JPG to a base64 data URI for vision models.
-    Returns empty string if file is missing or unreadable.
+    Run a screenshot through the image pipeline (crop, downscale, re-encode, detail policy).
+    In-memory capture bytes are used when given, else the local PNG/JPG file is read.
+    Returns None if the image is missing or unreadable.
     """
-    if not path:
-        return ""
-    p = Path(path)
-    if not p.exists():
-        return ""
-    mime = "image/png" if p.suffix.lower() in (".png",) else "image/jpeg"
+    mime = "image/png"
+    if png_bytes is None:
+        if not path:
+            return None
+        p = Path(path)
+        if not p.exists():
+            return None
+        mime = "image/png" if p.suffix.lower() in (".png",) else "image/jpeg"
     try:
-        b64 = base64.b64encode(p.read_bytes()).decode("ascii")
-        return f"data:{mime};base64,{b64}"
-    except Exception:
-        return ""
+        data = png_bytes if png_bytes is not None else Path(path).read_bytes()
+        return prepare_screenshot(data, cfg.grounding.image, intent=intent,
+                                  viewport=cfg.browser.viewport, scroll=scroll, mime=mime)
+    except Exception as e:
+        logging.info(f'Screenshot preparation failed - {type(e).__name__}: {e}')
+        return None
 
 
 # def _summarize_dom_for_llm(html: str, max_chars: int = 60_000) -> str:
@@ -237,13 +251,20 @@ class LLMAgent:
     """
 
     def __init__(self, llm_client: AbstractLLMClient, system_prompt_plain_english: str,
-                 system_prompt_automation_steps: str):
+                 system_prompt_automation_steps: str, history_policy: Optional[HistoryPolicy] = None,
+                 token_budget: Optional[TokenBudget] = None, ledger: Optional[LLMLedger] = None):
         # API_BASE = "https://aiml04openai.openai.azure.com"
         # API_VERSION = "2025-01-01-preview"
         # MODEL_NAME = "insta-gpt-4o"
         self.system_prompt_plain_english = system_prompt_plain_english
         self.system_prompt_automation_steps_conversion = system_prompt_automation_steps
         self.llm_client = llm_client
+        # bounded replay of previous assistant turns (see llm_service/history.py)
+        self.history = ChatHistory(history_policy)
+        # per-call token budget for grounding payloads (see llm_service/token_budget.py)
+        self.token_budget = token_budget
+        # per-call usage / latency records of the run (see llm_service/ledger.py)
+        self.ledger = ledger
         # Azure OpenAI Configuration
         # dotenv.load_dotenv(dotenv_path=os.path.join(PARENT_DIR, ".env"))
         #
@@ -251,9 +272,11 @@ class LLMAgent:
         #                                                  api_version=API_VERSION, model=MODEL_NAME)
         # self.llm_client = OpenAILLMClient(api_key=os.getenv("OPENAI_API_KEY"))
 
-    def get_playwright_json(self, grounding_payload: Dict[str, Any]) -> Dict[str, Any]:
+    def get_playwright_json(self, grounding_payload: Dict[str, Any], record_history: bool = True) -> Dict[str, Any]:
         dom_text = grounding_payload.get("artifactDOM", "")
+        digest_text = grounding_payload.get("artifactDigest", "")
         img_data_uri = grounding_payload.get("artifactImageDataURI", "")
+        img_detail = grounding_payload.get("artifactImageDetail") or "high"
 
         envelope = {
             "intent": grounding_payload.get("intent"),
@@ -269,10 +292,25 @@ class LLMAgent:
             {"type": "text",
              "text": f"CONTEXT: locale={envelope['locale']} domRef={envelope['domReference']} screenRef={envelope['screenReference']}"},
         ]
+        if self.token_budget:
+            fixed_parts = {
+                "system": self.system_prompt_automation_steps_conversion,
+                "history": self.history.context_for(PHASE_GROUNDING),
+                "intent": "\n".join(part["text"] for part in user_content),
+                "image": (img_data_uri, img_detail),
+            }
+            with span("prompt.budget"):
+                dom_text, digest_text, _ = self.token_budget.fit_grounding(fixed_parts, dom_text, digest_text)
         if dom_text:
             user_content.append({"type": "text", "text": f"ARTIFACT_DOM_SUMMARY:\n{dom_text}"})
+        if digest_text:
+            user_content.append({"type": "text", "text": (
+                "ARTIFACT_ELEMENT_DIGEST (visible interactive/landmark elements of the current page, one per line: "
+                "[index] role \"accessible name\" <tag> text=... id=... nameAttr=... placeholder=... href=... "
+                "testId=attr:value box=x,y,width,height in CSS pixels of the viewport; use it as the DOM evidence):\n"
+                f"{digest_text}")})
         if img_data_uri:
-            user_content.append({"type": "image_url", "image_url": {"url": img_data_uri, "detail": "high"}})
+            user_content.append({"type": "image_url", "image_url": {"url": img_data_uri, "detail": img_detail}})
 
         messages = [
 
@@ -280,7 +318,8 @@ class LLMAgent:
             {"role": "user", "content": user_content}
 
         ]
-        response: dict = self._chat_completion(messages)
+        response: dict = self._chat_completion(messages, phase=PHASE_GROUNDING, record_history=record_history,
+                                               intent=envelope["intent"], speculative=not record_history)
 
         if isinstance(response, dict):
             if "steps" in response and isinstance(response["steps"], list) and response["steps"]:
@@ -295,14 +334,26 @@ class LLMAgent:
             {"role": "system", "content": self.system_prompt_plain_english},
             {"role": "user", "content": user_prompt}
         ]
-        response: dict = self._chat_completion(messages)
+        response: dict = self._chat_completion(messages, phase=PHASE_INTENTS)
         return response
 
-    def _chat_completion(self, messages: List[Dict[str, str]]) -> dict:
-        if self.llm_client.get_chat_history():
-            messages = messages + self.llm_client.get_chat_history()
-        response: dict = self.llm_client.execute_chat_completion_api(messages, response_format={"type": "json_object"})
-        self.llm_client.add_chat_history({"role": "assistant", "content": json.dumps(response)})
+    def record_grounding_turn(self, response: Dict[str, Any]) -> None:
+        """Add a grounding response obtained with record_history=False (e.g. speculative) to the history."""
+        self.history.record(PHASE_GROUNDING, {"role": "assistant", "content": json.dumps(response)})
+
+    def _chat_completion(self, messages: List[Dict[str, str]], phase: str = PHASE_GROUNDING,
+                         record_history: bool = True, **ledger_fields) -> dict:
+        messages = self.history.with_context(phase, messages)
+        with span("llm.request", phase=phase):
+            if self.ledger:
+                # ledger call types are the history phases ('intents' / 'grounding')
+                response: dict = self.ledger.complete(self.llm_client, phase, messages,
+                                                      response_format={"type": "json_object"}, **ledger_fields)
+            else:
+                response = self.llm_client.execute_chat_completion_api(messages,
+                                                                       response_format={"type": "json_object"})
+        if record_history:
+            self.history.record(phase, {"role": "assistant", "content": json.dumps(response)})
         return response
 
 
@@ -459,34 +510,142 @@ def seed_steps_from_intents(intents: Intents, default_wait=("domReady", 10000))
     return steps
 
 
+class _StepTable:
+    """
+    Per-Step bookkeeping. Step is an unhashable dataclass, so entries are keyed by id() but hold a
+    weak reference that must still point at the same step: an entry never outlives its step and
+    never answers for a later step that reuses the id.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[weakref.ref, Any]] = {}
+
+    def put(self, step: Step, value: Any) -> None:
+        sid = id(step)
+
+        def _forget(ref: weakref.ref, sid: int = sid) -> None:
+            if self._entries.get(sid, (None,))[0] is ref:
+                self._entries.pop(sid, None)
+
+        self._entries[sid] = (weakref.ref(step, _forget), value)
+
+    def pop(self, step: Step) -> Any:
+        entry = self._entries.pop(id(step), None)
+        return entry[1] if entry and entry[0]() is step else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # --------- Phase-2 Grounder (per-step) ---------
 class Grounder:
     """
     Produces a grounded Step for a given intent based on the CURRENT artifacts.
     If LLM is provided, uses it; else returns a heuristic step.
+    With a GroundingCache, a step previously grounded (and executed successfully) for the same
+    intent on a byte-identical page is served from the cache without calling the LLM.
     """
 
-    def __init__(self, cfg: AppConfig, llm: Optional[LLMAgent] = None):
+    def __init__(self, cfg: AppConfig, llm: Optional[LLMAgent] = None, cache: Optional[GroundingCache] = None):
         self.cfg = cfg
         self.llm = llm
+        self.cache = cache
+        self._pending = _StepTable()  # step -> (cache key, step before execution, intent, dom hash)
+        self._served = _StepTable()  # step served from the cache -> its cache key
+        self.call_log: List[Dict[str, Any]] = []  # per grounding call: payload kind, tokens, latency
+
+    def _cache_key(self, intent: str, dom_hash: Optional[str]) -> Optional[str]:
+        if not self.cache or not dom_hash or not self.llm:
+            return None
+        return GroundingCache.make_key(intent, dom_hash, self.llm.llm_client.model,
+                                       prompt_version(self.llm.system_prompt_automation_steps_conversion))
+
+    def get_cached_step(self, intent: str, dom_id: int, sc_id: int, dom_hash: Optional[str]) -> Optional[Step]:
+        """Return the cached grounded step for this intent on this exact page, or None."""
+        key = self._cache_key(intent, dom_hash)
+        if not key:
+            return None
+        cached = self.cache.get(key)
+        if not cached:
+            return None
+        logging.info(f'Grounding cache hit for intent: {intent}')
+        step = json_obj_to_step(cached)
+        step.domReference, step.screenReference = dom_id, sc_id
+        self._served.put(step, key)
+        return step
 
     def get_pw_step_from_llm(self, intent: str, dom_id: int, sc_id: int,
                              artifact_dom: Optional[str] = None,
-                             screenshot_path: Optional[str] = None) -> Step:
+                             screenshot_path: Optional[str] = None,
+                             dom_hash: Optional[str] = None,
+                             record_history: bool = True,
+                             artifact_digest: Optional[str] = None,
+                             screenshot_scroll: Tuple[int, int] = (0, 0),
+                             screenshot_png: Optional[bytes] = None) -> Step:
+        key = self._cache_key(intent, dom_hash)
         if self.llm:
-            img_data_uri = _image_to_data_uri(screenshot_path) if screenshot_path else ""
+            prep_started = time.perf_counter()
+            with span("image.encode"):
+                image = _prepare_image(screenshot_path, self.cfg, intent, screenshot_scroll, screenshot_png) \
+                    if screenshot_path or screenshot_png else None
+            prep_ms = int((time.perf_counter() - prep_started) * 1000)
             payload = {
                 "intent": intent,
                 "locale": self.cfg.browser.locale,
                 "domReference": dom_id,
                 "screenReference": sc_id,
                 "artifactDOM": artifact_dom or "",
-                "artifactImageDataURI": img_data_uri,
+                "artifactDigest": artifact_digest or "",
+                "artifactImageDataURI": image.data_uri if image else "",
+                "artifactImageDetail": image.detail if image else None,
                 "waitDefaults": self.cfg.grounding.waitDefaults.interaction
             }
-            response = self.llm.get_playwright_json(payload)  # single dict
+            started = time.perf_counter()
+            with span("ground", speculative=not record_history):
+                response = self.llm.get_playwright_json(payload, record_history=record_history)  # single dict
+            self.call_log.append({
+                "intent": intent,
+                "domReference": dom_id,
+                "payload": self.cfg.grounding.domPayload,
+                "domTokens": estimate_text_tokens(artifact_dom or ""),
+                "digestTokens": estimate_text_tokens(artifact_digest or ""),
+                "imageDetail": image.detail if image else None,
+                "imageSize": [image.width, image.height] if image and image.width else None,
+                "imageBytesCaptured": image.bytes_in if image else 0,
+                "imageBytesUploaded": image.bytes_out if image else 0,
+                "imagePrepMs": prep_ms,
+                "latencyMs": int((time.perf_counter() - started) * 1000),
+                "speculative": not record_history,
+            })
+            logging.info(f'Grounding call: {self.call_log[-1]["latencyMs"]} ms, image '
+                         f'{self.call_log[-1]["imageBytesUploaded"]} bytes uploaded '
+                         f'(detail={self.call_log[-1]["imageDetail"]})')
             logging.info(f'Intent to LLM: \n'
                          f'{intent}\n'
                          f'Step Returned By LLM : \n'
                          f'{json.dumps(response, indent=2)}')
-            return json_obj_to_step(response)
+            step = json_obj_to_step(response)
+            if key:
+                # snapshot before execution mutates the step; stored only once it passes
+                self._pending.put(step, (key, step.to_dict(), intent, dom_hash))
+            return step
+
+    def record_success(self, step: Step) -> None:
+        """Store a step grounded by the LLM in the cache after it executed successfully."""
+        self._served.pop(step)
+        pending = self._pending.pop(step)
+        if not pending or not self.cache:
+            return
+        key, step_obj, intent, dom_hash = pending
+        self.cache.put(key, step_obj, intent=intent, dom_hash=dom_hash, model=self.llm.llm_client.model,
+                       prompt_ver=prompt_version(self.llm.system_prompt_automation_steps_conversion))
+
+    def discard(self, step: Step) -> None:
+        """Forget a step that failed; a cached step that failed is removed from the cache."""
+        self._pending.pop(step)
+        key = self._served.pop(step)
+        if key and self.cache:
+            self.cache.delete(key)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache else {"enabled": False}
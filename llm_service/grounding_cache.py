@@ -0,0 +1,129 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Persistent Grounding Cache
+                                                        (normalized intent + domHash + model + prompt version -> Step)
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_intent(intent: str) -> str:
+    """
+    Whitespace collapsed and trailing punctuation trimmed; case is kept, since quoted literals
+    and input values ("Enter 'ABC123'" vs "Enter 'abc123'") must not share a cached step.
+    """
+    s = re.sub(r"\s+", " ", (intent or "").strip())
+    return s.rstrip(" .,;")
+
+
+def prompt_version(system_prompt: str) -> str:
+    return hashlib.sha1((system_prompt or "").encode("utf-8", errors="ignore")).hexdigest()[:12]
+
+
+class GroundingCache:
+    """
+    SQLite backed, content-addressed cache of grounded steps.
+    Only steps that executed successfully are stored (see Grounder.record_success).
+    Entries older than 'max_age_days' are dropped, and beyond 'max_entries' the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, max_age_days: int = 30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS grounding_cache ("
+            " key TEXT PRIMARY KEY,"
+            " intent TEXT, dom_hash TEXT, model TEXT, prompt_version TEXT,"
+            " step_json TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_hit_at REAL NOT NULL, hit_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(intent: str, dom_hash: str, model: str, prompt_ver: str) -> str:
+        raw = "\x1f".join([normalize_intent(intent), dom_hash or "", model or "", prompt_ver or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT step_json FROM grounding_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE grounding_cache SET last_hit_at = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, step_obj: Dict[str, Any], intent: str = "", dom_hash: str = "", model: str = "",
+            prompt_ver: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO grounding_cache"
+                " (key, intent, dom_hash, model, prompt_version, step_json, created_at, last_hit_at, hit_count)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, normalize_intent(intent), dom_hash, model, prompt_ver,
+                 json.dumps(step_obj, ensure_ascii=False), now, now))
+            self._conn.commit()
+            self.stores += 1
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM grounding_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            if self.max_age_days and self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM grounding_cache WHERE created_at < ?",
+                                              (cutoff,)).rowcount
+            if self.max_entries and self.max_entries > 0:
+                removed += self._conn.execute(
+                    "DELETE FROM grounding_cache WHERE key IN ("
+                    " SELECT key FROM grounding_cache ORDER BY last_hit_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info(f'Grounding cache evicted {removed} entries')
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM grounding_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stored": self.stores,
+            "entries": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,135 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Bounded Chat History For LLMAgent
+                                                        (sliding window, per-phase, compacted summary)
+"""
+import json
+import threading
+from typing import List, Dict, Any, Optional
+
+from llm_service.tokens import estimate_message_tokens
+from pw_lib_ext.config import HistoryPolicy
+
+PHASE_INTENTS = "intents"
+PHASE_GROUNDING = "grounding"
+_SHARED_PHASE = "shared"
+
+
+class ChatHistory:
+    """
+    Keeps assistant turns replayed to the model on subsequent calls.
+      - mode 'unbounded': every previous turn is replayed (legacy behaviour)
+      - mode 'window'   : only the last 'windowSize' turns are replayed
+      - mode 'none'     : nothing is replayed
+    With 'perPhase' the intent extraction and grounding turns are kept apart, and with
+    'compactSummary' the turns leaving the window are folded into one short summary message.
+    Tracks the prompt tokens saved against unbounded replay of one shared history.
+    """
+
+    def __init__(self, policy: Optional[HistoryPolicy] = None):
+        self.policy = policy or HistoryPolicy()
+        self._turns: Dict[str, List[Dict[str, Any]]] = {}
+        self._summaries: Dict[str, List[str]] = {}
+        self._all_turns: List[Dict[str, Any]] = []  # what unbounded replay would have sent
+        self._calls = 0
+        self._replayed_tokens = 0
+        self._unbounded_tokens = 0
+        self._lock = threading.RLock()  # speculative grounding calls run on a worker thread
+
+    # ---------- internals ----------
+    def _key(self, phase: str) -> str:
+        return phase if self.policy.perPhase else _SHARED_PHASE
+
+    def _summary_message(self, key: str) -> Optional[Dict[str, Any]]:
+        lines = self._summaries.get(key)
+        if not lines:
+            return None
+        text = "\n".join(lines)
+        max_chars = self.policy.summaryMaxChars
+        if len(text) > max_chars:
+            # keep the most recent part, older steps matter least
+            text = "...\n" + text[-max_chars:]
+        return {"role": "assistant", "content": f"EARLIER STEPS (compacted):\n{text}"}
+
+    @staticmethod
+    def _summarize_turn(turn: Dict[str, Any]) -> str:
+        content = turn.get("content", "")
+        try:
+            obj = json.loads(content) if isinstance(content, str) else content
+        except (TypeError, ValueError):
+            return str(content)[:200]
+        if isinstance(obj, dict) and isinstance(obj.get("steps"), list) and obj["steps"]:
+            obj = obj["steps"][0]
+        if isinstance(obj, dict) and "intents" in obj:
+            return f"- extracted {len(obj.get('intents') or [])} intents"
+        if isinstance(obj, dict) and "action" in obj:
+            loc = obj.get("locator") or {}
+            target = loc.get("name") or loc.get("value") or loc.get("role") or ""
+            return f"- {obj.get('action')} [{loc.get('strategy')}={target}] for: {str(obj.get('intent', ''))[:120]}"
+        return json.dumps(obj, ensure_ascii=False)[:200]
+
+    # ---------- public API ----------
+    def context_for(self, phase: str) -> List[Dict[str, Any]]:
+        """Messages to replay before the new user turn of the given phase."""
+        if self.policy.mode == "none":
+            return []
+        key = self._key(phase)
+        with self._lock:
+            turns = list(self._turns.get(key, []))
+            summary = self._summary_message(key)
+        if self.policy.mode == "unbounded":
+            return turns
+        context: List[Dict[str, Any]] = []
+        if summary:
+            context.append(summary)
+        context.extend(turns)
+        return context
+
+    def with_context(self, phase: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert replayed history between the leading system message(s) and the new turn,
+        and account for the tokens saved versus unbounded replay.
+        """
+        with self._lock:
+            context = self.context_for(phase)
+            self._calls += 1
+            self._replayed_tokens += estimate_message_tokens(context)
+            self._unbounded_tokens += estimate_message_tokens(self._all_turns)
+        if not context:
+            return messages
+        split = 0
+        while split < len(messages) and messages[split].get("role") == "system":
+            split += 1
+        return messages[:split] + context + messages[split:]
+
+    def record(self, phase: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            self._record(phase, message)
+
+    def _record(self, phase: str, message: Dict[str, Any]) -> None:
+        self._all_turns.append(message)
+        if self.policy.mode == "none":
+            return
+        key = self._key(phase)
+        turns = self._turns.setdefault(key, [])
+        turns.append(message)
+        if self.policy.mode != "window":
+            return
+        window = max(0, self.policy.windowSize)
+        while len(turns) > window:
+            dropped = turns.pop(0)
+            if self.policy.compactSummary:
+                self._summaries.setdefault(key, []).append(self._summarize_turn(dropped))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.policy.mode,
+            "windowSize": self.policy.windowSize,
+            "perPhase": self.policy.perPhase,
+            "compactSummary": self.policy.compactSummary,
+            "calls": self._calls,
+            "turnsRecorded": len(self._all_turns),
+            "replayedPromptTokens": self._replayed_tokens,
+            "unboundedPromptTokens": self._unbounded_tokens,
+            "promptTokensSaved": max(0, self._unbounded_tokens - self._replayed_tokens),
+        }
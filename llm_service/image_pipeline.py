@@ -0,0 +1,109 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Screenshot Payload Optimizer
+                                                        crop -> downscale to model resolution -> re-encode -> detail policy
+"""
+import base64
+import io
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, the raw PNG is sent without it
+    Image = None
+
+from pw_lib_ext.config import ImagePolicy
+
+logger = logging.getLogger(__name__)
+
+# OpenAI vision: 'high' fits the image in 2048x2048 then scales the short side to 768,
+# 'low' is a single 512x512 tile. Anything larger is downscaled server side anyway.
+HIGH_DETAIL_FIT = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+LOW_DETAIL_FIT = 512
+
+_NAVIGATION_INTENT = re.compile(r"^\s*(open|navigate|go to|visit|launch)\b|https?://", re.I)
+_MIME = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+@dataclass
+class EncodedImage:
+    data_uri: str
+    detail: str
+    width: int
+    height: int
+    bytes_in: int
+    bytes_out: int
+
+
+def choose_detail(policy: ImagePolicy, intent: str, size: Tuple[int, int]) -> str:
+    """
+    'adaptive': low for navigation intents (the page is loaded by URL, the image is context only)
+    and for images already within one low-detail tile; high otherwise.
+    """
+    if policy.detail != "adaptive":
+        return policy.detail
+    if _NAVIGATION_INTENT.search(intent or ""):
+        return "low"
+    if size[0] <= LOW_DETAIL_FIT and size[1] <= LOW_DETAIL_FIT:
+        return "low"
+    return "high"
+
+
+def _target_size(width: int, height: int, detail: str) -> Tuple[int, int]:
+    fit = LOW_DETAIL_FIT if detail == "low" else HIGH_DETAIL_FIT
+    scale = min(1.0, fit / max(width, height))
+    w, h = width * scale, height * scale
+    if detail != "low" and min(w, h) > HIGH_DETAIL_SHORT_SIDE:
+        scale2 = HIGH_DETAIL_SHORT_SIDE / min(w, h)
+        w, h = w * scale2, h * scale2
+    return max(1, int(w)), max(1, int(h))
+
+
+def _crop_box(width: int, height: int, policy: ImagePolicy, viewport: Optional[Dict[str, int]],
+              scroll: Tuple[int, int]) -> Optional[Tuple[int, int, int, int]]:
+    if policy.crop == "viewport" and viewport:
+        vw, vh = viewport.get("width", width), viewport.get("height", height)
+        left, top = max(0, scroll[0]), max(0, scroll[1])
+        if left >= width or top >= height:
+            left, top = 0, 0
+        return left, top, min(width, left + vw), min(height, top + vh)
+    if policy.crop == "region" and height > policy.regionHeightPx:
+        return 0, 0, width, policy.regionHeightPx
+    return None
+
+
+def prepare_screenshot(png_bytes: bytes, policy: ImagePolicy, intent: str = "",
+                       viewport: Optional[Dict[str, int]] = None, scroll: Tuple[int, int] = (0, 0),
+                       mime: str = "image/png") -> Optional[EncodedImage]:
+    if not png_bytes:
+        return None
+    if not policy.optimize or Image is None:
+        detail = "high" if policy.detail == "adaptive" else policy.detail
+        b64 = base64.b64encode(png_bytes).decode("ascii")
+        return EncodedImage(f"data:{mime};base64,{b64}", detail, 0, 0, len(png_bytes), len(png_bytes))
+
+    img = Image.open(io.BytesIO(png_bytes))
+    img.load()
+    box = _crop_box(img.width, img.height, policy, viewport, scroll)
+    if box:
+        img = img.crop(box)
+    detail = choose_detail(policy, intent, img.size)
+    target = _target_size(img.width, img.height, detail)
+    if target != img.size:
+        img = img.resize(target, Image.LANCZOS)
+
+    fmt = policy.format
+    out = io.BytesIO()
+    if fmt == "jpeg":
+        img.convert("RGB").save(out, format="JPEG", quality=policy.quality, optimize=True)
+    elif fmt == "webp":
+        img.save(out, format="WEBP", quality=policy.quality, method=4)
+    else:
+        img.save(out, format="PNG", optimize=True)
+    data = out.getvalue()
+    b64 = base64.b64encode(data).decode("ascii")
+    return EncodedImage(f"data:{_MIME[fmt]};base64,{b64}", detail, img.width, img.height, len(png_bytes), len(data))
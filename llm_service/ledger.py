@@ -0,0 +1,140 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         LLM Usage And Latency Ledger
+                                                        (one JSONL record per call, roll-up for run_log.json)
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from llm_service.abstract_llm_client import AbstractLLMClient
+from llm_service.history import PHASE_INTENTS, PHASE_GROUNDING
+
+logger = logging.getLogger(__name__)
+
+# call types: the two LLMAgent phases plus the final artifacts -> output schema transform
+CALL_INTENTS = PHASE_INTENTS
+CALL_GROUNDING = PHASE_GROUNDING
+CALL_SCHEMA = "schema"
+
+_COUNTERS = ("calls", "failed", "attempts", "retries", "promptTokens", "completionTokens", "cachedTokens",
+             "images", "imageBytes", "wallMs")
+
+
+def image_stats(messages: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """(image parts, decoded bytes of their data URIs) in a chat completion request."""
+    count, size = 0, 0
+    for m in messages:
+        content = m.get("content")
+        if not isinstance(content, list):
+            continue
+        for part in content:
+            if not isinstance(part, dict) or part.get("type") != "image_url":
+                continue
+            count += 1
+            url = (part.get("image_url") or {}).get("url", "")
+            if url.startswith("data:") and "," in url:
+                b64 = url.split(",", 1)[1]
+                size += len(b64) * 3 // 4 - b64[-2:].count("=")
+    return count, size
+
+
+class LLMLedger:
+    """
+    Records every LLM call of a run: call type, token usage, images sent, wall latency,
+    attempts and outcome, appended to 'path' as one JSON line each. summary() is the roll-up
+    per call type. Thread safe (speculative grounding calls arrive from a worker thread).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._max_wall_ms: Dict[str, int] = {}
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")
+
+    def complete(self, llm_client: AbstractLLMClient, call_type: str, messages: List[Dict[str, Any]],
+                 response_format=None, **fields: Any) -> Any:
+        """
+        llm_client.execute_chat_completion_api(messages) with the call recorded;
+        'fields' (e.g. intent, speculative) are copied into the record.
+        """
+        call_info: Dict[str, Any] = {}
+        started = time.perf_counter()
+        outcome, error = "ok", None
+        try:
+            return llm_client.execute_chat_completion_api(messages, response_format=response_format,
+                                                          call_info=call_info)
+        except Exception as e:
+            outcome, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(call_type, messages, call_info, int((time.perf_counter() - started) * 1000),
+                        outcome, error, model=llm_client.model, **fields)
+
+    def record(self, call_type: str, messages: List[Dict[str, Any]], call_info: Dict[str, Any], wall_ms: int,
+               outcome: str = "ok", error: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+        images, image_bytes = image_stats(messages)
+        usage = call_info.get("usage") or {}
+        attempts = call_info.get("attempts", 1)
+        rec: Dict[str, Any] = {
+            "ts": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="milliseconds"),
+            "callType": call_type,
+            "promptTokens": usage.get("promptTokens", 0),
+            "completionTokens": usage.get("completionTokens", 0),
+            "cachedTokens": usage.get("cachedTokens", 0),
+            "images": images,
+            "imageBytes": image_bytes,
+            "wallMs": wall_ms,
+            "attempts": attempts,
+            "attemptMs": call_info.get("attemptMs", []),
+            "outcome": outcome,
+        }
+        if call_info.get("errors"):
+            rec["attemptErrors"] = call_info["errors"]
+        if "queueMs" in call_info:
+            rec["queueMs"] = call_info["queueMs"]
+        if call_info.get("cassette"):
+            rec["cassette"] = True
+        if error:
+            rec["error"] = error
+        rec.update({k: v for k, v in fields.items() if v is not None})
+
+        with self._lock:
+            self._seq += 1
+            rec = {"seq": self._seq, **rec}
+            t = self._totals.setdefault(call_type, dict.fromkeys(_COUNTERS, 0))
+            t["calls"] += 1
+            t["failed"] += outcome != "ok"
+            t["attempts"] += attempts
+            t["retries"] += max(0, attempts - 1)
+            for k in ("promptTokens", "completionTokens", "cachedTokens", "images", "imageBytes", "wallMs"):
+                t[k] += rec[k]
+            self._max_wall_ms[call_type] = max(self._max_wall_ms.get(call_type, 0), wall_ms)
+            if self.path:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        logger.info(f'LLM call #{rec["seq"]} {call_type}: {outcome}, {wall_ms} ms, {attempts} attempt(s), '
+                    f'{rec["promptTokens"]}+{rec["completionTokens"]} tokens')
+        return rec
+
+    def summary(self) -> Dict[str, Any]:
+        """Run roll-up: totals plus the same counters per call type, with mean / max latency."""
+        with self._lock:
+            by_type = {k: dict(v) for k, v in self._totals.items()}
+            max_wall = dict(self._max_wall_ms)
+        totals = dict.fromkeys(_COUNTERS, 0)
+        for call_type, t in by_type.items():
+            for k in _COUNTERS:
+                totals[k] += t[k]
+            t["meanWallMs"] = int(t["wallMs"] / t["calls"]) if t["calls"] else 0
+            t["maxWallMs"] = max_wall.get(call_type, 0)
+        return {"file": self.path.name if self.path else None, **totals, "byType": by_type}
@@ -0,0 +1,143 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Speculative Pre-Grounding Of The Next Intent
+                                                        While The Current Step Executes
+"""
+import hashlib
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Set, Tuple
+
+from dataclass.conceptual_objects import Step
+from llm_service.grounder import Grounder
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+def _dom_sketch(text: str, shingle: int = 8, k: int = 512) -> Set[int]:
+    """Bottom-k MinHash sketch of word shingles of the page text + markup tokens."""
+    tokens = _WS_RE.split(_TAG_RE.sub(lambda m: " " + m.group(0)[:40] + " ", text or ""))
+    tokens = [t for t in tokens if t]
+    if len(tokens) < shingle:
+        tokens = tokens + [""] * (shingle - len(tokens))
+    hashes = set()
+    for i in range(0, len(tokens) - shingle + 1):
+        h = hashlib.blake2b(" ".join(tokens[i:i + shingle]).encode("utf-8", errors="ignore"), digest_size=8)
+        hashes.add(int.from_bytes(h.digest(), "big"))
+    return set(sorted(hashes)[:k])
+
+
+def dom_similarity(a: str, b: str) -> float:
+    """Estimated Jaccard similarity (0..1) of two DOM texts."""
+    if a == b:
+        return 1.0
+    sa, sb = _dom_sketch(a), _dom_sketch(b)
+    if not sa or not sb:
+        return 0.0
+    k = min(len(sa), len(sb))
+    union_bottom = set(sorted(sa | sb)[:k])
+    return len(union_bottom & sa & sb) / float(k)
+
+
+class SpeculativeGrounder:
+    """
+    Grounds intent N+1 against the artifacts step N was grounded on, in the background while
+    step N executes. After step N the speculation is kept if the new page has the same domHash
+    or is at least 'threshold' similar; otherwise it is dropped and the caller re-grounds.
+    Speculative LLM turns only enter the chat history once accepted.
+    """
+
+    def __init__(self, grounder: Grounder, threshold: float = 0.97):
+        self.grounder = grounder
+        self.threshold = threshold
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-grounding")
+        self._future: Optional[Future] = None
+        self._intent: Optional[str] = None
+        self._dom_hash: Optional[str] = None
+        self._dom_text: str = ""
+        self._started_at = 0.0
+        self._finished_at = 0.0
+        self.stats: Dict[str, Any] = {"started": 0, "acceptedExact": 0, "acceptedSimilar": 0, "rejected": 0,
+                                      "failed": 0, "savedMs": 0}
+
+    def _run(self, intent: str, dom_id: int, sc_id: int, dom_text: str, screenshot_path: str,
+             dom_hash: Optional[str], digest_text: str, screenshot_scroll: Tuple[int, int],
+             screenshot_png: Optional[bytes]) -> Step:
+        try:
+            return self.grounder.get_pw_step_from_llm(intent, dom_id=dom_id, sc_id=sc_id, artifact_dom=dom_text,
+                                                      screenshot_path=screenshot_path, dom_hash=dom_hash,
+                                                      record_history=False, artifact_digest=digest_text,
+                                                      screenshot_scroll=screenshot_scroll,
+                                                      screenshot_png=screenshot_png)
+        finally:
+            self._finished_at = time.perf_counter()
+
+    def start(self, intent: str, dom_id: int, sc_id: int, dom_text: str, screenshot_path: str,
+              dom_hash: Optional[str], digest_text: str = "", screenshot_scroll: Tuple[int, int] = (0, 0),
+              screenshot_png: Optional[bytes] = None) -> None:
+        self.cancel()
+        # fingerprint text compared after the step: the DOM if sent, else the element digest
+        self._intent, self._dom_hash, self._dom_text = intent, dom_hash, dom_text or digest_text
+        self._started_at, self._finished_at = time.perf_counter(), 0.0
+        self._future = self._pool.submit(self._run, intent, dom_id, sc_id, dom_text, screenshot_path, dom_hash,
+                                         digest_text, screenshot_scroll, screenshot_png)
+        self.stats["started"] += 1
+
+    def pending_for(self, intent: str) -> bool:
+        return self._future is not None and self._intent == intent
+
+    def cancel(self) -> None:
+        """Drop the outstanding speculation (its result, once ready, is discarded)."""
+        future, self._future = self._future, None
+        if future is None:
+            return
+        if not future.cancel():
+            future.add_done_callback(
+                lambda f: self.grounder.discard(f.result()) if not f.exception() else None)
+
+    def resolve(self, intent: str, dom_id: int, sc_id: int, dom_hash: Optional[str],
+                dom_text: str, digest_text: str = "") -> Optional[Step]:
+        """Return the speculative step if it is still valid for the current page, else None."""
+        if not self.pending_for(intent):
+            return None
+        dom_text = dom_text or digest_text
+        exact = bool(dom_hash) and dom_hash == self._dom_hash
+        similarity = 1.0 if exact else dom_similarity(self._dom_text, dom_text)
+        if similarity < self.threshold:
+            logger.info(f'Speculative grounding rejected (similarity {similarity:.3f}) for intent: {intent}')
+            self.stats["rejected"] += 1
+            self.cancel()
+            return None
+
+        future, self._future = self._future, None
+        wait_started = time.perf_counter()
+        try:
+            step: Step = future.result()
+        except Exception as e:
+            logger.info(f'Speculative grounding failed - {type(e).__name__}: {e}')
+            self.stats["failed"] += 1
+            return None
+        waited = time.perf_counter() - wait_started
+        llm_elapsed = (self._finished_at or time.perf_counter()) - self._started_at
+        self.stats["savedMs"] += int(max(0.0, llm_elapsed - waited) * 1000)
+
+        if exact:
+            self.stats["acceptedExact"] += 1
+        else:
+            # grounded on a different page: usable, but not a cache entry for either hash
+            self.stats["acceptedSimilar"] += 1
+            self.grounder.discard(step)
+        logger.info(f'Speculative grounding accepted (similarity {similarity:.3f}) for intent: {intent}')
+        step.domReference, step.screenReference = dom_id, sc_id
+        if self.grounder.llm:
+            self.grounder.llm.record_grounding_turn(step.to_dict())
+        return step
+
+    def close(self) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,203 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Token Budget For Grounding Calls
+                                                        (per-part token accounting, low-value DOM regions dropped first)
+"""
+import logging
+from typing import Any, Dict, List, Tuple
+
+from llm_service.dom_pipeline import lxml_html, etree
+from llm_service.tokens import count_text_tokens, estimate_text_tokens, estimate_message_tokens, image_part_tokens
+
+logger = logging.getLogger(__name__)
+
+_INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea", "option", "summary", "label", "form", "details"}
+_INTERACTIVE_ATTRS = ("role", "onclick", "tabindex", "contenteditable", "href")
+_MEDIA_TAGS = ("svg", "canvas", "video", "audio", "iframe", "object", "embed", "map", "picture", "source", "track")
+_NOISY_ATTRS = ("style", "srcset", "sizes", "integrity", "crossorigin", "referrerpolicy", "loading", "decoding")
+_TEXT_KEEP_CHARS = 80
+
+
+def _is_interactive(el) -> bool:
+    if el.tag in _INTERACTIVE_TAGS:
+        return True
+    attrib = el.attrib
+    return any(a in attrib for a in _INTERACTIVE_ATTRS)
+
+
+# ---------- pruning stages, lowest value first ----------
+def _drop_head(root) -> None:
+    for head in root.findall("head"):
+        for child in list(head):
+            if child.tag != "title":
+                head.remove(child)
+
+
+def _drop_media(root) -> None:
+    etree.strip_elements(root, *_MEDIA_TAGS, with_tail=False)
+
+
+def _drop_hidden(root) -> None:
+    for el in list(root.iter(etree.Element)):
+        attrib = el.attrib
+        style = attrib.get("style", "").replace(" ", "").lower()
+        if ("hidden" in attrib or attrib.get("aria-hidden") == "true" or "display:none" in style
+                or "visibility:hidden" in style or (el.tag == "input" and attrib.get("type") == "hidden")):
+            parent = el.getparent()
+            if parent is not None:
+                el.drop_tree()
+
+
+def _drop_noisy_attrs(root) -> None:
+    for el in root.iter(etree.Element):
+        attrib = el.attrib
+        for attr in list(attrib.keys()):
+            if attr in _NOISY_ATTRS or (attr.startswith("data-") and "test" not in attr):
+                del attrib[attr]
+        cls = attrib.get("class")
+        if cls and cls.count(" ") > 2:
+            attrib["class"] = " ".join(cls.split()[:3])
+
+
+def _drop_footer_aside(root) -> None:
+    for el in list(root.iter("footer", "aside")):
+        el.drop_tree()
+    for el in root.xpath('//*[@role="contentinfo" or @role="complementary"]'):
+        el.drop_tree()
+
+
+def _collapse_non_interactive(root) -> None:
+    """Replace subtrees without any interactive element by their clipped text."""
+    has_interactive: Dict[Any, bool] = {}
+    for el in reversed(list(root.iter(etree.Element))):  # children before parents
+        has_interactive[el] = _is_interactive(el) or any(has_interactive.get(c, False) for c in el)
+    for el in list(root.iter(etree.Element)):
+        parent = el.getparent()
+        if has_interactive.get(el, True) or el.tag in ("html", "body", "head", "title"):
+            continue
+        if parent is not None and not has_interactive.get(parent, True) and parent.tag not in ("html", "body"):
+            continue  # collapsed together with its topmost non-interactive ancestor
+        text = " ".join(el.text_content().split())
+        for child in list(el):
+            el.remove(child)
+        el.text = text[:_TEXT_KEEP_CHARS] + ("…" if len(text) > _TEXT_KEEP_CHARS else "")
+
+
+DOM_PRUNE_STAGES = (
+    ("head", _drop_head),
+    ("media", _drop_media),
+    ("hidden", _drop_hidden),
+    ("noisyAttributes", _drop_noisy_attrs),
+    ("footerAside", _drop_footer_aside),
+    ("collapseNonInteractive", _collapse_non_interactive),
+)
+
+
+class TokenBudget:
+    """
+    Keeps a grounding call under 'max_prompt_tokens'. The fixed parts (system prompt, replayed
+    history, intent/context, image) are counted first; the DOM / digest get what is left. An
+    oversize DOM is pruned region by region (head, media, hidden nodes, noisy attributes,
+    footer/aside, non-interactive text) and only as a last resort clamped as a string.
+    """
+
+    def __init__(self, max_prompt_tokens: int = 100_000, model: str = "gpt-4o"):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.model = model
+        self.calls: List[Dict[str, Any]] = []
+
+    def count(self, text: str) -> int:
+        return count_text_tokens(text, self.model)
+
+    def count_parts(self, parts: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Tokens per named message part; list values are treated as messages, 'image' as an image
+        part given as a data URI or a (data URI, detail) pair.
+        """
+        out: Dict[str, int] = {}
+        for name, value in parts.items():
+            if name == "image":
+                uri, detail = value if isinstance(value, tuple) else (value, "high")
+                out[name] = image_part_tokens(detail) if uri else 0
+            elif isinstance(value, list):
+                out[name] = estimate_message_tokens(value)
+            else:
+                out[name] = self.count(value or "")
+        return out
+
+    def fit_dom(self, html: str, budget: int) -> Tuple[str, List[str]]:
+        """Return (html within 'budget' tokens, names of pruning stages applied)."""
+        if not html or budget <= 0:
+            return ("", ["dropped"]) if html else ("", [])
+        if estimate_text_tokens(html) <= budget and self.count(html) <= budget:
+            return html, []
+        applied: List[str] = []
+        if lxml_html is not None:
+            try:
+                root = lxml_html.document_fromstring(html.encode("utf-8", errors="ignore"),
+                                                     parser=lxml_html.HTMLParser(encoding="utf-8"))
+                for name, stage in DOM_PRUNE_STAGES:
+                    stage(root)
+                    applied.append(name)
+                    html = lxml_html.tostring(root, pretty_print=True, encoding="unicode")
+                    if estimate_text_tokens(html) <= budget and self.count(html) <= budget:
+                        return html, applied
+            except (etree.ParserError, ValueError) as e:
+                logger.info(f'DOM pruning skipped, parse failed - {e}')
+        return self._clamp(html, budget), applied + ["clamp"]
+
+    def fit_digest(self, digest_text: str, budget: int) -> Tuple[str, List[str]]:
+        """Digest lines are already ranked by document order; drop from the end, keep the PAGE line."""
+        if not digest_text or budget <= 0:
+            return ("", ["dropped"]) if digest_text else ("", [])
+        if self.count(digest_text) <= budget:
+            return digest_text, []
+        lines = digest_text.splitlines()
+        keep, used = [], 0
+        for line in lines:
+            t = estimate_text_tokens(line) + 1
+            if used + t > budget:
+                break
+            keep.append(line)
+            used += t
+        return "\n".join(keep), ["truncateElements"]
+
+    def _clamp(self, text: str, budget: int) -> str:
+        # leave room for the elision marker
+        max_chars = max(0, (budget - 4) * len(text) // max(1, self.count(text)))
+        if len(text) <= max_chars:
+            return text
+        half = max_chars // 2
+        return text[:half] + "\n...\n" + text[-half:]
+
+    def fit_grounding(self, fixed_parts: Dict[str, Any], dom_text: str, digest_text: str
+                      ) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Fit DOM and digest into what the fixed parts leave of the per-call budget.
+        When both are sent the digest (compact, high value) is fitted first.
+        """
+        fixed = self.count_parts(fixed_parts)
+        remaining = self.max_prompt_tokens - sum(fixed.values())
+        digest_fit, digest_stages = self.fit_digest(digest_text, remaining)
+        remaining -= self.count(digest_fit)
+        dom_fit, dom_stages = self.fit_dom(dom_text, remaining)
+        record = {
+            "budget": self.max_prompt_tokens,
+            "parts": {**fixed, "dom": self.count(dom_fit), "digest": self.count(digest_fit)},
+            "domTokensBefore": self.count(dom_text) if dom_stages else None,
+            "domStages": dom_stages,
+            "digestStages": digest_stages,
+        }
+        record["total"] = sum(record["parts"].values())
+        self.calls.append(record)
+        return dom_fit, digest_fit, record
+
+    def stats(self) -> Dict[str, Any]:
+        pruned = [c for c in self.calls if c["domStages"] or c["digestStages"]]
+        return {
+            "maxPromptTokens": self.max_prompt_tokens,
+            "calls": len(self.calls),
+            "prunedCalls": len(pruned),
+            "maxTotal": max((c["total"] for c in self.calls), default=0),
+            "perCall": self.calls,
+        }
@@ -0,0 +1,83 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Token Estimation For Chat Payloads
+"""
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List
+
+try:
+    import tiktoken
+except ImportError:  # exact counting is optional, estimates are used without it
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text / markup with GPT-4o style tokenizers
+CHARS_PER_TOKEN = 4
+# Flat allowance for an image part (vision models bill images separately from text)
+IMAGE_PART_TOKENS = 765
+# A 'low' detail image is a single 512px tile
+LOW_DETAIL_IMAGE_TOKENS = 85
+
+
+def image_part_tokens(detail: str = "high") -> int:
+    return LOW_DETAIL_IMAGE_TOKENS if detail == "low" else IMAGE_PART_TOKENS
+
+
+def estimate_text_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=8)
+def _encoding_for(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # encoding files are fetched on first use and may be unreachable
+        logger.info(f'tiktoken unavailable ({type(e).__name__}), using estimated token counts')
+        return None
+
+
+def count_text_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Exact token count when tiktoken (and its encoding) is available, else the estimate."""
+    if not text:
+        return 0
+    enc = _encoding_for(model or "gpt-4o")
+    if enc is None:
+        return estimate_text_tokens(text)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def estimate_content_tokens(content: Any) -> int:
+    """
+    Estimate tokens of a chat message 'content' which is either a plain string
+    or a list of typed parts ({"type": "text"} / {"type": "image_url"}).
+    """
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return estimate_text_tokens(content)
+    if isinstance(content, list):
+        total = 0
+        for part in content:
+            if not isinstance(part, dict):
+                total += estimate_text_tokens(str(part))
+            elif part.get("type") == "image_url":
+                total += image_part_tokens((part.get("image_url") or {}).get("detail", "high"))
+            else:
+                total += estimate_text_tokens(part.get("text", ""))
+        return total
+    return estimate_text_tokens(json.dumps(content, ensure_ascii=False))
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    # ~4 tokens of framing per message (role, separators)
+    return sum(4 + estimate_content_tokens(m.get("content")) for m in messages)
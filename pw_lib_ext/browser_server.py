@@ -0,0 +1,211 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Warm Browser Server
+                                                        (launched once, executors connect instead of launching)
+"""
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+
+from playwright.sync_api import Playwright, Browser, Error as PlaywrightError
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: launches are not serialised across processes there
+    fcntl = None
+
+from constant.const_config import BROWSER_SERVER_STATE_FILE
+from pw_lib_ext.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _port_open(ws_endpoint: str, timeout_s: float) -> bool:
+    parts = urlsplit(ws_endpoint)
+    try:
+        with socket.create_connection((parts.hostname or "127.0.0.1", parts.port or 80), timeout=timeout_s):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    """
+    A `playwright launch-server` process left running between runs. Its ws endpoint, pid and the
+    cold start it cost are kept in a state file so later runs (and batch workers) connect to it.
+    ensure() / launch() / stop() hold a file lock next to the state file, so parallel workers
+    that find the server unhealthy relaunch it once instead of killing each other's server.
+    """
+
+    def __init__(self, cfg: AppConfig):
+        self.cfg = cfg
+        self.server_cfg = cfg.browserServer
+        self.state_path = Path(self.server_cfg.stateFile or BROWSER_SERVER_STATE_FILE)
+        self.relaunches = 0
+        self.launched_endpoint: Optional[str] = None  # the server this instance launched, if any
+
+    # ---------- state ----------
+    def _read_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    @contextmanager
+    def _locked(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path.with_suffix(".lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _matches(self, state: Dict[str, Any]) -> bool:
+        return state.get("engine") == self.cfg.browser.engine and state.get("headless") == self.cfg.browser.headless
+
+    def healthy(self, state: Optional[Dict[str, Any]] = None) -> bool:
+        state = state if state is not None else self._read_state()
+        if not state or not self._matches(state) or not _pid_alive(int(state.get("pid", 0))):
+            return False
+        return _port_open(state["wsEndpoint"], self.server_cfg.healthTimeoutMs / 1000.0)
+
+    # ---------- lifecycle ----------
+    def launch(self) -> Dict[str, Any]:
+        with self._locked():
+            return self._launch()
+
+    def _launch(self) -> Dict[str, Any]:
+        # caller holds the lock
+        self._stop()
+        started = time.perf_counter()
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"headless": self.cfg.browser.headless}, f)
+            config_path = f.name
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        log_path = self.state_path.with_suffix(".log")
+        # own session and no pipes back to this process: the server outlives this run (and Ctrl+C of it)
+        with open(log_path, "w", encoding="utf-8") as server_log:
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "launch-server", "--browser", self.cfg.browser.engine,
+                 "--config", config_path],
+                stdout=server_log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, start_new_session=True)
+        # launch-server prints the ws endpoint once the browser is up
+        ws_endpoint = ""
+        deadline = started + self.server_cfg.launchTimeoutMs / 1000.0
+        while not ws_endpoint and proc.poll() is None and time.perf_counter() < deadline:
+            time.sleep(0.05)
+            ws_endpoint = next((l.strip() for l in log_path.read_text(encoding="utf-8", errors="replace").splitlines()
+                                if l.startswith("ws://")), "")
+        os.unlink(config_path)
+        if not ws_endpoint:
+            if proc.poll() is None:
+                os.killpg(proc.pid, 15) if hasattr(os, "killpg") else proc.kill()
+                raise RuntimeError(f"Browser server did not report an endpoint within "
+                                   f"{self.server_cfg.launchTimeoutMs} ms, see {log_path}")
+            raise RuntimeError(f"Browser server exited with code {proc.returncode} before reporting an endpoint, "
+                               f"see {log_path}")
+        state = {
+            "wsEndpoint": ws_endpoint, "pid": proc.pid, "engine": self.cfg.browser.engine,
+            "headless": self.cfg.browser.headless, "launchMs": int((time.perf_counter() - started) * 1000),
+            "launchedAt": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds"),
+        }
+        self._write_state(state)
+        self.launched_endpoint = ws_endpoint
+        logger.info(f'Browser server launched in {state["launchMs"]} ms - {ws_endpoint}')
+        return state
+
+    def ensure(self, failed_endpoint: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        (server state, reused): the running server when healthy, otherwise a newly launched one.
+        failed_endpoint: a server this process could not connect to; it is replaced unless
+        another worker already did so while this one waited for the lock.
+        """
+        with self._locked():
+            # checked under the lock: a worker that just relaunched the server leaves a healthy state
+            state = self._read_state()
+            if state and state.get("wsEndpoint") != failed_endpoint and self.healthy(state):
+                return state, True
+            if state:
+                logger.info("Browser server not healthy, relaunching")
+                self.relaunches += 1
+            return self._launch(), False
+
+    def stop(self) -> None:
+        with self._locked():
+            self._stop()
+
+    def release(self) -> None:
+        """
+        End of a run with keepAlive off: stop the server only if this instance launched it (and it is
+        still the current one). A server found running belongs to other runs / workers and is left up.
+        """
+        if not self.launched_endpoint:
+            return
+        with self._locked():
+            state = self._read_state()
+            if state and state.get("wsEndpoint") == self.launched_endpoint:
+                self._stop()
+        self.launched_endpoint = None
+
+    def _stop(self) -> None:
+        state = self._read_state()
+        # the port check guards against a recycled pid after the server died
+        if state and _pid_alive(int(state.get("pid", 0))) and _port_open(state["wsEndpoint"], 0.5):
+            try:
+                os.killpg(int(state["pid"]), 15)
+            except (OSError, AttributeError):
+                os.kill(int(state["pid"]), 15)
+        if state:
+            self.state_path.unlink(missing_ok=True)
+
+    def connect(self, pw: Playwright) -> Tuple[Browser, Dict[str, Any]]:
+        """
+        Connect to the warm server (relaunched when unhealthy or the connect fails); returns the
+        browser and {wsEndpoint, reused, connectMs, launchMs, savedMs, relaunches} for the run log.
+        """
+        state, reused = self.ensure()
+        started = time.perf_counter()
+        browser_type = getattr(pw, self.cfg.browser.engine, pw.chromium)
+        try:
+            browser = browser_type.connect(state["wsEndpoint"], slow_mo=self.cfg.browser.slowMoMs,
+                                           timeout=self.server_cfg.connectTimeoutMs)
+        except PlaywrightError as e:
+            logger.info(f'Browser server connect failed, relaunching - {str(e).splitlines()[0] if str(e) else e}')
+            state, reused = self.ensure(failed_endpoint=state["wsEndpoint"])
+            started = time.perf_counter()
+            browser = browser_type.connect(state["wsEndpoint"], slow_mo=self.cfg.browser.slowMoMs,
+                                           timeout=self.server_cfg.connectTimeoutMs)
+        connect_ms = int((time.perf_counter() - started) * 1000)
+        info = {"wsEndpoint": state["wsEndpoint"], "reused": reused, "connectMs": connect_ms,
+                "launchMs": state["launchMs"], "relaunches": self.relaunches,
+                # a reused server saves the cold launch this run would otherwise have paid
+                "savedMs": max(0, state["launchMs"] - connect_ms) if reused else 0}
+        return browser, info
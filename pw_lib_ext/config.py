@@ -2,12 +2,42 @@
 Date                    Author                          Change Details
 02-02-2026              Coforge                      Data Structure For Configuration
 """
-from dataclasses import dataclass, field
-from typing import Literal, Dict, Any
+import json
+import tomllib
+from dataclasses import dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import Literal, Dict, Any, Optional
 
 WaitType = Literal["domcontentloaded", "load", "networkIdle"]
 
 
+@dataclass
+class RoutingPolicy:
+    enabled: bool = False  # context.route every request through the policy below
+    allowHosts: list[str] = field(default_factory=list)  # always fetched (host or parent domain), checked first
+    denyHosts: list[str] = field(default_factory=lambda: [
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+        "adservice.google.com", "facebook.net", "connect.facebook.com", "hotjar.com", "segment.io", "segment.com",
+        "mixpanel.com", "clarity.ms", "newrelic.com", "nr-data.net", "optimizely.com", "demdex.net", "omtrdc.net",
+        "adobedtm.com", "bing.com", "linkedin.com", "ads.linkedin.com", "twitter.com", "criteo.com",
+        "taboola.com", "outbrain.com", "quantserve.com", "scorecardresearch.com",
+    ])
+    blockResourceTypes: list[str] = field(default_factory=lambda: ["media", "font"])
+    blockImages: bool = False  # screenshots lose images; the grounder sees broken tiles
+    blockThirdParty: bool = False  # hosts outside the sites navigated to in the main frame
+
+
+@dataclass
+class HarConfig:
+    # "record": write the run's traffic to a HAR; "replay": serve requests from a recorded HAR (route_from_har)
+    mode: Literal["off", "record", "replay"] = "off"
+    path: str = ""  # record: empty -> <run dir>/network.har.zip; replay: the HAR to serve (required)
+    content: Literal["attach", "embed", "omit"] = "attach"  # record: bodies as zip entries, inline or dropped
+    recordMode: Literal["full", "minimal"] = "minimal"  # minimal keeps what route_from_har needs
+    urlFilter: str = ""  # glob: only matching requests are recorded / served
+    notFound: Literal["abort", "fallback"] = "abort"  # replay: abort -> no network at all
+
+
 @dataclass
 class BrowserConfig:
     engine: Literal["chromium", "firefox", "webkit"] = "chromium"
@@ -17,6 +47,20 @@ class BrowserConfig:
     locale: str = "en-IN"
     timezoneId: str = "Asia/Kolkata"
     recordVideo: bool = False
+    routing: RoutingPolicy = field(default_factory=RoutingPolicy)
+    har: HarConfig = field(default_factory=HarConfig)
+    measureTraffic: bool = True  # bytes / requests per run in run_log.network (policy on or off, for comparison)
+    exactTrafficSizes: bool = False  # request.sizes() (a round trip per request); else content-length, a lower bound
+
+
+@dataclass
+class BrowserServerConfig:
+    enabled: bool = False  # connect to a warm `playwright launch-server` instead of launching per run
+    keepAlive: bool = True  # leave the server running for the next run
+    stateFile: str = ""  # empty -> constant.const_config.BROWSER_SERVER_STATE_FILE
+    launchTimeoutMs: int = 30000
+    connectTimeoutMs: int = 10000
+    healthTimeoutMs: int = 1000
 
 
 @dataclass
@@ -31,6 +75,17 @@ class ArtifactPolicy:
     captureOnAutoSuggestVisible: bool = True
     captureOnEveryStep: bool = False
     fullPageScreenshots: bool = False
+    captureElementDigest: bool = True  # compact interactive/landmark element list next to page.content()
+    backgroundWrites: bool = True  # artifact files written by a writer thread pool, flushed on close
+    writerThreads: int = 2
+    writerQueueSize: int = 64  # outstanding writes before capture blocks
+    memoryCaptures: int = 8  # recent captures kept in memory for the grounder
+    # content-addressed compressed blobs: "run" (<run>/blobs), "shared" (across runs) or "off" (dom/, screens/ files)
+    blobStore: Literal["off", "run", "shared"] = "run"
+    blobStorePath: str = ""  # shared store location, empty -> constant.const_config.SHARED_BLOB_FOLDER
+    blobCodec: Literal["auto", "zstd", "gzip", "none"] = "auto"  # auto: zstd when installed, else gzip
+    # entries are always appended to artifacts.jsonl while capturing; artifacts.json is an end-of-run snapshot
+    writeArtifactsJson: bool = True
 
 
 @dataclass
@@ -40,11 +95,68 @@ class RetryPolicy:
     handleCookieBanners: bool = True
 
 
+@dataclass
+class SettlePolicy:
+    enabled: bool = True  # False -> legacy load-state waits + fixed sleeps after each action
+    quietMs: int = 500  # settled once no DOM mutation / tracked request for this long
+    maxMs: int = 7000  # cap per step
+    pollMs: int = 50
+    observeAttributes: bool = True  # count attribute changes as DOM activity (animated carousels keep it busy)
+    # requests never waited for: analytics beacons, tag managers, long-poll / streaming channels
+    ignoreUrlPatterns: list[str] = field(default_factory=lambda: [
+        r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net", r"facebook\.(com|net)/tr",
+        r"hotjar\.", r"segment\.(io|com)", r"mixpanel\.com", r"clarity\.ms", r"newrelic\.com", r"nr-data\.net",
+        r"sentry\.io", r"optimizely\.com", r"/collect\b", r"/beacon\b", r"socket\.io", r"sockjs", r"signalr",
+        r"long-?poll", r"/poll\b", r"heartbeat", r"/events?\b.*stream",
+    ])
+
+
 @dataclass
 class SelfHealing:
     enableSemanticBias: bool = True
     preferA11y: bool = True
     preferStableText: bool = True
+    # on action failure race the chosen locator and its alternates under one shared deadline
+    # (assert_* actions are never healed: a wrong value must fail the step)
+    raceAlternates: bool = True
+    primaryTimeoutMs: int = 5000  # action timeout of the chosen locator when alternates exist
+    raceDeadlineMs: int = 5000  # shared by all alternates, not per alternate
+    pollMs: int = 100
+
+
+@dataclass
+class GroundingCacheConfig:
+    enabled: bool = True
+    path: str = ""  # empty -> constant.const_config.GROUNDING_CACHE_FILE
+    maxEntries: int = 5000
+    maxAgeDays: int = 30
+
+
+@dataclass
+class LocatorStatsConfig:
+    enabled: bool = True
+    path: str = ""  # empty -> constant.const_config.LOCATOR_STATS_FILE
+    skipAfterFailures: int = 3  # consecutive failures on a page before a locator is skipped there
+    retryAfterHours: float = 24  # a skipped locator is tried again once its last failure is this old
+    maxAgeDays: int = 90
+
+
+@dataclass
+class SpeculativeConfig:
+    enabled: bool = False  # ground intent N+1 in the background while step N executes
+    similarityThreshold: float = 0.97  # keep the speculation if the new DOM is at least this similar
+
+
+@dataclass
+class ImagePolicy:
+    optimize: bool = True  # False sends the captured PNG as is
+    # "viewport": the visible part of a full-page shot, "region": top 'regionHeightPx' band, "none": whole image
+    crop: Literal["none", "viewport", "region"] = "viewport"
+    regionHeightPx: int = 2048
+    format: Literal["png", "jpeg", "webp"] = "jpeg"
+    quality: int = 80
+    # "adaptive": low for navigation intents and small images, high otherwise
+    detail: Literal["low", "high", "auto", "adaptive"] = "adaptive"
 
 
 @dataclass
@@ -60,16 +172,116 @@ class GroundingConfig:
     waitDefaults: WaitDefaults = field(default_factory=WaitDefaults)
     retryPolicy: RetryPolicy = field(default_factory=RetryPolicy)
     selfHealing: SelfHealing = field(default_factory=SelfHealing)
+    settle: SettlePolicy = field(default_factory=SettlePolicy)
+    # "batched": one in-page probe per locator candidate; "sequential": count() + is_visible() per match
+    locatorProbe: Literal["batched", "sequential"] = "batched"
+    locatorStats: LocatorStatsConfig = field(default_factory=LocatorStatsConfig)
+    cache: GroundingCacheConfig = field(default_factory=GroundingCacheConfig)
+    speculative: SpeculativeConfig = field(default_factory=SpeculativeConfig)
+    # what describes the page to the grounder: raw (sanitized) HTML, the element digest, or both
+    domPayload: Literal["html", "digest", "both"] = "html"
+    image: ImagePolicy = field(default_factory=ImagePolicy)
+
+
+@dataclass
+class HistoryPolicy:
+    mode: Literal["unbounded", "window", "none"] = "window"
+    windowSize: int = 4  # assistant turns replayed per phase when mode == "window"
+    perPhase: bool = True  # separate histories for intent extraction and grounding
+    compactSummary: bool = True  # fold turns leaving the window into one summary message
+    summaryMaxChars: int = 2000
+
+
+@dataclass
+class CassetteConfig:
+    mode: Literal["off", "record", "replay"] = "off"
+    path: str = ""  # empty -> constant.const_config.CASSETTE_FILE
+    simulateLatency: bool = False  # replay only: sleep for the recorded latency
+    latencyScale: float = 1.0
+    fixedLatencyMs: Optional[int] = None  # replay only: overrides recorded latency when set
+    sequentialFallback: bool = True  # replay only: on hash miss serve the recording at the same position
+
+
+@dataclass
+class LLMConfig:
+    apiBase: str = ""  # empty -> app.API_BASE
+    apiVersion: str = ""  # empty -> app.API_VERSION
+    model: str = ""  # empty -> app.MODEL_NAME
+    history: HistoryPolicy = field(default_factory=HistoryPolicy)
+    cassette: CassetteConfig = field(default_factory=CassetteConfig)
+    maxPromptTokens: int = 100_000  # per grounding call; 0 -> no budget (legacy character clamp)
+    transport: Literal["sync", "async"] = "sync"  # async -> AsyncAzureOpenAI on a background event loop
+    maxConcurrency: int = 4  # async only: requests in flight at once
+    maxConnections: int = 10  # async only: shared keep-alive pool size
+    keepaliveExpirySec: float = 30.0
 
 
 @dataclass
 class LoggingConfig:
     verbosity: Literal["silent", "normal", "verbose"] = "verbose"
     saveRunLog: bool = True
+    trace: bool = True  # timing spans -> <run>/trace.json (Chrome trace events, open in Perfetto)
+
+
+@dataclass
+class BatchConfig:
+    workers: int = 0  # worker processes (one browser each); 0 -> min(cpu count, llmQuota)
+    llmQuota: int = 4  # stories allowed to talk to the LLM at once (deployment rate limit)
+    headless: bool = True
+    schemaOutput: bool = False  # per-story schema transform call (one extra LLM call per story)
 
 
 @dataclass
 class AppConfig:
     browser: BrowserConfig = field(default_factory=BrowserConfig)
+    browserServer: BrowserServerConfig = field(default_factory=BrowserServerConfig)
     grounding: GroundingConfig = field(default_factory=GroundingConfig)
+    llm: LLMConfig = field(default_factory=LLMConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    batch: BatchConfig = field(default_factory=BatchConfig)
+
+
+# ---------- configuration from files / command line ----------
+
+def apply_config_dict(obj: Any, data: Dict[str, Any], prefix: str = "") -> None:
+    """Set fields of a (nested) config dataclass from a dict with the same shape; unknown keys are errors."""
+    names = {f.name for f in fields(obj)}
+    for key, value in data.items():
+        if key not in names:
+            raise ValueError(f"Unknown configuration key: {prefix}{key}")
+        current = getattr(obj, key)
+        if is_dataclass(current):
+            if not isinstance(value, dict):
+                raise ValueError(f"Configuration key {prefix}{key} expects a table / object")
+            apply_config_dict(current, value, f"{prefix}{key}.")
+        else:
+            setattr(obj, key, value)
+
+
+def load_config_file(cfg: AppConfig, path: str) -> AppConfig:
+    """Overlay a JSON or TOML file ({"browser": {"headless": true}, ...}) onto cfg."""
+    p = Path(path)
+    if p.suffix == ".toml":
+        data = tomllib.loads(p.read_text(encoding="utf-8"))
+    else:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    apply_config_dict(cfg, data)
+    return cfg
+
+
+def set_config_value(cfg: AppConfig, assignment: str) -> None:
+    """'browser.headless=true' style override; the value is JSON when it parses, a plain string otherwise."""
+    key, sep, raw = assignment.partition("=")
+    if not sep:
+        raise ValueError(f"Expected key=value, got {assignment!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    data: Dict[str, Any] = {}
+    node = data
+    parts = key.strip().split(".")
+    for part in parts[:-1]:
+        node = node.setdefault(part, {})
+    node[parts[-1]] = value
+    apply_config_dict(cfg, data)
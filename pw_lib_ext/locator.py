@@ -4,12 +4,15 @@ Date                    Author                          Change Details
 
 
 """
+import time
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Dict, Any
 
-from playwright.sync_api import Page, Locator as PwLocator
+from playwright.sync_api import Page, Locator as PwLocator, Error as PlaywrightError
 
 from dataclass.conceptual_objects import Locator
+from pw_lib_ext.locator_stats import LocatorStatsDB, origin_of, page_fingerprint
+from telemetry.spans import span
 
 # Strategy weights for confidence calculation (heuristic)
 STRATEGY_WEIGHT = {
@@ -28,6 +31,26 @@ STRATEGY_WEIGHT = {
 }
 
 
+# One round trip per candidate: match count plus visibility / enabled state / box of the first
+# 10 matches, the same visibility rule as Locator.is_visible (non-empty box, not visibility:hidden).
+PROBE_JS = """
+(els) => {
+  const out = { count: els.length, visible: 0, enabled: null, box: null };
+  for (const el of els.slice(0, 10)) {
+    const style = getComputedStyle(el);
+    const r = el.getBoundingClientRect();
+    if (style.visibility === 'hidden' || r.width <= 0 || r.height <= 0) continue;
+    out.visible++;
+    if (out.box === null) {
+      out.box = [Math.round(r.x), Math.round(r.y), Math.round(r.width), Math.round(r.height)];
+      out.enabled = !(el.disabled || el.closest('fieldset[disabled]') || el.getAttribute('aria-disabled') === 'true');
+    }
+  }
+  return out;
+}
+"""
+
+
 @dataclass
 class ResolvedLocator:
     primary: Locator
@@ -42,11 +65,20 @@ class LocatorResolver:
     Computes a heuristic confidence score based on strategy and match quality.
     """
 
-    def __init__(self, page: Page, priority: List[str], max_alts: int, locale: str = "en-IN"):
+    def __init__(self, page: Page, priority: List[str], max_alts: int, locale: str = "en-IN",
+                 batched: bool = True, stats: Optional[LocatorStatsDB] = None):
         self.page = page
         self.priority = priority
         self.max_alts = max_alts
         self.locale = locale
+        # batched: one evaluate_all per candidate instead of count() + is_visible() per match
+        self.batched = batched
+        self.last_probes: List[Dict[str, Any]] = []  # per candidate of the last resolve()
+        # cross-run history: candidates tried most-reliable-first, repeat failures skipped
+        self.stats = stats
+        self.origin = origin_of(page.url) if stats else ""
+        self.fingerprint = page_fingerprint(page.url) if stats else ""
+        self.last_skipped: List[Locator] = []
 
     def _to_pw(self, l: Locator) -> PwLocator:
         # for strategy in self.priority:
@@ -83,7 +115,17 @@ class LocatorResolver:
             return self.page.get_by_text(l.value or "", exact=False).nth(l.index)
         return self.page.locator("html")
 
+    def _probe(self, pw_loc: PwLocator) -> Dict[str, Any]:
+        try:
+            return pw_loc.evaluate_all(PROBE_JS)
+        except Exception as e:
+            return {"count": 0, "visible": 0, "enabled": None, "box": None, "error": type(e).__name__}
+
     def _visible_unique(self, pw_loc: PwLocator) -> Tuple[bool, int]:
+        if self.batched:
+            probe = self._probe(pw_loc)
+            self.last_probes.append(probe)
+            return (probe["visible"] == 1, probe["visible"])
         try:
             count = pw_loc.count()
             visible_count = 0
@@ -101,16 +143,35 @@ class LocatorResolver:
         # return base
 
     def resolve(self, locators: List[Locator]) -> Optional[ResolvedLocator]:
+        with span("locator.resolve", candidates=len(locators)):
+            return self._resolve(locators)
+
+    def _resolve(self, locators: List[Locator]) -> Optional[ResolvedLocator]:
         alternateLocators: List[Locator] = []
         chosen_locator: Optional[Locator] = None
         chosen_pw_locator: Optional[PwLocator] = None
         conf = 0.0
         seen = 0
+        self.last_probes = []
+        self.last_skipped = []
+        if self.stats:
+            locators, self.last_skipped = self.stats.rank(self.origin, self.fingerprint, locators)
 
         for locator in locators:
+            if chosen_locator is not None:
+                # alternates are kept whether unique or not, no need to probe them
+                if seen < self.max_alts:
+                    alternateLocators.append(locator)
+                    seen += 1
+                continue
             pw = self._to_pw(locator)
-            is_unique, visible_count = self._visible_unique(pw)
-            if is_unique and chosen_locator is None:
+            probe_started = time.perf_counter()
+            with span("locator.probe", strategy=locator.strategy):
+                is_unique, visible_count = self._visible_unique(pw)
+            if self.stats:
+                self.stats.record_resolve(self.origin, self.fingerprint, locator, is_unique,
+                                          (time.perf_counter() - probe_started) * 1000)
+            if is_unique:
                 chosen_locator, chosen_pw_locator = locator, pw
                 conf = self._confidence(locator, visible_count)
             else:
@@ -122,3 +183,39 @@ class LocatorResolver:
             return ResolvedLocator(primary=chosen_locator, alternates=alternateLocators, confidence=conf,
                                    pw_locator=chosen_pw_locator)
         return None
+
+    def record_action(self, locator: Locator, ok: bool) -> None:
+        if self.stats:
+            self.stats.record_action(self.origin, self.fingerprint, locator, ok)
+
+    def race(self, locators: List[Locator], timeout_ms: int, poll_ms: int = 100) -> Optional[ResolvedLocator]:
+        """
+        Wait (at most 'timeout_ms' in total) for the first candidate that is uniquely visible and
+        enabled. The union of all candidates is awaited in one wait_for, then each is probed once.
+        """
+        if not locators:
+            return None
+        with span("locator.race", candidates=len(locators)):
+            return self._race(locators, timeout_ms, poll_ms)
+
+    def _race(self, locators: List[Locator], timeout_ms: int, poll_ms: int) -> Optional[ResolvedLocator]:
+        deadline = time.perf_counter() + timeout_ms / 1000.0
+        pws = [self._to_pw(l) for l in locators]
+        union = pws[0]
+        for pw in pws[1:]:
+            union = union.or_(pw)
+        while True:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            if remaining_ms <= 0:
+                return None
+            try:
+                union.first.wait_for(state="visible", timeout=remaining_ms)
+            except PlaywrightError:
+                return None
+            for locator, pw in zip(locators, pws):
+                probe = self._probe(pw)
+                if probe["visible"] == 1 and probe["enabled"] is not False:
+                    others = [l for l in locators if l is not locator][:self.max_alts]
+                    return ResolvedLocator(primary=locator, alternates=others,
+                                           confidence=self._confidence(locator, 1), pw_locator=pw)
+            time.sleep(poll_ms / 1000.0)
@@ -0,0 +1,189 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Cross-Run Locator Stability Database
+                                                        (origin + page fingerprint + locator -> resolve / action history)
+"""
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+from urllib.parse import urlsplit
+
+from dataclass.conceptual_objects import Locator
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8,}|[0-9a-f-]{36})$", re.I)
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.netloc else (parts.scheme or "")
+
+
+def page_fingerprint(url: str) -> str:
+    """URL path with id-like segments (numbers, hashes, uuids) folded, query and fragment dropped."""
+    path = urlsplit(url or "").path or "/"
+    return "/".join(":id" if _ID_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+
+def locator_key(locator: Locator) -> str:
+    return json.dumps([locator.strategy, locator.role, locator.name, locator.value, locator.index],
+                      ensure_ascii=False)
+
+
+class LocatorStatsDB:
+    """
+    SQLite record of how each locator behaved on a page: how often it resolved to exactly one
+    visible element, how long resolving took and whether the action on it succeeded.
+    rank() orders a step's candidates by that history; locators that failed 'skip_after'
+    times in a row are skipped (unless nothing else is left) until 'retry_after_hours' have
+    passed since their last failure, then tried once more.
+    record_*() only buffer; flush() writes the buffer in one transaction (once per step).
+    The database is shared by parallel workers: WAL mode plus a busy timeout, and a stats
+    error is logged, never raised into the step.
+    """
+
+    def __init__(self, path: str, skip_after: int = 3, max_age_days: int = 90, retry_after_hours: float = 24,
+                 busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.skip_after = skip_after
+        self.max_age_days = max_age_days
+        self.retry_after_hours = retry_after_hours
+        self.reordered = 0
+        self.skipped = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._conn = sqlite3.connect(str(self.path), timeout=busy_timeout_ms / 1000.0, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS locator_stats ("
+            " origin TEXT NOT NULL, fingerprint TEXT NOT NULL, locator_key TEXT NOT NULL,"
+            " resolves INTEGER NOT NULL DEFAULT 0, unique_resolves INTEGER NOT NULL DEFAULT 0,"
+            " resolve_ms_total REAL NOT NULL DEFAULT 0,"
+            " action_ok INTEGER NOT NULL DEFAULT 0, action_fail INTEGER NOT NULL DEFAULT 0,"
+            " consecutive_failures INTEGER NOT NULL DEFAULT 0, last_used_at REAL NOT NULL,"
+            " PRIMARY KEY (origin, fingerprint, locator_key))"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def _upsert(self, origin: str, fingerprint: str, locator: Locator, sql_set: str, args: tuple) -> None:
+        key = locator_key(locator)
+        with self._lock:
+            self._pending.append((sql_set, args + (time.time(), origin, fingerprint, key)))
+
+    def flush(self) -> None:
+        """Write the buffered records in one transaction; on error they are dropped and logged."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with self._conn:
+                    for sql_set, args in pending:
+                        now, origin, fingerprint, key = args[-4:]
+                        self._conn.execute(
+                            "INSERT OR IGNORE INTO locator_stats (origin, fingerprint, locator_key, last_used_at)"
+                            " VALUES (?, ?, ?, ?)", (origin, fingerprint, key, now))
+                        self._conn.execute(
+                            f"UPDATE locator_stats SET {sql_set}, last_used_at = ?"
+                            " WHERE origin = ? AND fingerprint = ? AND locator_key = ?", args)
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.warning(f'Locator stats write of {len(pending)} records failed: {e}')
+
+    def record_resolve(self, origin: str, fingerprint: str, locator: Locator, unique: bool, ms: float) -> None:
+        self._upsert(origin, fingerprint, locator,
+                     "resolves = resolves + 1, unique_resolves = unique_resolves + ?,"
+                     " resolve_ms_total = resolve_ms_total + ?,"
+                     " consecutive_failures = consecutive_failures + ?",
+                     (1 if unique else 0, ms, 0 if unique else 1))
+
+    def record_action(self, origin: str, fingerprint: str, locator: Locator, ok: bool) -> None:
+        if ok:
+            self._upsert(origin, fingerprint, locator,
+                         "action_ok = action_ok + 1, consecutive_failures = 0", ())
+        else:
+            self._upsert(origin, fingerprint, locator,
+                         "action_fail = action_fail + 1, consecutive_failures = consecutive_failures + 1", ())
+
+    def rank(self, origin: str, fingerprint: str, locators: List[Locator]) -> Tuple[List[Locator], List[Locator]]:
+        """(candidates in the order to try, candidates skipped for repeated failures)."""
+        if not locators:
+            return [], []
+        keys = [locator_key(l) for l in locators]
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT locator_key, resolves, unique_resolves, resolve_ms_total, action_ok, action_fail,"
+                    " consecutive_failures, last_used_at FROM locator_stats WHERE origin = ? AND fingerprint = ?"
+                    f" AND locator_key IN ({','.join('?' * len(keys))})",
+                    (origin, fingerprint, *keys)).fetchall()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f'Locator stats lookup failed, LLM order kept: {e}')
+            return list(locators), []
+        history = {r[0]: r[1:] for r in rows}
+        retry_before = time.time() - self.retry_after_hours * 3600
+
+        def sort_key(i: int) -> Tuple[float, float, int]:
+            h = history.get(keys[i])
+            if not h:
+                return (-0.25, 0.0, i)  # unknown: between proven and poor, LLM order kept
+            resolves, uniques, ms_total, ok, fail = h[:5]
+            # Laplace-smoothed reliability of resolving uniquely and acting successfully
+            reliability = ((uniques + 1) / (resolves + 2)) * ((ok + 1) / (ok + fail + 2))
+            mean_ms = ms_total / resolves if resolves else 0.0
+            return (-reliability, mean_ms, i)
+
+        order = sorted(range(len(locators)), key=sort_key)
+        # skipped while the failure streak is recent; past the retry window it gets another try
+        # (a new failure restarts the window, a success resets the streak)
+        skipped = [i for i in order if history.get(keys[i]) and history[keys[i]][5] >= self.skip_after
+                   and history[keys[i]][6] >= retry_before]
+        kept = [i for i in order if i not in skipped]
+        if not kept:  # everything failed before: try them all rather than nothing
+            kept, skipped = order, []
+        if kept != sorted(kept):
+            self.reordered += 1
+        self.skipped += len(skipped)
+        return [locators[i] for i in kept], [locators[i] for i in skipped]
+
+    def evict(self) -> int:
+        if not self.max_age_days or self.max_age_days <= 0:
+            return 0
+        try:
+            with self._lock, self._conn:
+                removed = self._conn.execute("DELETE FROM locator_stats WHERE last_used_at < ?",
+                                             (time.time() - self.max_age_days * 86400,)).rowcount
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f'Locator stats eviction failed: {e}')
+            return 0
+        if removed:
+            logger.info(f'Locator stats evicted {removed} entries')
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush()
+        try:
+            with self._lock:
+                size = self._conn.execute("SELECT COUNT(*) FROM locator_stats").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f'Locator stats count failed: {e}')
+            size = None
+        return {"path": str(self.path), "entries": size, "reorderedSteps": self.reordered,
+                "skippedLocators": self.skipped, "errors": self.errors}
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
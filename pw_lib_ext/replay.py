@@ -0,0 +1,87 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Deterministic Replay Of A Recorded Plan
+                                                        (playwright.jsonl / plan.json, no LLM unless a step fails)
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Optional, List, Dict, Any
+
+from dataclass.conceptual_objects import Step
+from pw_lib_ext.config import AppConfig
+from pw_lib_ext.runner import PWStepExecutor
+
+logger = logging.getLogger(__name__)
+
+# (runner positioned on the page where the step failed, failed step) -> re-grounded step or None
+RegroundFn = Callable[[PWStepExecutor, Step], Optional[Step]]
+
+
+class PlanReplayer:
+    """
+    Drives PWStepExecutor straight from recorded steps. Alternates are healed by the executor
+    (cfg.grounding.selfHealing); only a step that still fails is handed to 'reground', which
+    captures the live page and asks the grounder again, then the new step is executed once.
+    """
+
+    def __init__(self, cfg: AppConfig, run_dir: Path, reground: Optional[RegroundFn] = None):
+        self.cfg = cfg
+        self.run_dir = run_dir
+        self.reground = reground
+        self.runner = PWStepExecutor(cfg, run_dir)
+        self.stats: Dict[str, Any] = {"steps": 0, "passed": 0, "failed": 0, "healed": 0, "regrounded": 0,
+                                      "regroundFailed": 0, "startupMs": 0, "replayMs": 0, "regroundMs": 0}
+
+    def _last_passed(self) -> bool:
+        steps = self.runner.run_log["steps"]
+        return bool(steps) and steps[-1]["status"] == "passed"
+
+    def run(self, steps: List[Step]) -> List[Step]:
+        started = time.perf_counter()
+        self.runner.start()
+        self.stats["startupMs"] = int((time.perf_counter() - started) * 1000)
+        final_steps: List[Step] = []
+        replay_started = time.perf_counter()
+        try:
+            for step_no, step in enumerate(steps, start=1):
+                self.stats["steps"] += 1
+                # a plan saved from a healed run carries healedFrom: only a heal of this replay counts
+                step.healedFrom = None
+                executed = self.runner.execute_steps([step], step_no)
+                entry = self.runner.run_log["steps"][-1]
+                entry["replay"] = True
+                if step.healedFrom:
+                    self.stats["healed"] += 1
+                if not self._last_passed() and self.reground and step.action != "navigate":
+                    executed = self._reground(step, step_no, executed)
+                if self._last_passed():
+                    self.stats["passed"] += 1
+                else:
+                    self.stats["failed"] += 1
+                final_steps.extend(executed)
+        finally:
+            self.stats["replayMs"] = int((time.perf_counter() - replay_started) * 1000)
+            self.runner.close()
+            self.runner.run_log["replay"] = self.stats
+        return final_steps
+
+    def _reground(self, step: Step, step_no: int, executed: List[Step]) -> List[Step]:
+        msg = f'Replay step {step_no} failed, grounding it again - {step.intent}'
+        logger.info(msg)
+        print(msg)
+        started = time.perf_counter()
+        try:
+            new_step = self.reground(self.runner, step)
+        except Exception as e:
+            logger.info(f'Re-grounding step {step_no} failed - {type(e).__name__}: {e}')
+            new_step = None
+        self.stats["regroundMs"] += int((time.perf_counter() - started) * 1000)
+        if new_step is None:
+            self.stats["regroundFailed"] += 1
+            return executed
+        self.stats["regrounded"] += 1
+        executed = self.runner.execute_steps([new_step], step_no)
+        self.runner.run_log["steps"][-1]["replay"] = True
+        self.runner.run_log["steps"][-1]["regrounded"] = True
+        return executed
@@ -0,0 +1,159 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Request Routing Policy + Traffic Meter
+                                                        (block third-party / heavy resources, count hits and bytes)
+"""
+import logging
+import threading
+from typing import Dict, Any, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Route, Request, Response, Error as PlaywrightError
+
+from pw_lib_ext.config import RoutingPolicy
+
+logger = logging.getLogger(__name__)
+
+
+def _host_matches(host: str, patterns) -> Optional[str]:
+    """First pattern equal to host or a parent domain of it ('example.com' matches 'cdn.example.com')."""
+    for p in patterns:
+        p = p.lower().lstrip(".")
+        if host == p or host.endswith("." + p):
+            return p
+    return None
+
+
+def site_of(host: str) -> str:
+    """Approximate registrable domain: last two labels, three for short second levels (co.uk, com.au)."""
+    labels = host.split(".")
+    if len(labels) >= 3 and len(labels[-2]) <= 3 and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class RequestRouter:
+    """
+    context.route('**/*') handler applying a RoutingPolicy. Order: allow hosts, deny hosts,
+    resource types, third party. Navigations (documents the step asked for) are never blocked.
+    Blocked requests are aborted, everything else falls back to
+    handlers registered before this one (HAR replay) or the network.
+    Every request crosses into Python once, so keep the policy off when nothing needs blocking.
+    """
+
+    def __init__(self, policy: RoutingPolicy):
+        self.policy = policy
+        self.blocked_types: Set[str] = set(policy.blockResourceTypes) | ({"image"} if policy.blockImages else set())
+        self.first_party: Set[str] = set()
+        self.hits: Dict[str, int] = {}
+        self.allowed = 0
+        self.blocked = 0
+
+    def install(self, context: BrowserContext) -> None:
+        context.route("**/*", self._handle)
+
+    def rule_for(self, request: Request) -> Optional[str]:
+        """Name of the rule that blocks 'request' (None: allowed); records first-party sites of navigations."""
+        parts = urlsplit(request.url)
+        if parts.scheme not in ("http", "https"):
+            return None
+        host = (parts.hostname or "").lower()
+        if request.is_navigation_request():
+            try:
+                main_frame = request.frame.parent_frame is None
+            except PlaywrightError:  # service worker requests have no frame
+                main_frame = False
+            if main_frame:
+                self.first_party.add(site_of(host))
+            # a deny-listed / third-party page the test navigates to must still load
+            self.hits["navigation"] = self.hits.get("navigation", 0) + 1
+            return None
+        allowed_by = _host_matches(host, self.policy.allowHosts)
+        if allowed_by:
+            self.hits[f"allowHost:{allowed_by}"] = self.hits.get(f"allowHost:{allowed_by}", 0) + 1
+            return None
+        denied_by = _host_matches(host, self.policy.denyHosts)
+        if denied_by:
+            return f"denyHost:{denied_by}"
+        if request.resource_type in self.blocked_types:
+            return f"resourceType:{request.resource_type}"
+        if self.policy.blockThirdParty and self.first_party and site_of(host) not in self.first_party:
+            return "thirdParty"
+        return None
+
+    def _handle(self, route: Route) -> None:
+        rule = self.rule_for(route.request)
+        if rule is None:
+            self.allowed += 1
+            route.fallback()
+            return
+        self.blocked += 1
+        self.hits[rule] = self.hits.get(rule, 0) + 1
+        route.abort("blockedbyclient")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"allowed": self.allowed, "blocked": self.blocked,
+                "ruleHits": dict(sorted(self.hits.items(), key=lambda kv: -kv[1]))}
+
+
+class TrafficMeter:
+    """
+    Requests finished / failed and bytes received across a context.
+    Default: the content-length header of each response, read from the response event without a
+    driver round trip; responses without one (chunked, compressed streams) are counted in
+    'unsized' and add no bytes, so 'bytes' is a lower bound when unsized > 0.
+    exact: request.sizes() on requestfinished (headers + body, one driver round trip per request).
+    """
+
+    def __init__(self, exact_sizes: bool = False):
+        self.exact_sizes = exact_sizes
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failed = 0
+        self.unsized = 0
+        self.bytes = 0
+        self.bytes_by_type: Dict[str, int] = {}
+
+    def install(self, context: BrowserContext) -> None:
+        context.on("requestfinished", self._finished)
+        context.on("requestfailed", self._failed)
+        if not self.exact_sizes:
+            context.on("response", self._response)
+
+    def _add_bytes(self, resource_type: str, size: int) -> None:
+        with self._lock:
+            self.bytes += max(0, size)
+            self.bytes_by_type[resource_type] = self.bytes_by_type.get(resource_type, 0) + max(0, size)
+
+    def _response(self, response: Response) -> None:
+        # headers of the response event are local, unlike request.response() / request.sizes()
+        length = response.headers.get("content-length")
+        try:
+            size = int(length) if length is not None else None
+        except ValueError:
+            size = None
+        if size is None:
+            with self._lock:
+                self.unsized += 1
+            return
+        self._add_bytes(response.request.resource_type, size)
+
+    def _finished(self, request: Request) -> None:
+        with self._lock:
+            self.requests += 1
+        if not self.exact_sizes:
+            return
+        try:
+            sizes = request.sizes()
+        except PlaywrightError:
+            return
+        self._add_bytes(request.resource_type, sizes["responseHeadersSize"] + sizes["responseBodySize"])
+
+    def _failed(self, request: Request) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "failed": self.failed, "bytes": self.bytes,
+                "sizes": "exact" if self.exact_sizes else "content-length", "unsizedResponses": self.unsized,
+                "bytesByType": dict(sorted(self.bytes_by_type.items(), key=lambda kv: -kv[1]))}
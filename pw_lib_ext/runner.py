@@ -6,17 +6,30 @@ Date                    Author                          Change Details
 import json
 import re
 import time
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from playwright.sync_api import sync_playwright, Playwright, Browser, BrowserContext, Page, expect
+from playwright.sync_api import Error as PlaywrightError, Locator as PwLocator
 
 from artifacts.artifacts import ArtifactManager
+from constant.const_config import SHARED_BLOB_FOLDER, LOCATOR_STATS_FILE
 from dataclass.conceptual_objects import Step, WaitConfig, artifacts_to_json_dict, steps_to_json
-from pw_lib_ext.config import AppConfig
-from pw_lib_ext.locator import LocatorResolver
+from pw_lib_ext.browser_server import BrowserServer
+from pw_lib_ext.config import AppConfig, BrowserConfig
+from pw_lib_ext.locator import LocatorResolver, ResolvedLocator
+from pw_lib_ext.locator_stats import LocatorStatsDB
+from pw_lib_ext.routing import RequestRouter, TrafficMeter
+from pw_lib_ext.settle import SettleDetector
+from telemetry.spans import Tracer, set_tracer, span, timings_ms
+
+# actions that type into the target: not safe to repeat on a locator that already failed mid-way
+TYPING_ACTIONS = ("fill", "press_sequentially")
+# actions that check a value: a failure there is a finding, never healed onto another element
+ASSERT_ACTIONS = ("assert_text", "assert_visible", "assert_match", "assert_title")
 
 NAV_WAIT_MAP = {
     "domReady": "domcontentloaded",
@@ -25,20 +38,60 @@ NAV_WAIT_MAP = {
 }
 
 
+def launch_browser(pw: Playwright, browser_cfg: BrowserConfig) -> Browser:
+    engine = browser_cfg.engine
+    headless = browser_cfg.headless
+    slow_mo = browser_cfg.slowMoMs
+
+    if engine == "chromium":
+        return pw.chromium.launch(headless=headless, slow_mo=slow_mo)
+    elif engine == "firefox":
+        return pw.firefox.launch(headless=headless, slow_mo=slow_mo)
+    elif engine == "webkit":
+        return pw.webkit.launch(headless=headless, slow_mo=slow_mo)
+    return pw.chromium.launch(headless=headless, slow_mo=slow_mo)
+
+
 class PWStepExecutor:
-    def __init__(self, cfg: AppConfig, run_dir: Path):
+    def __init__(self, cfg: AppConfig, run_dir: Path, browser: Optional[Browser] = None):
+        """browser: an already launched browser shared with other executors; only a context is created / closed."""
         self.cfg = cfg
+        self._shared_browser = browser
+        self.browser_server = BrowserServer(cfg) if cfg.browserServer.enabled and browser is None else None
         self.run_dir = run_dir
         self.run_dir.mkdir(parents=True, exist_ok=True)
-        self.artifacts = ArtifactManager(run_dir, full_page=cfg.grounding.artifactPolicy.fullPageScreenshots)
+        policy = cfg.grounding.artifactPolicy
+        blob_dir = None
+        if policy.blobStore == "run":
+            blob_dir = run_dir / "blobs"
+        elif policy.blobStore == "shared":
+            blob_dir = Path(policy.blobStorePath or SHARED_BLOB_FOLDER)
+        self.artifacts = ArtifactManager(run_dir, full_page=policy.fullPageScreenshots,
+                                         capture_digest=policy.captureElementDigest,
+                                         background_writes=policy.backgroundWrites,
+                                         writer_threads=policy.writerThreads,
+                                         writer_queue=policy.writerQueueSize,
+                                         memory_captures=policy.memoryCaptures,
+                                         blob_dir=blob_dir, blob_codec=policy.blobCodec)
         self._pw: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._ctx: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self.settle = SettleDetector(cfg.grounding.settle) if cfg.grounding.settle.enabled else None
+        self.router = RequestRouter(cfg.browser.routing) if cfg.browser.routing.enabled else None
+        self.traffic = TrafficMeter(cfg.browser.exactTrafficSizes) if cfg.browser.measureTraffic else None
+        self._goto_ms: List[Dict[str, Any]] = []
+        # current tracer of the process: grounder, resolver and artifact spans land in this run's trace
+        self.tracer = set_tracer(Tracer(enabled=cfg.logging.trace))
+        stats_cfg = cfg.grounding.locatorStats
+        self.locator_stats = LocatorStatsDB(stats_cfg.path or LOCATOR_STATS_FILE,
+                                            skip_after=stats_cfg.skipAfterFailures,
+                                            retry_after_hours=stats_cfg.retryAfterHours,
+                                            max_age_days=stats_cfg.maxAgeDays) if stats_cfg.enabled else None
         self.run_log: Dict[str, Any] = {
             "meta": {
                 "startedAt": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds") + "Z",
-                "browser": cfg.browser.__dict__,
+                "browser": asdict(cfg.browser),
                 "locale": cfg.browser.locale,
             },
             "steps": [],
@@ -46,36 +99,84 @@ class PWStepExecutor:
 
     # ---------- lifecycle ----------
     def start(self):
-        self._pw = sync_playwright().start()
-        engine = self.cfg.browser.engine
-        headless = self.cfg.browser.headless
-        slow_mo = self.cfg.browser.slowMoMs
-
-        if engine == "chromium":
-            self._browser = self._pw.chromium.launch(headless=headless, slow_mo=slow_mo)
-        elif engine == "firefox":
-            self._browser = self._pw.firefox.launch(headless=headless, slow_mo=slow_mo)
-        elif engine == "webkit":
-            self._browser = self._pw.webkit.launch(headless=headless, slow_mo=slow_mo)
+        with span("browser.start"):
+            self._start()
+
+    def _start(self):
+        if self._shared_browser:
+            self._browser = self._shared_browser
+        elif self.browser_server:
+            self._pw = sync_playwright().start()
+            self._browser, self.run_log["browserServer"] = self.browser_server.connect(self._pw)
         else:
-            self._browser = self._pw.chromium.launch(headless=headless, slow_mo=slow_mo)
+            self._pw = sync_playwright().start()
+            started = time.perf_counter()
+            self._browser = launch_browser(self._pw, self.cfg.browser)
+            self.run_log["meta"]["browserLaunchMs"] = int((time.perf_counter() - started) * 1000)
+
+        har = self.cfg.browser.har
+        har_options: Dict[str, Any] = {}
+        if har.mode == "record":
+            har_path = Path(har.path) if har.path else self.run_dir / "network.har.zip"
+            har_options = {"record_har_path": str(har_path), "record_har_content": har.content,
+                           "record_har_mode": har.recordMode, "record_har_url_filter": har.urlFilter or None}
+            self.run_log["har"] = {"mode": "record", "path": str(har_path)}
 
         self._ctx = self._browser.new_context(
             locale=self.cfg.browser.locale,
             timezone_id=self.cfg.browser.timezoneId,
             viewport=self.cfg.browser.viewport,
-            record_video_dir=str(self.run_dir / "videos") if self.cfg.browser.recordVideo else None
+            record_video_dir=str(self.run_dir / "videos") if self.cfg.browser.recordVideo else None,
+            **har_options
         )
+        if har.mode == "replay":
+            if not har.path or not Path(har.path).exists():
+                raise FileNotFoundError(f"HAR replay needs a recorded HAR, not found - {har.path!r}")
+            # registered first: the routing policy (registered later) runs before it and falls back to it
+            self._ctx.route_from_har(har.path, not_found=har.notFound, url=har.urlFilter or None)
+            self.run_log["har"] = {"mode": "replay", "path": har.path, "notFound": har.notFound}
+        if self.settle:
+            self.settle.install(self._ctx)
+        if self.router:
+            self.router.install(self._ctx)
+        if self.traffic:
+            self.traffic.install(self._ctx)
         self._page = self._ctx.new_page()
 
     def close(self):
         self.run_log["endedAt"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(timespec="seconds") + "Z"
         if self._page: self._page.close()
         if self._ctx: self._ctx.close()
-        if self._browser: self._browser.close()
+        # a browser connected to the warm server only disconnects (its contexts are closed)
+        if self._browser and not self._shared_browser: self._browser.close()
         if self._pw: self._pw.stop()
+        if self.browser_server and not self.cfg.browserServer.keepAlive:
+            # only a server this run launched; other runs / workers may be connected to a found one
+            self.browser_server.release()
+        # pending artifact files must be on disk before outputs referencing them are saved
+        self.artifacts.close()
+        self.run_log["artifactWriter"] = dict(self.artifacts.writer.stats)
+        if self.artifacts.blobs:
+            self.run_log["artifactStore"] = dict(self.artifacts.blobs.stats)
+        if self.router or self.traffic:
+            self.run_log["network"] = self.network_stats()
+        if self.locator_stats:
+            self.run_log["locatorStats"] = self.locator_stats.stats()
+            self.locator_stats.close()
+            self.locator_stats = None
 
     # ---------- utilities ----------
+    def network_stats(self) -> Dict[str, Any]:
+        """Page loads and traffic of the run; compare runs with routing on / off."""
+        stats: Dict[str, Any] = {"routing": self.cfg.browser.routing.enabled,
+                                 "pageLoads": self._goto_ms,
+                                 "pageLoadMsTotal": sum(p["ms"] for p in self._goto_ms)}
+        if self.traffic:
+            stats.update(self.traffic.stats())
+        if self.router:
+            stats.update(self.router.stats())
+        return stats
+
     def _log_step(self, entry: Dict[str, Any]):
         if self.cfg.logging.verbosity == "verbose":
             notes_found: str = entry.get("status")
@@ -105,12 +206,40 @@ class PWStepExecutor:
             return self.artifacts.capture_dom_and_screenshot(self._page)
         return self.artifacts.latest_ids()
 
+    def capture_now(self) -> Tuple[int, int]:
+        """Capture DOM + screenshot of the current page regardless of the artifact policy."""
+        assert self._page
+        return self.artifacts.capture_dom_and_screenshot(self._page)
+
     def _apply_wait(self, kind: str, wait_cfg: WaitConfig):
         assert self._page
         if kind == "navigate":
             self._page.wait_for_load_state(NAV_WAIT_MAP.get(wait_cfg.type, "domcontentloaded"),
                                            timeout=wait_cfg.timeoutMs)
 
+    def _wait_for_settle(self, log_entry: Dict[str, Any], after_fill: bool = False) -> None:
+        """Wait until the page settles after an action (span 'settle')."""
+        with span("settle", legacy=not self.settle):
+            self._settle(log_entry, after_fill)
+
+    def _settle(self, log_entry: Dict[str, Any], after_fill: bool) -> None:
+        assert self._page
+        if not self.settle:
+            # legacy fixed waits
+            if after_fill:
+                time.sleep(5)
+            self._page.wait_for_load_state()
+            self._page.wait_for_load_state("domcontentloaded")
+            try:  # networkidle may throw error, its discouraged in documentation
+                self._page.wait_for_load_state("networkidle")
+            except Exception:
+                pass
+            time.sleep(2)  # give some extra time for page to settle down
+            return
+        result = self.settle.wait(self._page)
+        if result["timedOut"]:
+            log_entry["settleTimedOut"] = True
+
     def _autosuggest_appeared(self) -> bool:
         assert self._page
         try:
@@ -124,6 +253,127 @@ class PWStepExecutor:
             return False
         return False
 
+    def _perform_action(self, step: Step, pw_loc: PwLocator, timeout_ms: int) -> None:
+        assert self._page
+        if step.action == "click":
+            pw_loc.click(timeout=timeout_ms)
+        elif step.action == "press_sequentially":
+            if step.input is None:
+                raise ValueError("Press_sequentially action requires 'input'.")
+            pw_loc.click(timeout=timeout_ms)
+            pw_loc.press_sequentially(step.input, delay=80, timeout=timeout_ms)
+        elif step.action == "fill":
+            if step.input is None:
+                raise ValueError("Fill action requires 'input'.")
+            pw_loc.click(timeout=timeout_ms)
+            # pw_loc.fill(step.input, timeout=timeout_ms)
+            pw_loc.press_sequentially(step.input, delay=80, timeout=timeout_ms)
+        elif step.action == "press":
+            if step.input is None:
+                raise ValueError("Press action requires 'input' (key).")
+            pw_loc.press(step.input, timeout=timeout_ms)
+        elif step.action == "select":
+            pw_loc.click(timeout=timeout_ms)
+        elif step.action == "check":
+            pw_loc.check(timeout=timeout_ms)
+        elif step.action == "uncheck":
+            pw_loc.uncheck(timeout=timeout_ms)
+        elif step.action == "hover":
+            pw_loc.hover(timeout=timeout_ms)
+        elif step.action == "scroll":
+            self._page.evaluate("el => el.scrollIntoView({block: 'center', behavior: 'instant'})", pw_loc)
+        elif step.action == "waitFor":
+            pw_loc.wait_for(state="visible", timeout=timeout_ms)
+        elif step.action == "assert_visible":
+            expect(pw_loc).to_be_visible(timeout=timeout_ms)
+        elif step.action == "assert_text":
+            if step.expectedText is None:
+                raise ValueError("assert_text requires 'expectedText'.")
+            expect(pw_loc).to_have_text(step.expectedText, timeout=timeout_ms)
+            if self.cfg.grounding.assertionAlsoCheckVisible:
+                expect(pw_loc).to_be_visible(timeout=timeout_ms)
+        elif step.action == "assert_match":
+            if step.pattern is None:
+                raise ValueError("assert_match requires 'pattern'.")
+            pattern = step.pattern
+            flags = 0
+            if pattern.startswith("/") and pattern.endswith("/i"):
+                core = pattern[1:-2]
+                flags = re.I
+            elif pattern.startswith("/") and pattern.endswith("/"):
+                core = pattern[1:-1]
+            else:
+                core = pattern
+            regex = re.compile(core, flags)
+            expect(pw_loc).to_have_text(regex, timeout=timeout_ms)
+            if self.cfg.grounding.assertionAlsoCheckVisible:
+                expect(pw_loc).to_be_visible(timeout=timeout_ms)
+        elif step.action == "assert_title":
+            if step.input is not None:
+                expect(self._page).to_have_title(step.input)
+            else:
+                raise ValueError('Input Is Not Provided')
+        elif step.action == "custom":
+            raise NotImplementedError(f"Unsupported action: {step.action}")
+        else:
+            raise NotImplementedError(f"Unsupported action: {step.action}")
+
+    # ---------- self-healing ----------
+    def _healing_enabled(self, step: Step) -> bool:
+        return (self.cfg.grounding.selfHealing.raceAlternates and bool(step.altLocators)
+                and step.action not in ASSERT_ACTIONS)
+
+    def _heal_and_perform(self, step: Step, resolver: LocatorResolver, resolved: ResolvedLocator,
+                          primary_error: Exception, log_entry: Dict[str, Any]) -> None:
+        """
+        The chosen locator failed: race its alternates under one shared deadline, whichever becomes
+        actionable first is used. The failed primary is raced last (only when no alternate is
+        actionable) and not at all for typing actions, which may have half-typed into it. Each
+        attempt gets a bounded share of the deadline so a hanging candidate cannot use it all.
+        A failing winner is dropped and the race continues. The winning locator becomes
+        step.locator (original kept in healedFrom).
+        """
+        policy = self.cfg.grounding.selfHealing
+        started = time.perf_counter()
+        deadline = started + policy.raceDeadlineMs / 1000.0
+        candidates = list(step.altLocators)
+        if step.action not in TYPING_ACTIONS:
+            candidates.append(resolved.primary)
+        healing: Dict[str, Any] = {"primaryError": str(primary_error).splitlines()[0] if str(primary_error) else
+                                   type(primary_error).__name__, "raced": len(candidates), "attempts": []}
+        log_entry["healing"] = healing
+        attempt_ms = max(policy.pollMs, policy.raceDeadlineMs // max(1, len(candidates)))
+        last_error: Exception = primary_error
+        while candidates:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            if remaining_ms <= 0:
+                break
+            winner = resolver.race(candidates, timeout_ms=remaining_ms, poll_ms=policy.pollMs)
+            if winner is None:
+                break
+            remaining_ms = max(1, int((deadline - time.perf_counter()) * 1000))
+            try:
+                if step.action in TYPING_ACTIONS:
+                    # the primary may have typed part of the input into the same field
+                    winner.pw_locator.fill("", timeout=min(remaining_ms, attempt_ms))
+                self._perform_action(step, winner.pw_locator, min(remaining_ms, attempt_ms))
+            except PlaywrightError as e:
+                resolver.record_action(winner.primary, ok=False)
+                healing["attempts"].append({"locator": winner.primary.__dict__, "error": type(e).__name__})
+                candidates = [c for c in candidates if c is not winner.primary]
+                last_error = e
+                continue
+            healing["attempts"].append({"locator": winner.primary.__dict__, "error": None})
+            healing["winner"] = winner.primary.__dict__
+            healing["elapsedMs"] = int((time.perf_counter() - started) * 1000)
+            if winner.primary is not resolved.primary:
+                step.healedFrom = resolved.primary
+                step.altLocators = [c for c in [resolved.primary] + step.altLocators if c is not winner.primary]
+                step.locator = winner.primary
+            return
+        healing["elapsedMs"] = int((time.perf_counter() - started) * 1000)
+        raise last_error
+
     # ---------- main execution ----------
     def execute_steps(self, steps: List[Step], step_no: int = 1) -> List[Step]:
         assert self._page
@@ -140,146 +390,111 @@ class PWStepExecutor:
                 "wait": step.wait.__dict__, "artifacts": {}, "timingsMs": {}, "status": "pending", "notes": ""
             }
 
-            try:
-                resolver = LocatorResolver(
-                    page=self._page,
-                    priority=self.cfg.grounding.locatorPriority,
-                    max_alts=self.cfg.grounding.maxAltLocatorsPerStep,
-                    locale=self.cfg.browser.locale,
-                )
-
-                # navigate
-                if step.action == "navigate":
-                    if not step.input:
-                        raise ValueError("Navigate action requires 'input' URL.")
-                    self._page.goto(step.input, wait_until=NAV_WAIT_MAP.get(step.wait.type, "domcontentloaded"),
-                                    timeout=step.wait.timeoutMs)
-                    dom_id, sc_id = self._capture_artifacts_if_needed(url_before)
+            step_started = time.perf_counter()
+            with self.tracer.collect() as timings, span("step", index=step_no, action=step.action):
+                try:
+                    resolver = LocatorResolver(
+                        page=self._page,
+                        priority=self.cfg.grounding.locatorPriority,
+                        max_alts=self.cfg.grounding.maxAltLocatorsPerStep,
+                        locale=self.cfg.browser.locale,
+                        batched=self.cfg.grounding.locatorProbe == "batched",
+                        stats=self.locator_stats,
+                    )
+
+                    # navigate
+                    if step.action == "navigate":
+                        if not step.input:
+                            raise ValueError("Navigate action requires 'input' URL.")
+                        goto_started = time.perf_counter()
+                        with span("goto", url=step.input):
+                            self._page.goto(step.input, wait_until=NAV_WAIT_MAP.get(step.wait.type, "domcontentloaded"),
+                                            timeout=step.wait.timeoutMs)
+                        self._goto_ms.append({"url": step.input, "ms": int((time.perf_counter() - goto_started) * 1000)})
+                        if self.settle:
+                            self._wait_for_settle(log_entry)
+                        dom_id, sc_id = self._capture_artifacts_if_needed(url_before)
+                        step.domReference, step.screenReference = dom_id, sc_id
+                        log_entry["status"] = "passed"
+                        log_entry["urlAfter"] = self._page.url
+                        log_entry["artifacts"] = {"domReference": dom_id, "screenReference": sc_id}
+                        final_steps.append(step)
+                        self._log_step(log_entry)
+                        continue
+
+                    # Resolve candidates
+                    candidates = [step.locator] + step.altLocators
+                    for c in candidates:
+                        log_entry["locatorTried"].append(c.__dict__)
+
+                    resolved = resolver.resolve(candidates)
+                    if resolver.last_probes:
+                        log_entry["locatorProbes"] = resolver.last_probes
+                    if resolver.last_skipped:
+                        log_entry["locatorsSkipped"] = [l.__dict__ for l in resolver.last_skipped]
+                    if not resolved:
+                        raise RuntimeError("Unable to resolve a unique visible locator.")
+
+                    pw_loc = resolved.pw_locator
+                    # LLM Based confidence is used, Locator based weightage is not used
+                    # step.confidence = resolved.confidence
+                    step.altLocators = resolved.alternates
+
+                    # Execute
+                    if not self.cfg.browser.headless:
+                        # pw_loc.scroll_into_view_if_needed()
+                        pw_loc.highlight()
+
+                    timeout_ms = step.wait.timeoutMs
+                    if self._healing_enabled(step):
+                        # leave part of the step timeout for racing the alternates
+                        timeout_ms = min(timeout_ms, self.cfg.grounding.selfHealing.primaryTimeoutMs)
+                    try:
+                        with span("action", action=step.action):
+                            self._perform_action(step, pw_loc, timeout_ms)
+                    except PlaywrightError as primary_error:
+                        # not found / not actionable / timed out; assertion failures (wrong value) are not healed
+                        resolver.record_action(resolved.primary, ok=False)
+                        if not self._healing_enabled(step):
+                            raise
+                        with span("heal"):
+                            self._heal_and_perform(step, resolver, resolved, primary_error, log_entry)
+                    resolver.record_action(step.locator if step.healedFrom else resolved.primary, ok=True)
+
+                    # settle first: autosuggest lists render once their request completes
+                    self._wait_for_settle(log_entry, after_fill=step.action == "fill")
+
+                    # Artifacts on autosuggest and URL change
+                    autosuggest_flag = False
+                    if self.cfg.grounding.artifactPolicy.captureOnAutoSuggestVisible:
+                        with span("autosuggest.check"):
+                            autosuggest_flag = self._autosuggest_appeared()  # if listbox or option are present which are event driven loaded
+                    # if configuration set for artifacts (DOM/Screenshot) to be captured, it will be captured
+                    dom_id, sc_id = self._capture_artifacts_if_needed(url_before, autosuggest_visible=autosuggest_flag)
                     step.domReference, step.screenReference = dom_id, sc_id
+
+                    # Log
+                    log_entry["chosenLocator"] = step.locator.__dict__
+                    log_entry["altLocatorsUsed"] = len(step.altLocators) > 0
+                    log_entry["confidence"] = step.confidence
                     log_entry["status"] = "passed"
                     log_entry["urlAfter"] = self._page.url
                     log_entry["artifacts"] = {"domReference": dom_id, "screenReference": sc_id}
+
                     final_steps.append(step)
                     self._log_step(log_entry)
-                    continue
-
-                # Resolve candidates
-                candidates = [step.locator] + step.altLocators
-                for c in candidates:
-                    log_entry["locatorTried"].append(c.__dict__)
-
-                resolved = resolver.resolve(candidates)
-                if not resolved:
-                    raise RuntimeError("Unable to resolve a unique visible locator.")
-
-                pw_loc = resolved.pw_locator
-                # LLM Based confidence is used, Locator based weightage is not used
-                # step.confidence = resolved.confidence
-                step.altLocators = resolved.alternates
-
-                # Execute
-                if not self.cfg.browser.headless:
-                    # pw_loc.scroll_into_view_if_needed()
-                    pw_loc.highlight()
-
-                if step.action == "click":
-                    pw_loc.click(timeout=step.wait.timeoutMs)
-                elif step.action == "press_sequentially":
-                    if step.input is None:
-                        raise ValueError("Press_sequentially action requires 'input'.")
-                    pw_loc.click(timeout=step.wait.timeoutMs)
-                    pw_loc.press_sequentially(step.input, delay=80, timeout=step.wait.timeoutMs)
-                elif step.action == "fill":
-                    if step.input is None:
-                        raise ValueError("Fill action requires 'input'.")
-                    pw_loc.click(timeout=step.wait.timeoutMs)
-                    # pw_loc.fill(step.input, timeout=step.wait.timeoutMs)
-                    pw_loc.press_sequentially(step.input, delay=80, timeout=step.wait.timeoutMs)
-                    time.sleep(5)
-                elif step.action == "press":
-                    if step.input is None:
-                        raise ValueError("Press action requires 'input' (key).")
-                    pw_loc.press(step.input, timeout=step.wait.timeoutMs)
-                elif step.action == "select":
-                    pw_loc.click(timeout=step.wait.timeoutMs)
-                elif step.action == "check":
-                    pw_loc.check(timeout=step.wait.timeoutMs)
-                elif step.action == "uncheck":
-                    pw_loc.uncheck(timeout=step.wait.timeoutMs)
-                elif step.action == "hover":
-                    pw_loc.hover(timeout=step.wait.timeoutMs)
-                elif step.action == "scroll":
-                    self._page.evaluate("el => el.scrollIntoView({block: 'center', behavior: 'instant'})", pw_loc)
-                elif step.action == "waitFor":
-                    pw_loc.wait_for(state="visible", timeout=step.wait.timeoutMs)
-                elif step.action == "assert_visible":
-                    expect(pw_loc).to_be_visible(timeout=step.wait.timeoutMs)
-                elif step.action == "assert_text":
-                    if step.expectedText is None:
-                        raise ValueError("assert_text requires 'expectedText'.")
-                    expect(pw_loc).to_have_text(step.expectedText, timeout=step.wait.timeoutMs)
-                    if self.cfg.grounding.assertionAlsoCheckVisible:
-                        expect(pw_loc).to_be_visible(timeout=step.wait.timeoutMs)
-                elif step.action == "assert_match":
-                    if step.pattern is None:
-                        raise ValueError("assert_match requires 'pattern'.")
-                    pattern = step.pattern
-                    flags = 0
-                    if pattern.startswith("/") and pattern.endswith("/i"):
-                        core = pattern[1:-2]
-                        flags = re.I
-                    elif pattern.startswith("/") and pattern.endswith("/"):
-                        core = pattern[1:-1]
-                    else:
-                        core = pattern
-                    regex = re.compile(core, flags)
-                    expect(pw_loc).to_have_text(regex, timeout=step.wait.timeoutMs)
-                    if self.cfg.grounding.assertionAlsoCheckVisible:
-                        expect(pw_loc).to_be_visible(timeout=step.wait.timeoutMs)
-                elif step.action == "assert_title":
-                    if step.input is not None:
-                        expect(self._page).to_have_title(step.input)
-                    else:
-                        raise ValueError('Input Is Not Provided')
-                elif step.action == "custom":
-                    raise NotImplementedError(f"Unsupported action: {step.action}")
-                else:
-                    raise NotImplementedError(f"Unsupported action: {step.action}")
-
-                # Artifacts on autosuggest and URL change
-                autosuggest_flag = False
-                if self.cfg.grounding.artifactPolicy.captureOnAutoSuggestVisible:
-                    autosuggest_flag = self._autosuggest_appeared()  # if listbox or option are present which are event driven loaded
-
-                self._page.wait_for_load_state()
-                self._page.wait_for_load_state("domcontentloaded")
-                try:  # networkidle may throw error, its discouraged in documentation
-                    self._page.wait_for_load_state("networkidle")
-                except Exception:
-                    pass
-
-                time.sleep(2)  # give some extra time for page to settle down
-                # if configuration set for artifacts (DOM/Screenshot) to be captured, it will be captured
-                dom_id, sc_id = self._capture_artifacts_if_needed(url_before, autosuggest_visible=autosuggest_flag)
-                step.domReference, step.screenReference = dom_id, sc_id
-
-                # Log
-                log_entry["chosenLocator"] = step.locator.__dict__
-                log_entry["altLocatorsUsed"] = len(step.altLocators) > 0
-                log_entry["confidence"] = step.confidence
-                log_entry["status"] = "passed"
-                log_entry["urlAfter"] = self._page.url
-                log_entry["artifacts"] = {"domReference": dom_id, "screenReference": sc_id}
-
-                final_steps.append(step)
-                self._log_step(log_entry)
-
-            except Exception as e:
-                log_entry["status"] = "failed"
-                log_entry["notes"] = str(e)
-                log_entry["urlAfter"] = self._page.url
-                self._log_step(log_entry)
-                final_steps.append(step)
+
+                except Exception as e:
+                    log_entry["status"] = "failed"
+                    log_entry["notes"] = str(e)
+                    log_entry["urlAfter"] = self._page.url
+                    self._log_step(log_entry)
+                    final_steps.append(step)
+                finally:
+                    if self.locator_stats:
+                        self.locator_stats.flush()  # one stats write per step, not per probe
+                    log_entry["timingsMs"] = timings_ms(timings)
+                    log_entry["timingsMs"]["total"] = int((time.perf_counter() - step_started) * 1000)
 
         return final_steps
 
@@ -293,8 +508,13 @@ class PWStepExecutor:
         plan_json = steps_to_json(steps)
         plan_path.write_text(plan_json, encoding="utf-8")
 
-        artifacts_json = artifacts_to_json_dict(self.artifacts.map)
-        self._save_json(artifacts_json, artifacts_path)
+        if self.cfg.grounding.artifactPolicy.writeArtifactsJson:
+            artifacts_json = artifacts_to_json_dict(self.artifacts.map)
+            self._save_json(artifacts_json, artifacts_path)
+
+        if self.tracer.enabled:
+            self.tracer.write_chrome_trace(self.run_dir / "trace.json")
+            self.run_log["trace"] = {"file": "trace.json", "spans": self.tracer.summary()}
 
         if self.cfg.logging.saveRunLog:
             self._save_json(self.run_log, runlog_path)
@@ -0,0 +1,108 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Page Settle Detector
+                                                        (DOM quiescence + in-flight fetch/XHR, replaces fixed sleeps)
+"""
+import itertools
+import json
+import time
+from typing import Dict, Any, Optional
+
+from playwright.sync_api import BrowserContext, Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from pw_lib_ext.config import SettlePolicy
+
+# Installed as a context init script: runs before page scripts on every document.
+# Counts fetch/XHR in flight (ignoring analytics / long-poll URLs) and the time of the last DOM mutation.
+_SETTLE_INIT_JS = r"""
+(ignore) => {
+  if (window.__pwSettle) return;
+  const state = window.__pwSettle = { inflight: 0, lastChange: performance.now() };
+  const patterns = ignore.map(p => { try { return new RegExp(p, 'i'); } catch (e) { return null; } }).filter(Boolean);
+  const tracked = (url) => !patterns.some(re => re.test(String(url || '')));
+  const begin = () => { state.inflight++; state.lastChange = performance.now(); };
+  const end = () => { state.inflight = Math.max(0, state.inflight - 1); state.lastChange = performance.now(); };
+
+  const origFetch = window.fetch;
+  if (origFetch) {
+    window.fetch = function (input, init) {
+      const url = (input && input.url) || input;
+      if (!tracked(url)) return origFetch.apply(this, arguments);
+      begin();
+      return origFetch.apply(this, arguments).finally(end);
+    };
+  }
+  const origOpen = XMLHttpRequest.prototype.open, origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) { this.__pwTracked = tracked(url); return origOpen.apply(this, arguments); };
+  XMLHttpRequest.prototype.send = function () {
+    if (this.__pwTracked) { begin(); this.addEventListener('loadend', end, { once: true }); }
+    return origSend.apply(this, arguments);
+  };
+
+  const observe = () => new MutationObserver(() => { state.lastChange = performance.now(); })
+    .observe(document, { subtree: true, childList: true, attributes: OBSERVE_ATTRIBUTES, characterData: true });
+  if (document.documentElement) observe(); else document.addEventListener('DOMContentLoaded', observe, { once: true });
+}
+"""
+
+# The quiet window restarts when a new wait (token) begins, so effects the action schedules
+# shortly after it returns (debounced autosuggest, setTimeout) are still waited for.
+_SETTLED_JS = r"""
+(a) => {
+  if (document.readyState === 'loading') return false;
+  const s = window.__pwSettle;
+  if (!s) return true;  // detector not installed in this document (about:blank, data: URLs)
+  if (s.token !== a.token) { s.token = a.token; s.lastChange = performance.now(); }
+  return s.inflight === 0 && performance.now() - s.lastChange >= a.quietMs;
+}
+"""
+
+
+def build_settle_script(policy: SettlePolicy) -> str:
+    js = _SETTLE_INIT_JS.replace("OBSERVE_ATTRIBUTES", "true" if policy.observeAttributes else "false")
+    return f"({js})({json.dumps(list(policy.ignoreUrlPatterns))});"
+
+
+class SettleDetector:
+    """
+    Waits until the page is settled: document parsed, no tracked fetch/XHR in flight and no DOM
+    mutation for 'quietMs', capped at 'maxMs'. A navigation during the wait restarts the check in
+    the new document within the same cap.
+    """
+
+    def __init__(self, policy: SettlePolicy):
+        self.policy = policy
+        self._tokens = itertools.count(1)
+
+    def install(self, context: BrowserContext) -> None:
+        context.add_init_script(script=build_settle_script(self.policy))
+
+    def wait(self, page: Page) -> Dict[str, Any]:
+        """Block until settled or the cap; returns {'ms': elapsed, 'timedOut': bool}."""
+        started = time.perf_counter()
+        deadline = started + self.policy.maxMs / 1000.0
+        timed_out = False
+        error: Optional[str] = None
+        arg = {"quietMs": self.policy.quietMs, "token": next(self._tokens)}
+        while True:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            if remaining_ms <= 0:
+                timed_out = True
+                break
+            try:
+                page.wait_for_function(_SETTLED_JS, arg=arg, polling=self.policy.pollMs, timeout=remaining_ms)
+                break
+            except PlaywrightTimeoutError:
+                timed_out = True
+                break
+            except PlaywrightError as e:
+                error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                if page.is_closed():
+                    break
+                # execution context destroyed by a navigation: check again in the new document
+                time.sleep(self.policy.pollMs / 1000.0)
+        elapsed = int((time.perf_counter() - started) * 1000)
+        result: Dict[str, Any] = {"ms": elapsed, "timedOut": timed_out}
+        if error:
+            result["retriedAfter"] = error
+        return result
@@ -5,7 +5,7 @@ Date                    Author                          Change Details
 import json
 from pathlib import Path
 from typing import List, Dict, Any
-from dataclass.conceptual_objects import Step, Locator
+from dataclass.conceptual_objects import Step, Locator, WaitConfig, json_str_to_step
 
 
 def _locator_to_playwright(locator: Locator) -> Dict[str, Any]:
@@ -47,6 +47,68 @@ def _locator_to_playwright(locator: Locator) -> Dict[str, Any]:
     return {"method": "locator", "args": ["html"]}
 
 
+def _playwright_to_locator(entry: Dict[str, Any]) -> Locator:
+    """Inverse of _locator_to_playwright, used when a playwright.jsonl plan is replayed."""
+    method = entry.get("method")
+    args = entry.get("args") or [""]
+    first = args[0] if args else ""
+    opts = args[1] if len(args) > 1 and isinstance(args[1], dict) else {}
+    index = entry.get("index", 0)
+    if method in ("id", "name", "class"):
+        return Locator(strategy=method, value=first, index=index)
+    if method == "getByRole":
+        return Locator(strategy="role", role=first or None, name=opts.get("name"), index=index)
+    if method == "getByLabel":
+        return Locator(strategy="label", value=first, index=index)
+    if method == "getByTestId":
+        return Locator(strategy="dataTestId", value=first, index=index)
+    if method == "getByText":
+        return Locator(strategy="text" if opts.get("exact", True) else "relative", value=first, index=index)
+    if method == "getByPlaceholder":
+        return Locator(strategy="placeholder", value=first, index=index)
+    if isinstance(first, str) and first.startswith("xpath="):
+        return Locator(strategy="xpath", value=first[len("xpath="):], index=index)
+    if isinstance(first, str) and first.startswith("[aria-label='") and first.endswith("']"):
+        return Locator(strategy="aria", value=first[len("[aria-label='"):-2], index=index)
+    return Locator(strategy="css", value=first or "html", index=index)
+
+
+def playwright_jsonl_to_steps(path: Path) -> List[Step]:
+    """Read a plan written by steps_to_playwright_jsonl back into Steps."""
+    steps: List[Step] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        wait = WaitConfig(**entry["wait"]) if entry.get("wait") else WaitConfig()
+        # 'input' is written for every non-navigate action; navigate keeps its URL in args
+        step = Step(intent=entry.get("intent", ""), action=entry["action"], input=entry.get("input"),
+                    locator=Locator(strategy="css", value="html"), wait=wait,
+                    domReference=int(entry.get("domReference", 0)),
+                    screenReference=int(entry.get("screenReference", 0)))
+        if step.action == "navigate":
+            step.input = (entry.get("args") or [None])[0]
+        else:
+            step.locator = _playwright_to_locator(entry["locator"])
+            step.altLocators = [_playwright_to_locator(a) for a in entry.get("altLocators") or []]
+        expect = entry.get("expect") or {}
+        value = expect.get("value") or {}
+        if expect.get("type") == "toHaveText" and "text" in value:
+            step.expectedText = value["text"]
+        elif expect.get("type") == "toHaveText" and "regex" in value:
+            step.pattern = f"/{value['regex']}/{value.get('flags', '')}"
+        steps.append(step)
+    return steps
+
+
+def load_plan(path: Path) -> List[Step]:
+    """Steps of a recorded run: playwright.jsonl (codegen-like) or plan.json (Step list)."""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        return playwright_jsonl_to_steps(path)
+    return json_str_to_step(path.read_text(encoding="utf-8"))
+
+
 def steps_to_playwright_jsonl(steps: List[Step], out_path: Path) -> None:
     """
     Emit one JSON object per line, mirroring Playwright codegen semantics:
@@ -73,12 +135,12 @@ def steps_to_playwright_jsonl(steps: List[Step], out_path: Path) -> None:
         else:
             entry["locator"] = _locator_to_playwright(s.locator)
             entry["altLocators"] = [_locator_to_playwright(a) for a in s.altLocators]
-            if s.action == "fill":
-                entry["input"] = s.input
-            elif s.action == "press":
-                entry["input"] = s.input
-            else:
-                entry["input"] = None
+            if s.healedFrom:
+                # locator is the alternate that won at execution; healedFrom the one that failed
+                entry["healedFrom"] = _locator_to_playwright(s.healedFrom)
+            # every action that takes input (fill, press, press_sequentially, select, assert_title, ...)
+            # keeps it, so a reloaded plan replays without the LLM
+            entry["input"] = s.input
 
         # Assertions mapping to Playwright expect semantics
         if s.action in ("assert_text", "assert_visible", "assert_match"):
@@ -0,0 +1,117 @@
+"""
+Date                    Author                          Change Details
+17-10-2026              Coforge                         Timing Spans + Chrome Trace Export
+                                                        (per-step timingsMs and trace.json for Perfetto / chrome://tracing)
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Iterator
+
+
+class Tracer:
+    """
+    Records nested, named spans as Chrome trace 'complete' events (ph 'X', microseconds).
+    collect() gathers the milliseconds of spans closed on the calling thread while it is open,
+    summed per name, so a log entry can carry its own breakdown. A disabled tracer keeps no
+    events but still feeds open collectors.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._local = threading.local()
+
+    def _collectors(self) -> List[Dict[str, float]]:
+        if not hasattr(self._local, "collectors"):
+            self._local.collectors = []
+        return self._local.collectors
+
+    @contextmanager
+    def span(self, name: str, cat: str = "", **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the block; the yielded dict is added to the event's args (results known only at the end)."""
+        collectors = self._collectors()
+        if not self.enabled and not collectors:
+            yield args
+            return
+        started = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            ended = time.perf_counter_ns()
+            if self.enabled:
+                tid = threading.get_ident()
+                event = {"name": name, "cat": cat or name.split(".")[0], "ph": "X", "pid": os.getpid(), "tid": tid,
+                         "ts": (started - self._origin) / 1000, "dur": (ended - started) / 1000}
+                if args:
+                    event["args"] = {k: v for k, v in args.items()
+                                     if isinstance(v, (str, int, float, bool)) or v is None}
+                with self._lock:
+                    self._events.append(event)
+                    self._threads.setdefault(tid, threading.current_thread().name)
+            ms = (ended - started) / 1e6
+            for timings in collectors:
+                timings[name] = timings.get(name, 0) + ms
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, float]]:
+        """Per-name totals (ms) of spans closed on this thread inside the block; collectors nest."""
+        timings: Dict[str, float] = {}
+        collectors = self._collectors()
+        collectors.append(timings)
+        try:
+            yield timings
+        finally:
+            collectors.remove(timings)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{span name: {count, totalMs, maxMs}} over the run."""
+        out: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            events = list(self._events)
+        for e in events:
+            s = out.setdefault(e["name"], {"count": 0, "totalMs": 0.0, "maxMs": 0.0})
+            s["count"] += 1
+            s["totalMs"] += e["dur"] / 1000
+            s["maxMs"] = max(s["maxMs"], e["dur"] / 1000)
+        return {k: {"count": v["count"], "totalMs": round(v["totalMs"], 1), "maxMs": round(v["maxMs"], 1)}
+                for k, v in sorted(out.items(), key=lambda kv: -kv[1]["totalMs"])}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": tname}}
+                for tid, tname in threads.items()]
+        Path(path).write_text(json.dumps({"traceEvents": meta + events, "displayTimeUnit": "ms"}),
+                              encoding="utf-8")
+
+
+# The tracer of the run in progress. One run per process (batch workers run stories one at a time),
+# so library code reaches it through span() instead of having a tracer threaded through every call.
+_current = Tracer(enabled=False)
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    global _current
+    _current = tracer
+    return tracer
+
+
+def get_tracer() -> Tracer:
+    return _current
+
+
+def span(name: str, cat: str = "", **args: Any):
+    return _current.span(name, cat, **args)
+
+
+def timings_ms(timings: Dict[str, float]) -> Dict[str, int]:
+    return {k: int(round(v)) for k, v in timings.items()}
+